@@ -3,7 +3,6 @@
 
 import os
 import sys
-import tomllib
 from pathlib import Path
 
 import click
@@ -11,12 +10,9 @@ from dotenv import load_dotenv
 from loguru import logger
 
 from app import __version__
-from app.commands.combine import cli as cli_combine
-from app.commands.inspect import cli as cli_inspect
-from app.commands.jbp import cli as cli_jbp
-from app.commands.skopeo import cli as cli_skopeo
-from app.core.click import ClickStdOption
-from app.core.config import AppSetting, Configuration
+from app.core.click import ClickStdOption, LazyGroup
+from app.core.config import Configuration, load_app_setting
+from app.core.output import get_cache_dir
 from app.core.utils import safe_strtobool
 
 logger.remove()
@@ -43,7 +39,21 @@ else:
     logger.info("Mode: Production")
 
 
-@click.group(context_settings={"max_content_width": 120}, help="\x1b[38;5;121mPython CLI Tools %s\x1b[0m" % __version__)
+# 子命令模块在执行时才导入，`version` 等轻量命令不会加载网络和模板相关依赖。
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "combine": "app.commands.combine:cli",
+        "inspect": "app.commands.inspect:cli",
+        "skopeo": "app.commands.skopeo:cli",
+        "jbp": "app.commands.jbp:cli",
+        "bench": "app.commands.bench:cli",
+        "watch": "app.commands.watch:cli",
+        "cache": "app.commands.cache:cli",
+    },
+    context_settings={"max_content_width": 120},
+    help="\x1b[38;5;121mPython CLI Tools %s\x1b[0m" % __version__,
+)
 @click.option("-c", "config_file", help="Configuration file name.", type=click.Path(), default="version-checker.toml", cls=ClickStdOption)
 @click.option("--silent", "--slient", "silent", help="Turn on silent mode?", is_flag=True)
 @click.option("--debug", "debug", help="Turn on debug mode?", is_flag=True)
@@ -67,11 +77,10 @@ def cli(ctx, **kwargs):
 
     logger.debug("Configuration file loaded: %s" % cfg.config_file)
 
-    with open(cfg.config_file, "r", encoding="utf-8") as f:
-        cfg_dict = tomllib.loads(f.read())
-        ctx.obj.settings = AppSetting.model_validate(cfg_dict)
+    # 配置未变化时直接复用已校验的快照，避免每次启动都重新校验全部软件条目。
+    ctx.obj.settings = load_app_setting(cfg.config_file, get_cache_dir(cfg.workdir))
 
-        logger.debug(ctx.obj.settings.model_dump_json())
+    logger.opt(lazy=True).debug("{}", lambda: ctx.obj.settings.model_dump_json())
 
 
 @cli.command("version", help="Print versions.")
@@ -79,16 +88,6 @@ def app_version():
     print("version-checker v%s" % (__version__,))
 
 
-# noinspection PyTypeChecker
-cli.add_command(cli_combine)
-# noinspection PyTypeChecker
-cli.add_command(cli_inspect)
-# noinspection PyTypeChecker
-cli.add_command(cli_skopeo)
-# noinspection PyTypeChecker
-cli.add_command(cli_jbp)
-
-
 def start():
     cli()
 
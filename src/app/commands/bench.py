@@ -0,0 +1,179 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import click
+from loguru import logger
+from pydantic import BaseModel, Field, TypeAdapter
+
+from app.commands.inspect import process
+from app.core.cassette import Cassette, parse_latency
+from app.core.click import ClickStdOption
+from app.core.config import Configuration
+from app.core.inspect_result import InspectResult, InspectStatus
+from app.core.scheduler import DEFAULT_MAX_CONNECTIONS
+
+
+class BenchParserStats(BaseModel):
+    items: int = 0
+    failed: int = 0
+    cpu_seconds: float = 0.0
+
+
+class BenchReport(BaseModel):
+    wall_seconds: float
+    cpu_seconds: float
+    items: int
+    success: int
+    failed: int
+    skipped: int
+    requests: int
+    missing: int
+    requests_per_second: float
+    peak_rss_mb: Optional[float] = None
+    parsers: Dict[str, BenchParserStats] = Field(default_factory=dict)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """返回当前进程的峰值常驻内存（MB）；不支持 `resource` 模块的平台返回 None。"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位。
+    return round(rss / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+@contextmanager
+def isolated_workdir(cfg: Configuration) -> Iterator[Configuration]:
+    """在临时目录中运行：输出和缓存都写到临时目录，基准测试不会改动 `data/`，也不会被已有缓存跳过条目。"""
+    names = ("OUTPUT_DATA_DIR", "VERSION_CHECKER_CACHE_DIR")
+    saved = {name: os.environ.get(name) for name in names}
+
+    with tempfile.TemporaryDirectory(prefix="version-checker-bench-") as tmp:
+        os.environ["OUTPUT_DATA_DIR"] = str(Path(tmp, "data"))
+        os.environ["VERSION_CHECKER_CACHE_DIR"] = str(Path(tmp, ".cache"))
+
+        try:
+            yield cfg.model_copy(update={"workdir": tmp})
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def build_report(result: InspectResult, cassette: Cassette, wall_seconds: float, cpu_seconds: float) -> BenchReport:
+    parsers: Dict[str, BenchParserStats] = {}
+
+    for item in result.items:
+        stats = parsers.setdefault(item.parser or "<unknown>", BenchParserStats())
+        stats.items += 1
+        stats.failed += int(item.status == InspectStatus.FAILED)
+        stats.cpu_seconds = round(stats.cpu_seconds + (item.metrics.cpu_seconds if item.metrics else 0.0), 6)
+
+    return BenchReport(
+        wall_seconds=round(wall_seconds, 3),
+        cpu_seconds=round(cpu_seconds, 3),
+        items=len(result.items),
+        success=len(result.success),
+        failed=len(result.failed),
+        skipped=len(result.skipped),
+        requests=cassette.hits,
+        missing=cassette.misses,
+        requests_per_second=round(cassette.hits / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+        peak_rss_mb=peak_rss_mb(),
+        parsers=dict(sorted(parsers.items(), key=lambda x: x[1].cpu_seconds, reverse=True)),
+    )
+
+
+def run_bench(cfg: Configuration, cassette_file: Path, latency: Optional[float], worker_num: int, max_connections: int) -> BenchReport:
+    """用录制文件离线回放一次完整的 inspect 流程，并统计耗时、CPU、内存和请求吞吐。"""
+    cassette = Cassette.load(cassette_file, "replay", latency=latency)
+
+    with isolated_workdir(cfg) as bench_cfg:
+        started, cpu_started = time.perf_counter(), time.process_time()
+        result = asyncio.run(process(bench_cfg, worker_num, max_connections=max_connections, cassette=cassette))
+        wall_seconds, cpu_seconds = time.perf_counter() - started, time.process_time() - cpu_started
+
+    return build_report(result, cassette, wall_seconds, cpu_seconds)
+
+
+def format_report(report: BenchReport, top: int = 10) -> str:
+    lines = [
+        f"Wall time: {report.wall_seconds}s | CPU time: {report.cpu_seconds}s | Peak RSS: {report.peak_rss_mb} MB",
+        f"Items: {report.items} (success: {report.success}, failed: {report.failed}, skipped: {report.skipped})",
+        f"Requests: {report.requests} ({report.requests_per_second}/s) | Missing in cassette: {report.missing}",
+        "CPU time by parser:",
+    ]
+
+    for name, stats in list(report.parsers.items())[:top]:
+        lines.append(f"  {name:<20} {stats.cpu_seconds:>9.3f}s  items: {stats.items}, failed: {stats.failed}")
+
+    return "\n".join(lines)
+
+
+@click.command("bench", help="Replay a recorded cassette through the full inspect pipeline offline and report throughput.")
+@click.option(
+    "--cassette",
+    "cassette_file",
+    help="Cassette file recorded by `inspect --record`.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--latency",
+    "latency",
+    help="Replay latency: 'recorded' or a fixed number of milliseconds. (default: recorded)",
+    cls=ClickStdOption,
+    default="recorded",
+)
+@click.option(
+    "--worker",
+    "-w",
+    "worker_num",
+    help="The number of worker per parser. (default: 2)",
+    cls=ClickStdOption,
+    default=2,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--max-connections",
+    "max_connections",
+    help=f"The maximum number of concurrent HTTP requests across all hosts. (default: {DEFAULT_MAX_CONNECTIONS})",
+    cls=ClickStdOption,
+    default=DEFAULT_MAX_CONNECTIONS,
+    type=click.IntRange(min=1),
+)
+@click.option("--repeat", "repeat", help="Number of runs. (default: 1)", cls=ClickStdOption, default=1, type=click.IntRange(min=1))
+@click.option("--json", "json_file", help="Write the reports as JSON to this file.", type=click.Path(dir_okay=False))
+@click.pass_obj
+def cli(cfg: Configuration, cassette_file: str, latency: str, worker_num: int, max_connections: int, repeat: int, json_file: Optional[str]):
+    """离线回放录制的响应，比较调度和缓存改动前后的整体吞吐；解析进程池中的 CPU 时间不计入按解析器统计。"""
+    logger.debug(f"app cli bench called. (Working directory: {cfg.workdir} | Cassette: {cassette_file})")
+
+    try:
+        latency_seconds = parse_latency(latency)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--latency") from e
+
+    reports = []
+
+    for i in range(repeat):
+        report = run_bench(cfg, Path(cassette_file), latency_seconds, worker_num, max_connections)
+        reports.append(report)
+
+        click.echo(f"Run {i + 1}/{repeat}")
+        click.echo(format_report(report))
+
+    if json_file:
+        with open(json_file, "w", encoding="utf-8") as f:
+            f.write(TypeAdapter(List[BenchReport]).dump_json(reports, indent=2).decode("utf-8"))
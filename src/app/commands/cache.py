@@ -0,0 +1,69 @@
+from typing import Optional
+
+import arrow
+import click
+from loguru import logger
+
+from app.core.click import ClickStdOption
+from app.core.config import Configuration
+from app.core.output import get_cache_dir
+from app.core.response_store import ResponseStoreStats, load_response_store
+
+
+def format_stats(stats: ResponseStoreStats) -> str:
+    oldest = arrow.get(stats.oldest).to("local").format("YYYY-MM-DD HH:mm:ss") if stats.oldest is not None else "none"
+    lines = [
+        f"Entries: {stats.entries} (stale: {stats.stale})",
+        f"Objects: {stats.objects}",
+        f"Size: {stats.bytes / 1024 / 1024:.2f} MB",
+        f"Oldest: {oldest}",
+    ]
+
+    if stats.largest:
+        lines.append("Largest:")
+        lines.extend(f"  {x.size / 1024:>10.1f} KB  {x.url}" for x in stats.largest)
+
+    return "\n".join(lines)
+
+
+@click.group("cache", help="Inspect or prune the persistent HTTP response store.")
+def cli():
+    pass
+
+
+@cli.command("inspect", help="Print the size and the largest entries of the response store.")
+@click.option(
+    "--top", "top", help="Number of largest entries to list. (default: 10)", cls=ClickStdOption, default=10, type=click.IntRange(min=0)
+)
+@click.option("--json", "as_json", help="Print the statistics as JSON.", is_flag=True)
+@click.pass_obj
+def inspect_cli(cfg: Configuration, top: int, as_json: bool):
+    """查看响应存储的条目数、正文文件数、总大小和最大的条目；存储关闭时也可以查看已有的数据。"""
+    logger.debug(f"app cli cache inspect called. (Working directory: {cfg.workdir})")
+
+    stats = load_response_store(get_cache_dir(cfg.workdir)).describe(top)
+    click.echo(stats.model_dump_json(indent=2) if as_json else format_stats(stats))
+
+
+@cli.command("prune", help="Remove stale entries, shrink the store to a size limit and delete unreferenced bodies.")
+@click.option("--max-age", "max_age", help="Remove entries stored more than this many minutes ago.", type=click.FloatRange(min=0))
+@click.option(
+    "--max-mb", "max_mb", help="Evict the least recently used entries until the store fits in this many MB.", type=click.FloatRange(min=0)
+)
+@click.option("--all", "remove_all", help="Remove every entry.", is_flag=True)
+@click.pass_obj
+def prune_cli(cfg: Configuration, max_age: Optional[float], max_mb: Optional[float], remove_all: bool):
+    """清理响应存储；未指定的上限取环境变量中的配置。"""
+    logger.debug(f"app cli cache prune called. (Working directory: {cfg.workdir})")
+
+    store = load_response_store(get_cache_dir(cfg.workdir))
+
+    if remove_all:
+        max_age = 0
+
+    evicted, removed = store.prune(
+        max_age=max_age * 60 if max_age is not None else None,
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+    )
+
+    click.echo(f"Removed {evicted} entries and {removed} unreferenced files. {len(store.index.entries)} entries left.")
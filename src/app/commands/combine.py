@@ -1,16 +1,19 @@
+import hashlib
 import json
+import os
 from compression import zstd
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 from click.core import Context
-from jinja2 import Template
 from loguru import logger
+from pydantic import BaseModel, Field
 
 from app.core.config import Configuration
+from app.core.history import append_history, diff_releases
 from app.core.notify import send_feishu_updates, send_mail
-from app.core.output import get_output_dir
+from app.core.output import get_cache_dir, get_output_dir
 
 
 def _filter_nones(obj):
@@ -51,39 +54,172 @@ filter_nones = _filter_nones
 compare_json_data = _compare_json_data
 
 
-def combine_data(cfg: Configuration):
-    """合并输出目录中的单软件 JSON 文件，并生成 `all.json` 与 `all.json.zst`。
+MANIFEST_FILE = "combine-manifest.json"
+
+
+class CombineManifestEntry(BaseModel):
+    mtime_ns: int
+    size: int
+    sha256: str
+    record: Dict[str, Any]
+
+
+class CombineManifest(BaseModel):
+    all_sha256: str = ""
+    entries: Dict[str, CombineManifestEntry] = Field(default_factory=dict)
+
+
+def _file_sha256(file: Path) -> str:
+    with open(file, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _load_manifest(p: Path, manifest_file: Path) -> Optional[CombineManifest]:
+    """读取合并清单；清单缺失、损坏或与当前 `all.json` 的内容不一致时返回 None，回退到全量合并。
 
-    合并前会读取旧 `all.json` 作为对比基线；首次生成时没有旧数据，因此不会产生差异通知。
+    按内容哈希而不是修改时间校验：CI 每次重新检出仓库，文件的修改时间都会变化。
     """
-    p = get_output_dir(cfg.workdir)
     all_json_file = p.joinpath("all.json")
-    old_all_json = None
 
-    if all_json_file.exists():
-        with open(all_json_file, "r", encoding="utf-8") as f:
-            old_all_json = json.loads(f.read())
+    if not manifest_file.is_file() or not all_json_file.is_file() or not p.joinpath("all.json.zst").is_file():
+        return None
 
-    data = []
+    try:
+        manifest = CombineManifest.model_validate_json(manifest_file.read_bytes())
+    except Exception as e:
+        logger.warning(f"Combine manifest is invalid and will be rebuilt: {type(e).__name__}: {e}")
+        return None
 
-    for file in p.glob("*.json"):
-        if file.name != "all.json":
-            with open(file, "r", encoding="utf-8") as f:
-                data.append(json.loads(f.read()))
+    if _file_sha256(all_json_file) != manifest.all_sha256:
+        logger.debug("The all.json file was modified outside combine. Falling back to full combine.")
+        return None
+
+    return manifest
+
+
+def _scan_data_files(p: Path, manifest: CombineManifest) -> Tuple[Dict[str, CombineManifestEntry], List[str]]:
+    """扫描单软件 JSON 文件，返回最新清单条目和内容发生变化的文件名。
+
+    mtime/size 未变化的文件直接复用清单中的记录；其余文件（包括重新检出后只有修改时间变化的文件）先比对内容哈希，只有哈希不同
+    才重新解析。
+    """
+    entries: Dict[str, CombineManifestEntry] = {}
+    changed: List[str] = []
 
-    new_all_json = sorted(_filter_nones(data), key=lambda x: x["name"])
+    with os.scandir(p) as it:
+        for item in it:
+            if not item.name.endswith(".json") or item.name == "all.json" or not item.is_file():
+                continue
 
-    with open(p.joinpath("all.json"), "w", encoding="utf-8") as f:
+            st = item.stat()
+            entry = manifest.entries.get(item.name)
+
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                entries[item.name] = entry
+                continue
+
+            with open(item.path, "rb") as f:
+                raw = f.read()
+
+            digest = hashlib.sha256(raw).hexdigest()
+
+            if entry is not None and entry.sha256 == digest:
+                record = entry.record
+            else:
+                record = _filter_nones(json.loads(raw))
+                changed.append(item.name)
+
+            entries[item.name] = CombineManifestEntry(mtime_ns=st.st_mtime_ns, size=st.st_size, sha256=digest, record=record)
+
+    return entries, changed
+
+
+def _write_combined(p: Path, manifest_file: Path, new_all_json: List[Dict], entries: Dict[str, CombineManifestEntry]):
+    """写出 `all.json`、`all.json.zst` 和合并清单。"""
+    all_json_file = p.joinpath("all.json")
+
+    with open(all_json_file, "w", encoding="utf-8") as f:
         b = json.dumps(new_all_json, ensure_ascii=True, separators=(",", ":"))
         f.write(b)
 
         with zstd.open(p.joinpath("all.json.zst"), "wb") as zstf:
             zstf.write(b.encode("utf-8"))
 
+    _save_manifest(p, manifest_file, entries)
+
+
+def _save_manifest(p: Path, manifest_file: Path, entries: Dict[str, CombineManifestEntry]):
+    """按当前 `all.json` 的内容哈希写出合并清单，用于下次运行校验清单是否仍然有效；写入失败只影响下次的增量合并。"""
+    manifest = CombineManifest(all_sha256=_file_sha256(p.joinpath("all.json")), entries=entries)
+
+    try:
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = manifest_file.with_name(f".{manifest_file.name}.tmp")
+        tmp_file.write_text(manifest.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_file, manifest_file)
+    except OSError as e:
+        logger.warning(f"Combine manifest save skipped: {type(e).__name__}: {e}")
+
+
+def _record_history(p: Path, new_records: List[Dict], old_records: Optional[List[Dict]]):
+    """把本次合并发现的版本变化追加到发布历史；历史写入失败不影响合并结果。"""
+    try:
+        append_history(p, diff_releases(new_records, old_records))
+    except Exception as e:
+        logger.warning(f"Release history update skipped: {type(e).__name__}: {e}")
+
+
+def _combine_full(p: Path, manifest_file: Path) -> Tuple[List[Dict], List[Tuple[str, str, str]]]:
+    """没有可用清单时全量读取所有文件，并以旧 `all.json` 作为对比基线。"""
+    all_json_file = p.joinpath("all.json")
+    old_all_json = None
+
+    if all_json_file.exists():
+        with open(all_json_file, "r", encoding="utf-8") as f:
+            old_all_json = json.loads(f.read())
+
+    entries, _ = _scan_data_files(p, CombineManifest())
+    new_all_json = sorted((v.record for v in entries.values()), key=lambda x: x["name"])
+
+    _write_combined(p, manifest_file, new_all_json, entries)
+    # 首次合并时所有条目都记为观察起点。
+    _record_history(p, new_all_json, old_all_json)
+
     # 差异仅用于通知和日志，不影响合并产物写入。
-    differences = _compare_json_data(new_all_json, old_all_json)
+    return new_all_json, _compare_json_data(new_all_json, old_all_json)
+
+
+def combine_data(cfg: Configuration):
+    """合并输出目录中的单软件 JSON 文件，并生成 `all.json` 与 `all.json.zst`。
+
+    缓存目录中保存合并清单（文件名 -> mtime/size/内容哈希/解析结果），后续运行只重新解析发生变化的文件，差异也只在变化的
+    条目之间计算；没有任何变化时不重写合并产物。清单不可用时回退为全量合并，以旧 `all.json` 作为对比基线，首次生成时没有旧数据，
+    因此不会产生差异通知。版本变化同时按条目名称追加到 `release-history.jsonl`，供发布概率估计使用。
+    """
+    p = get_output_dir(cfg.workdir)
+    manifest_file = get_cache_dir(cfg.workdir).joinpath(MANIFEST_FILE)
+    manifest = _load_manifest(p, manifest_file)
+
+    if manifest is None:
+        return _combine_full(p, manifest_file)
 
-    return new_all_json, differences
+    entries, changed = _scan_data_files(p, manifest)
+    removed = [k for k in manifest.entries if k not in entries]
+    new_all_json = sorted((v.record for v in entries.values()), key=lambda x: x["name"])
+
+    if changed or removed:
+        _write_combined(p, manifest_file, new_all_json, entries)
+    elif any(v is not manifest.entries[k] for k, v in entries.items()):
+        # 只有时间戳变化、内容不变时仅刷新清单，合并产物保持不变。
+        _save_manifest(p, manifest_file, entries)
+
+    logger.debug(f"Combine manifest | changed: {len(changed)}, removed: {len(removed)}, total: {len(entries)}")
+
+    new_records = sorted((entries[k].record for k in changed), key=lambda x: x["name"])
+    old_records = [manifest.entries[k].record for k in changed if k in manifest.entries]
+    _record_history(p, new_records, old_records)
+
+    return new_all_json, _compare_json_data(new_records, old_records)
 
 
 def send_update_notification(cfg: Configuration, email_data: List[Dict[str, str]]) -> bool:
@@ -91,6 +227,8 @@ def send_update_notification(cfg: Configuration, email_data: List[Dict[str, str]
     ok_email = False
     template_file = Path(cfg.workdir).joinpath("email_notify.j2")
     if template_file.is_file():
+        from jinja2 import Template
+
         with open(template_file, "r", encoding="utf-8") as f:
             template = Template(f.read())
 
@@ -107,14 +245,8 @@ def send_update_notification(cfg: Configuration, email_data: List[Dict[str, str]
     return ok_email or ok_feishu
 
 
-@click.command("combine", help="Merge JSON data into a file.")
-@click.option("--notify", "notify", help="Send email notification when differences are found.", is_flag=True)
-@click.pass_obj
-@click.pass_context
-def cli(ctx: Context, cfg: Configuration, notify: bool):
-    """执行输出合并命令；只有显式传入 --notify 时才发送邮件通知。"""
-    logger.debug(f"app cli combine called. (Working directory: {cfg.workdir} | Title: {cfg.settings.app.title})")
-
+def combine_and_notify(cfg: Configuration, notify: bool) -> List[Tuple[str, str, str]]:
+    """合并输出并输出差异日志，`notify` 为 True 时发送通知；返回差异列表。"""
     _, differences = combine_data(cfg)
 
     logger.info("The all.json file has been generated.")
@@ -133,3 +265,16 @@ def cli(ctx: Context, cfg: Configuration, notify: bool):
             send_update_notification(cfg, email_data)
     else:
         logger.info("No differences were found.")
+
+    return differences
+
+
+@click.command("combine", help="Merge JSON data into a file.")
+@click.option("--notify", "notify", help="Send email notification when differences are found.", is_flag=True)
+@click.pass_obj
+@click.pass_context
+def cli(ctx: Context, cfg: Configuration, notify: bool):
+    """执行输出合并命令；只有显式传入 --notify 时才发送邮件通知。"""
+    logger.debug(f"app cli combine called. (Working directory: {cfg.workdir} | Title: {cfg.settings.app.title})")
+
+    combine_and_notify(cfg, notify)
@@ -1,5 +1,9 @@
 import asyncio
-from typing import Optional
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
 
 import aiohttp
 import click
@@ -7,11 +11,24 @@ from click.core import Context
 from loguru import logger
 
 from app.commands.combine import cli as cli_combine
+from app.core.cassette import Cassette, parse_latency
+from app.core.check_index import CheckIndex, load_check_index
 from app.core.click import ClickStdOption
-from app.core.config import Configuration
+from app.core.coalesce import RequestCoalescer
+from app.core.config import AppSettingSoftItem, Configuration
+from app.core.executor import create_parse_executor
 from app.core.github import GithubHelper
+from app.core.github_graphql import GithubGraphQLBatcher, get_graphql_settings
+from app.core.history import SECONDS_PER_DAY, ReleaseEstimator, load_history, parse_time, plan_budget
 from app.core.http import AsyncHttpClient
+from app.core.http_cache import ValidatorCache, create_validator_cache
 from app.core.inspect_result import InspectItemResult, InspectResult
+from app.core.output import get_cache_dir, get_output_dir
+from app.core.response_store import ResponseStore, create_response_store
+from app.core.run_report import DEFAULT_REPORT_TOP, build_run_report, write_run_report
+from app.core.scheduler import DEFAULT_MAX_CONNECTIONS, create_request_scheduler
+from app.core.shard import ShardCosts, build_bundle, load_bundles, merge_bundles, parse_shard, plan_shards, write_bundle
+from app.core.utils import get_env_int, safe_strtobool
 from app.parser import Base as BaseParser
 from app.parser.registry import load_parser_class
 
@@ -22,23 +39,109 @@ from app.parser.registry import load_parser_class
     "--worker",
     "-w",
     "worker_num",
-    help="The number of worker. (default: 2)",
+    help="The number of worker per parser. (default: 2)",
     cls=ClickStdOption,
     default=2,
     type=click.IntRange(min=1),
 )
+@click.option(
+    "--max-connections",
+    "max_connections",
+    help=f"The maximum number of concurrent HTTP requests across all hosts. (default: {DEFAULT_MAX_CONNECTIONS})",
+    cls=ClickStdOption,
+    default=DEFAULT_MAX_CONNECTIONS,
+    type=click.IntRange(min=1),
+)
 @click.option("--strict", "strict", help="Exit with non-zero code if any item fails.", is_flag=True)
 @click.option("--notify", "notify", help="Send notification when differences are found.", is_flag=True)
+@click.option("--record", "record_file", help="Record every HTTP response into a cassette file.", type=click.Path(dir_okay=False))
+@click.option(
+    "--replay", "replay_file", help="Serve HTTP responses from a cassette file instead of the network.", type=click.Path(dir_okay=False)
+)
+@click.option(
+    "--latency",
+    "latency",
+    help="Replay latency: 'recorded' or a fixed number of milliseconds. (default: recorded)",
+    cls=ClickStdOption,
+    default="recorded",
+)
+@click.option("--prioritize", "prioritize", help="Check the items most likely to have a new release first.", is_flag=True)
+@click.option(
+    "--budget",
+    "budget",
+    help="Skip the least promising items once their estimated requests exceed this budget. (implies --prioritize)",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--shard",
+    "shard",
+    help="Only inspect shard i of n (e.g. 1/4) and write a partial result bundle instead of combining.",
+    cls=ClickStdOption,
+)
+@click.option(
+    "--bundle-dir",
+    "bundle_dir",
+    help="Directory for shard result bundles. (default: <cache dir>/shards)",
+    type=click.Path(file_okay=False),
+)
+@click.option(
+    "--merge",
+    "merge_dir",
+    help="Merge the shard bundles in this directory into the output directory, then combine.",
+    type=click.Path(exists=True, file_okay=False),
+)
 @click.pass_obj
 @click.pass_context
-def cli(ctx: Context, cfg: Configuration, worker_num: int, strict: bool, notify: bool, filter_name: Optional[str] = None):
-    """执行批量版本检测，并根据 strict 参数决定是否把单项失败提升为命令失败。"""
+def cli(
+    ctx: Context,
+    cfg: Configuration,
+    worker_num: int,
+    max_connections: int,
+    strict: bool,
+    notify: bool,
+    record_file: Optional[str],
+    replay_file: Optional[str],
+    latency: str,
+    filter_name: Optional[str] = None,
+    prioritize: bool = False,
+    budget: Optional[int] = None,
+    shard: Optional[str] = None,
+    bundle_dir: Optional[str] = None,
+    merge_dir: Optional[str] = None,
+):
+    """执行批量版本检测，并根据 strict 参数决定是否把单项失败提升为命令失败。
+
+    `--shard i/n` 只检测第 i 个分片并写出分片结果，不执行合并；各分片完成后用 `--merge` 把结果写回输出目录，再按单机运行
+    相同的方式合并、比较差异和发送通知。`--prioritize`/`--budget` 按历史估计的发布概率排列条目，限额紧张时优先检测最可能
+    有新版本的条目。
+    """
     logger.debug(f"app cli inspect called. (Working directory: {cfg.workdir} | Title: {cfg.settings.app.title})")
 
-    if not cfg.debug:
-        asyncio.run(show_rate_limit_best_effort())
+    if shard is not None and merge_dir is not None:
+        raise click.UsageError("--shard and --merge cannot be used together.")
+
+    try:
+        shard_spec = parse_shard(shard) if shard is not None else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--shard") from e
 
-    result = asyncio.run(process(cfg, worker_num, filter_name))
+    if merge_dir is not None:
+        online = False
+        result = merge_shards(cfg, Path(merge_dir))
+    else:
+        cassette = open_cassette(record_file, replay_file, latency)
+        online = not cfg.debug and (cassette is None or cassette.recording)
+
+        # 全部条目都在缓存有效期内时不会发出请求，也不用先查询限额。
+        if online and has_due_items(cfg, filter_name):
+            asyncio.run(show_rate_limit_best_effort())
+
+        if shard_spec is not None:
+            result = inspect_shard(cfg, shard_spec, bundle_dir, worker_num, filter_name, max_connections, cassette, prioritize, budget)
+        else:
+            result = asyncio.run(
+                process(cfg, worker_num, filter_name, max_connections, cassette=cassette, prioritize=prioritize, budget=budget)
+            )
 
     if result.failed:
         logger.error(f"Inspect completed with {len(result.failed)} failed item(s).")
@@ -48,13 +151,140 @@ def cli(ctx: Context, cfg: Configuration, worker_num: int, strict: bool, notify:
     if strict and result.has_failed:
         raise click.ClickException("Inspect completed with failed item(s).")
 
-    if not cfg.debug:
+    # 全部条目命中缓存时没有消耗 API 额度，不再重复查询限额。
+    if online and result.success:
         asyncio.run(show_rate_limit_best_effort())
 
+    # 分片只产出部分结果，由合并步骤统一生成 all.json 和差异通知。
+    if shard_spec is not None:
+        return
+
+    update_shard_costs_best_effort(cfg, result)
+
     # 检测结束后统一合并本轮输出，保持 inspect 命令的一站式行为。
     ctx.invoke(cli_combine, notify=notify)
 
 
+def inspect_shard(
+    cfg: Configuration,
+    shard: Tuple[int, int],
+    bundle_dir: Optional[str],
+    worker_num: int,
+    filter_name: Optional[str],
+    max_connections: int,
+    cassette: Optional[Cassette],
+    prioritize: bool = False,
+    budget: Optional[int] = None,
+) -> InspectResult:
+    """按历史耗时划分条目，只检测当前分片，并把结果打包写到分片目录。"""
+    index, count = shard
+    output_dir = get_output_dir(cfg.workdir)
+    plan = plan_shards([x.name for x in cfg.settings.softwares], count, ShardCosts.load(output_dir).costs)
+    names = plan.names(index)
+
+    logger.info(f"Shard {index}/{count} | items: {len(names)}, estimated cost: {plan.loads[index - 1]}s")
+
+    check_index = load_check_index(cfg.workdir)
+    started = time.perf_counter()
+    result = asyncio.run(
+        process(
+            cfg,
+            worker_num,
+            filter_name,
+            max_connections,
+            cassette=cassette,
+            check_index=check_index,
+            names=set(names),
+            prioritize=prioritize,
+            budget=budget,
+        )
+    )
+
+    bundle = build_bundle(plan, index, result, check_index, time.perf_counter() - started)
+    file = write_bundle(bundle, Path(bundle_dir) if bundle_dir else get_cache_dir(cfg.workdir).joinpath("shards"))
+
+    logger.info(f"Shard bundle | {file} | files: {len(bundle.files)}")
+
+    return result
+
+
+def merge_shards(cfg: Configuration, bundle_dir: Path) -> InspectResult:
+    """把分片结果写回输出目录，并按整轮运行写出检测报告；耗时取最慢分片的耗时。"""
+    check_index = load_check_index(cfg.workdir)
+
+    try:
+        bundles = load_bundles(bundle_dir)
+        result = merge_bundles(bundles, check_index)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+    save_check_index_best_effort(check_index)
+    write_run_report_best_effort(result, max(x.elapsed_seconds for x in bundles), cfg.workdir)
+
+    return result
+
+
+def prioritize_softwares(
+    cfg: Configuration, softwares: List[AppSettingSoftItem], check_index: CheckIndex, budget: Optional[int] = None
+) -> Tuple[List[AppSettingSoftItem], List[InspectItemResult]]:
+    """按发布概率排列本轮要检测的条目，返回（检测顺序，因预算跳过的结果）。
+
+    概率由发布历史估计的速率和距上次检测的时间得出；条目按这个顺序占用解析器槽位，限流时先用完额度的是排在后面的条目。
+    设置 `budget` 时按期望收益依次放入，预计请求数取历史平滑值（至少 1 个），超出预算的条目记为跳过。
+    """
+    output_dir = get_output_dir(cfg.workdir)
+    estimator = ReleaseEstimator(load_history(output_dir))
+    requests = ShardCosts.load(output_dir).requests
+    enabled = {v.name: v for v in softwares if not v.disabled}
+    now = time.time()
+    probabilities = {}
+
+    for name in enabled:
+        last_checked = check_index.last_checked(name)
+        elapsed_days = (now - parse_time(last_checked)) / SECONDS_PER_DAY if last_checked else None
+        probabilities[name] = estimator.probability(name, elapsed_days)
+
+    costs = {name: max(requests.get(name, 1.0), 1.0) for name in enabled}
+    ordered, over_budget = plan_budget(list(enabled), probabilities, costs, budget)
+
+    top = ", ".join(f"{x}: {probabilities[x]:.2f}" for x in ordered[:5])
+    logger.info(f"Release priority | selected: {len(ordered)}, over budget: {len(over_budget)} | top: {top or 'none'}")
+
+    skipped = [
+        InspectItemResult.skipped(x, f"Skipped by request budget. (Release probability: {probabilities[x]:.2f})") for x in over_budget
+    ]
+
+    return [enabled[x] for x in ordered] + [v for v in softwares if v.disabled], skipped
+
+
+def update_shard_costs_best_effort(cfg: Configuration, result: InspectResult):
+    """用本轮各条目的耗时更新分片历史；写入失败只影响下次分片的均衡程度。"""
+    try:
+        costs = ShardCosts.load(get_output_dir(cfg.workdir))
+
+        if costs.update(result):
+            costs.save()
+    except Exception as e:
+        logger.warning(f"Shard costs update skipped: {type(e).__name__}: {e}")
+
+
+def open_cassette(record_file: Optional[str], replay_file: Optional[str], latency: str) -> Optional[Cassette]:
+    """按命令行参数打开 HTTP 录制文件；录制和回放不能同时使用。"""
+    if record_file and replay_file:
+        raise click.UsageError("--record and --replay cannot be used together.")
+
+    try:
+        if record_file:
+            return Cassette.load(Path(record_file), "record")
+
+        if replay_file:
+            return Cassette.load(Path(replay_file), "replay", latency=parse_latency(latency))
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(str(e)) from e
+
+    return None
+
+
 async def show_rate_limit_best_effort():
     """尽力输出 GitHub API 限额信息，查询失败时只降级为 warning。"""
     try:
@@ -63,53 +293,273 @@ async def show_rate_limit_best_effort():
         logger.warning(f"GitHub rate limit check skipped: {type(e).__name__}: {e}")
 
 
-async def process(cfg: Configuration, worker_num: int, filter_name: Optional[str] = None):
-    """调度配置中的软件检测任务，并返回每个条目的结构化检测结果。
+def has_due_items(cfg: Configuration, filter_name: Optional[str] = None) -> bool:
+    """检查是否有启用的条目已经超过缓存有效期；只读取检查时间索引和输出文件，不发出请求。解析器无法加载时按需要检测处理。"""
+    check_index = load_check_index(cfg.workdir)
 
-    该函数负责过滤指定名称、跳过 disabled 条目、复用同一个 aiohttp 会话，并把解析器加载和运行阶段的失败收敛为
-    `InspectItemResult`，避免单个配置项影响整批检测。
+    for soft in cfg.settings.softwares:
+        if soft.disabled or (filter_name is not None and soft.name != filter_name):
+            continue
+
+        try:
+            parser = load_parser_class(soft.parser)(cfg)
+            parser.check_index = check_index
+
+            if parser.is_expired(soft)[0]:
+                return True
+        except Exception:
+            return True
+
+    return False
+
+
+def create_graphql_batcher(httpc: AsyncHttpClient, sem: asyncio.Semaphore) -> Optional[GithubGraphQLBatcher]:
+    """在启用批量模式且配置了 GITHUB_TOKEN 时创建 GraphQL 批处理器；GraphQL API 不支持匿名访问。"""
+    settings = get_graphql_settings()
+    github_token = os.environ.get("GITHUB_TOKEN")
+
+    if not settings.enabled or not github_token:
+        return None
+
+    return GithubGraphQLBatcher(httpc, github_token, settings=settings, sem=sem)
+
+
+def save_http_cache_best_effort(http_cache: ValidatorCache):
+    """写回条件请求缓存并输出命中统计；缓存写入失败不影响检测结果。"""
+    try:
+        http_cache.save()
+        logger.info(f"HTTP validator cache | {http_cache.stats}")
+    except Exception as e:
+        logger.warning(f"HTTP validator cache save skipped: {type(e).__name__}: {e}")
+
+
+def save_response_store_best_effort(store: ResponseStore):
+    """写回响应存储索引并输出命中统计；写入失败不影响检测结果。"""
+    try:
+        store.save()
+        logger.info(f"HTTP response store | {store.stats}")
+    except Exception as e:
+        logger.warning(f"HTTP response store save skipped: {type(e).__name__}: {e}")
+
+
+def save_check_index_best_effort(check_index: CheckIndex):
+    """写回检查时间索引并输出写入统计；索引写入失败只影响下次的过期判断。"""
+    try:
+        check_index.save()
+        logger.info(f"Output files | {check_index.stats}")
+    except Exception as e:
+        logger.warning(f"Check index save skipped: {type(e).__name__}: {e}")
+
+
+def write_run_report_best_effort(result: InspectResult, elapsed_seconds: float, workdir: Optional[str]):
+    """写出本轮检测报告（JSON 和 Prometheus textfile），并输出耗时最长的几个条目；写入失败不影响检测结果。"""
+    try:
+        report = build_run_report(result, elapsed_seconds, top=get_env_int("VERSION_CHECKER_REPORT_TOP", DEFAULT_REPORT_TOP))
+        report_dir = Path(os.environ.get("VERSION_CHECKER_REPORT_DIR") or get_cache_dir(workdir).joinpath("reports"))
+        write_run_report(report, report_dir)
+
+        slowest = ", ".join(f"{x.name}: {x.metrics.elapsed_seconds:.1f}s" for x in report.slowest[:5])
+        logger.info(f"Run report | {report_dir} | slowest: {slowest or 'none'}")
+    except Exception as e:
+        logger.warning(f"Run report skipped: {type(e).__name__}: {e}")
+
+
+class InspectRuntime:
+    """检测运行期共享的对象：HTTP 会话和客户端、按主机的请求调度器、解析进程池、条件请求缓存、响应存储和检查时间索引等。
+
+    inspect 只运行一轮；watch 在常驻进程中反复调用 `run()`，会话、连接池和缓存一直保持可用。请求合并的结果只在一轮内复用，
+    每轮开始时重新创建。退出上下文时关闭进程池并写回索引、缓存和录制文件。
     """
-    if worker_num < 1:
-        raise ValueError("worker_num must be greater than or equal to 1.")
 
-    sem = asyncio.Semaphore(worker_num)
+    def __init__(
+        self,
+        cfg: Configuration,
+        worker_num: int,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cassette: Optional[Cassette] = None,
+        check_index: Optional[CheckIndex] = None,
+    ):
+        if worker_num < 1:
+            raise ValueError("worker_num must be greater than or equal to 1.")
+
+        if max_connections < 1:
+            raise ValueError("max_connections must be greater than or equal to 1.")
+
+        self.cfg = cfg
+        self.cassette = cassette
+        # 为 True 时不按缓存有效期跳过条目，检测时机由调用方（watch 的调度队列）决定。
+        self.ignore_cache_ttl = False
+        self.sems: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(worker_num))
+        self.scheduler = create_request_scheduler(max_connections)
+        self.coalescer = RequestCoalescer()
+        # 页面解析放到进程池执行，大页面的 html5lib 解析不阻塞其他在途请求。
+        self.parse_executor = create_parse_executor()
+        self.http_cache = create_validator_cache(get_cache_dir(cfg.workdir)) if cassette is None else None
+        self.response_store = create_response_store(get_cache_dir(cfg.workdir)) if cassette is None else None
+        if check_index is None:
+            check_index = load_check_index(cfg.workdir)
+        self.check_index = check_index
+        self.docker_hub_shared = safe_strtobool(os.environ.get("VERSION_CHECKER_DOCKER_HUB_SHARED_LIMIT", "true"), default=True)
+        self.docker_hub_governor = None
+        self.graphql: Optional[GithubGraphQLBatcher] = None
+        self.httpc: Optional[AsyncHttpClient] = None
+        self._session: Optional[aiohttp.ClientSession] = None
 
-    task_list = []
-    items = []
+    async def __aenter__(self) -> "InspectRuntime":
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+        # 所有条目共享一个 HTTP 客户端，相同的 GET 请求在解析器之间合并。
+        self.httpc = AsyncHttpClient(
+            debug=self.cfg.debug,
+            session=self._session,
+            cache=self.http_cache,
+            scheduler=self.scheduler,
+            coalescer=self.coalescer,
+            cassette=self.cassette,
+            store=self.response_store,
+        )
+        self.graphql = create_graphql_batcher(self.httpc, self.sems["gh"])
 
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15)) as session:
-        for v in cfg.settings.softwares:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            self.parse_executor.shutdown()
+            self.save()
+
+            if self.cassette is not None:
+                logger.info(f"Cassette | {self.cassette.stats}")
+                self.cassette.save()
+        finally:
+            await self._session.close()
+
+    def save(self):
+        """写回检查时间索引、条件请求缓存和响应存储；watch 每轮结束后调用，进程意外退出时最多丢失一轮的记录。"""
+        save_check_index_best_effort(self.check_index)
+
+        if self.http_cache is not None:
+            save_http_cache_best_effort(self.http_cache)
+
+        if self.response_store is not None:
+            save_response_store_best_effort(self.response_store)
+
+    def create_parser(self, soft: AppSettingSoftItem) -> BaseParser:
+        """创建条目的解析器实例，并注入本次运行共享的客户端、索引、解析执行器和限流器。"""
+        cls = load_parser_class(soft.parser)
+        cls_o = cls(self.cfg)
+        cls_o.httpc = self.httpc
+        cls_o.check_index = self.check_index
+        cls_o.parse_executor = self.parse_executor
+
+        if self.ignore_cache_ttl:
+            cls_o.ignore_cache_ttl = True
+
+        if self.graphql is not None and soft.parser == "gh":
+            cls_o.graphql = self.graphql
+
+        # Docker Hub 的限额按 IP 计算，所有仓库共用一个限流器，额度耗尽时只等待一次。
+        if self.docker_hub_shared and soft.parser == "docker-hub" and hasattr(cls, "create_governor"):
+            if self.docker_hub_governor is None:
+                # 额度未知时的并发上限与单主机并发上限一致，缺少限流响应头时不会退化为逐个请求。
+                self.docker_hub_governor = cls.create_governor(self.scheduler.host_max)
+            cls_o.governor = self.docker_hub_governor
+
+        return cls_o
+
+    async def run(
+        self, softwares: Iterable[AppSettingSoftItem], filter_name: Optional[str] = None, names: Optional[Collection[str]] = None
+    ) -> List[InspectItemResult]:
+        """检测一轮条目，返回每个条目的结构化结果；加载解析器失败的条目记为失败，不影响其他条目。"""
+        self.coalescer = RequestCoalescer()
+        self.httpc.coalescer = self.coalescer
+        task_list = []
+        items = []
+
+        for v in softwares:
             if filter_name is not None and filter_name != v.name:
                 continue
 
+            if names is not None and v.name not in names:
+                continue
+
             if v.disabled:
                 items.append(InspectItemResult.skipped(v.name, "Software item is disabled."))
                 continue
 
             try:
-                cls = load_parser_class(v.parser)
-                cls_o = cls(cfg)
-                cls_o.httpc = AsyncHttpClient(debug=cfg.debug, session=session)
+                cls_o = self.create_parser(v)
             except Exception as e:
                 logger.exception(e)
                 items.append(InspectItemResult.failed(v.name, type(e).__name__, str(e)))
                 continue
 
             if isinstance(cls_o, BaseParser):
-                task_list.append(asyncio.create_task(cls_o.wrap_handle(sem, v)))
+                task_list.append(asyncio.create_task(cls_o.wrap_handle(self.sems[v.parser], v)))
+
+        results = await asyncio.gather(*task_list, return_exceptions=True)
 
+        if isinstance(results, list):
+            for result in results:
+                if isinstance(result, InspectItemResult):
+                    items.append(result)
+                elif isinstance(result, Exception):
+                    logger.exception(result)
+                    items.append(InspectItemResult.failed("<unknown>", type(result).__name__, str(result)))
+
+        self.log_stats()
+
+        return items
+
+    def log_stats(self):
+        if self.graphql is not None and self.graphql.query_count:
+            logger.info(f"GitHub GraphQL batch mode finished with {self.graphql.query_count} query(s).")
+
+        if self.docker_hub_governor is not None:
+            logger.info(f"Docker Hub rate limit | {self.docker_hub_governor.stats}")
+
+        if self.parse_executor.submitted:
+            logger.info(f"Parse executor | {self.parse_executor.stats}")
+
+        if self.scheduler.hosts:
+            logger.info(f"Host concurrency | {self.scheduler.stats}")
+
+        if self.coalescer.deduplicated:
+            logger.info(f"Request coalescing saved {self.coalescer.deduplicated} request(s). ({self.coalescer.stats})")
+
+
+async def process(
+    cfg: Configuration,
+    worker_num: int,
+    filter_name: Optional[str] = None,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    cassette: Optional[Cassette] = None,
+    check_index: Optional[CheckIndex] = None,
+    names: Optional[Collection[str]] = None,
+    prioritize: bool = False,
+    budget: Optional[int] = None,
+):
+    """调度配置中的软件检测任务，并返回每个条目的结构化检测结果。
+
+    该函数负责过滤指定名称、跳过 disabled 条目、复用同一个 aiohttp 会话，并把解析器加载和运行阶段的失败收敛为
+    `InspectItemResult`，避免单个配置项影响整批检测。每种解析器各有 `worker_num` 个条目槽位，互不等待；HTTP 请求再由
+    调度器按主机自适应限流，并受 `max_connections` 全局上限约束。传入 `cassette` 时录制或回放全部 HTTP 响应，此时不使用
+    条件请求缓存，录制到的是完整正文，回放也不受本地缓存状态影响。传入 `names` 时只检测这些条目（分片运行），传入的
+    `check_index` 在运行结束后仍可读取本轮检查过的文件。`prioritize` 或 `budget` 按发布概率排列和筛选条目。
+    """
+    runtime = InspectRuntime(cfg, worker_num, max_connections, cassette=cassette, check_index=check_index)
+    started = time.perf_counter()
+
+    async with runtime:
         try:
-            results = await asyncio.gather(*task_list, return_exceptions=True)
+            softwares, skipped = cfg.settings.softwares, []
+
+            if prioritize or budget is not None:
+                selected = [v for v in softwares if (filter_name is None or v.name == filter_name) and (names is None or v.name in names)]
+                softwares, skipped = prioritize_softwares(cfg, selected, runtime.check_index, budget)
 
-            if isinstance(results, list):
-                for result in results:
-                    if isinstance(result, InspectItemResult):
-                        items.append(result)
-                    elif isinstance(result, Exception):
-                        logger.exception(result)
-                        items.append(InspectItemResult.failed("<unknown>", type(result).__name__, str(result)))
+            result = InspectResult(items=skipped + await runtime.run(softwares, filter_name, names))
+            write_run_report_best_effort(result, time.perf_counter() - started, cfg.workdir)
 
-            return InspectResult(items=items)
+            return result
         except Exception as e:
             logger.exception(e)
             return InspectResult(items=[InspectItemResult.failed("<process>", type(e).__name__, str(e))])
@@ -0,0 +1,182 @@
+import asyncio
+import signal
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import arrow
+import click
+from loguru import logger
+
+from app.commands.combine import combine_and_notify
+from app.commands.inspect import InspectRuntime
+from app.core.click import ClickStdOption
+from app.core.config import AppSettingSoftItem, Configuration
+from app.core.inspect_result import InspectItemResult, InspectStatus
+from app.core.output import get_cache_dir
+from app.core.scheduler import DEFAULT_MAX_CONNECTIONS
+from app.core.watch import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, WATCH_STATE_FILE, WatchSchedule
+
+# 空闲时最长的单次等待，系统时间被调整后也能及时重新计算。
+MAX_IDLE_SECONDS = 60.0
+
+
+def schedule_items(runtime: InspectRuntime, schedule: WatchSchedule, softwares: Dict[str, AppSettingSoftItem]):
+    """把启用的条目加入调度队列：初始间隔取条目的缓存有效期，首次到期时间按上次检测时间推算。"""
+    schedule.retain(softwares)
+
+    for soft in softwares.values():
+        try:
+            parser = runtime.create_parser(soft)
+            _, last_checked = parser.is_expired(soft)
+            checked_at = arrow.get(last_checked, tzinfo="local").timestamp() if last_checked else None
+        except Exception as e:
+            logger.error(f"[{soft.name}] Watch skipped: {type(e).__name__}: {e}")
+            continue
+
+        schedule.add(soft.name, parser.cache_ttl_hours(soft) * 3600, last_checked=checked_at)
+
+
+def record_results(schedule: WatchSchedule, names: List[str], items: List[InspectItemResult], now: float) -> int:
+    """按检测结果调整条目的间隔并重新排队，返回内容发生变化的条目数。"""
+    results = {x.name: x for x in items}
+    changed = 0
+
+    for name in names:
+        item = results.get(name)
+        is_changed = item is not None and item.metrics is not None and item.metrics.files_written > 0
+        schedule.complete(name, is_changed, failed=item is None or item.status == InspectStatus.FAILED, now=now)
+        changed += int(is_changed)
+
+    return changed
+
+
+async def watch(
+    cfg: Configuration,
+    runtime: InspectRuntime,
+    schedule: WatchSchedule,
+    stop: asyncio.Event,
+    notify: bool = False,
+    batch_window: float = 0.0,
+    state_file: Optional[Path] = None,
+):
+    """常驻运行：按到期时间分批检测条目，有输出变化时才重新合并并通知，直到 `stop` 被设置。
+
+    每批结束后写回检查时间索引、条件请求缓存和调度状态；会话、连接池和解析进程池在整个运行期间保持可用。
+    """
+    softwares = {v.name: v for v in cfg.settings.softwares if not v.disabled}
+    runtime.ignore_cache_ttl = True
+
+    async with runtime:
+        schedule_items(runtime, schedule, softwares)
+        logger.info(f"Watching {len(schedule.items)} item(s).")
+
+        while not stop.is_set():
+            now = time.time()
+            next_due = schedule.next_due()
+
+            if next_due is None or next_due > now:
+                timeout = MAX_IDLE_SECONDS if next_due is None else min(next_due - now, MAX_IDLE_SECONDS)
+
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout)
+                except TimeoutError:
+                    pass
+
+                continue
+
+            names = schedule.pop_due(now, batch_window)
+
+            try:
+                items = await runtime.run([softwares[x] for x in names])
+            except Exception as e:
+                logger.exception(e)
+                items = []
+
+            changed = record_results(schedule, names, items, time.time())
+            runtime.save()
+
+            if state_file is not None:
+                schedule.save(state_file)
+
+            following = schedule.next_due()
+            wait = f"{max(following - time.time(), 0):.0f}s" if following is not None else "none"
+            logger.info(f"Watch batch | items: {len(names)}, changed: {changed}, next due in: {wait}")
+
+            if changed:
+                combine_and_notify(cfg, notify)
+
+
+@click.command("watch", help="Run as a daemon: check each item when it is due and combine only when something changed.")
+@click.option(
+    "--worker",
+    "-w",
+    "worker_num",
+    help="The number of worker per parser. (default: 2)",
+    cls=ClickStdOption,
+    default=2,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--max-connections",
+    "max_connections",
+    help=f"The maximum number of concurrent HTTP requests across all hosts. (default: {DEFAULT_MAX_CONNECTIONS})",
+    cls=ClickStdOption,
+    default=DEFAULT_MAX_CONNECTIONS,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--min-interval",
+    "min_interval",
+    help=f"The shortest check interval of an item in minutes. (default: {DEFAULT_MIN_INTERVAL // 60})",
+    cls=ClickStdOption,
+    default=DEFAULT_MIN_INTERVAL // 60,
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.option(
+    "--max-interval",
+    "max_interval",
+    help=f"The longest check interval of an item in hours. (default: {DEFAULT_MAX_INTERVAL // 3600})",
+    cls=ClickStdOption,
+    default=DEFAULT_MAX_INTERVAL // 3600,
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.option(
+    "--batch-window",
+    "batch_window",
+    help="Items due within this many seconds are checked in the same batch. (default: 60)",
+    cls=ClickStdOption,
+    default=60,
+    type=click.FloatRange(min=0),
+)
+@click.option("--notify", "notify", help="Send notification when differences are found.", is_flag=True)
+@click.pass_obj
+def cli(
+    cfg: Configuration, worker_num: int, max_connections: int, min_interval: float, max_interval: float, batch_window: float, notify: bool
+):
+    """常驻检测命令；收到 SIGINT/SIGTERM 时完成当前批次、写回缓存后退出。"""
+    logger.debug(f"app cli watch called. (Working directory: {cfg.workdir} | Title: {cfg.settings.app.title})")
+
+    state_file = get_cache_dir(cfg.workdir).joinpath(WATCH_STATE_FILE)
+
+    try:
+        schedule = WatchSchedule.load(state_file, min_interval * 60, max_interval * 3600)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-interval") from e
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass
+
+        runtime = InspectRuntime(cfg, worker_num, max_connections)
+        await watch(cfg, runtime, schedule, stop, notify=notify, batch_window=batch_window, state_file=state_file)
+
+    asyncio.run(main())
+
+    logger.info("Watch stopped.")
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import time
+from compression import zstd
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from loguru import logger
+from multidict import CIMultiDict, CIMultiDictProxy
+from pydantic import BaseModel, Field
+from yarl import URL
+
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class CassetteEntry(BaseModel):
+    method: str
+    url: str
+    status: int
+    headers: List[Tuple[str, str]] = Field(default_factory=list)
+    body: str = ""
+    elapsed: float = 0.0
+
+
+class CassetteData(BaseModel):
+    version: int = 1
+    entries: Dict[str, CassetteEntry] = Field(default_factory=dict)
+
+
+def make_cassette_key(method: str, url: str, params: Optional[Mapping[str, Any]], data: Any) -> str:
+    """生成录制条目的键；请求头（User-Agent、Token、条件请求头）不参与比较，录制结果可以在不同环境中回放。"""
+    query = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    raw = json.dumps([method.upper(), url, query, data], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_latency(value: str) -> Optional[float]:
+    """解析回放延迟：`recorded` 按录制时测得的耗时等待，数字表示固定的毫秒数。"""
+    if value.strip().lower() == "recorded":
+        return None
+
+    latency = float(value)
+    if latency < 0:
+        raise ValueError("Latency must be greater than or equal to 0.")
+
+    return latency / 1000
+
+
+class CassetteResponse:
+    """回放时代替 aiohttp 响应对象，只实现 `AsyncHttpClient` 读取响应时用到的属性和方法。"""
+
+    def __init__(self, entry: CassetteEntry):
+        self.url = URL(entry.url)
+        self.status = entry.status
+        self.headers = CIMultiDictProxy(CIMultiDict(entry.headers))
+        self._body = entry.body
+
+    async def read(self) -> bytes:
+        return self._body.encode("utf-8")
+
+    async def text(self) -> str:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class Cassette:
+    """HTTP 请求录制/回放存储。
+
+    录制模式下把真实响应（最终 URL、状态码、响应头和正文）按请求键保存，结束时写成 zstd 压缩的 JSON 文件；回放模式下
+    `AsyncHttpClient` 不再访问网络，直接返回录制的响应，并按录制时的耗时或固定延迟等待，用于离线、可重复地比较调度和
+    缓存策略。429 响应不会被录制，回放时不会触发限流等待。
+    """
+
+    def __init__(self, path: Path, mode: str, latency: Optional[float] = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.data = CassetteData()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @classmethod
+    def load(cls, path: Path, mode: str, latency: Optional[float] = None) -> "Cassette":
+        """打开录制文件；回放模式下文件必须存在，录制模式下在已有文件基础上追加。"""
+        cassette = cls(path, mode, latency=latency)
+
+        if path.is_file():
+            cassette.data = CassetteData.model_validate_json(zstd.decompress(path.read_bytes()))
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette file does not exist: {path}")
+
+        return cassette
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    async def replay(self, request_kwargs: Mapping[str, Any]) -> CassetteResponse:
+        """返回录制的响应；没有对应录制时抛出 `CassetteMiss`，不会退回到网络请求。"""
+        method, url = request_kwargs["method"], request_kwargs["url"]
+        entry = self.data.entries.get(make_cassette_key(method, url, request_kwargs.get("params"), request_kwargs.get("json")))
+
+        if entry is None:
+            self.misses += 1
+            raise CassetteMiss(f"No recorded response in cassette. ({method} {url})")
+
+        self.hits += 1
+        await asyncio.sleep(entry.elapsed if self.latency is None else self.latency)
+
+        return CassetteResponse(entry)
+
+    async def record(self, request_kwargs: Mapping[str, Any], resp, started: float):
+        """读取并保存真实响应；正文由 aiohttp 缓存，后续解析不会重复读取网络数据。"""
+        if resp.status == 429:
+            return
+
+        body = await resp.text(errors="replace")
+        method, url = request_kwargs["method"], request_kwargs["url"]
+        key = make_cassette_key(method, url, request_kwargs.get("params"), request_kwargs.get("json"))
+
+        self.data.entries[key] = CassetteEntry(
+            method=method.upper(),
+            url=str(resp.url),
+            status=resp.status,
+            headers=list(resp.headers.items()),
+            body=body,
+            elapsed=round(time.monotonic() - started, 4),
+        )
+        self.recorded += 1
+
+    def save(self):
+        if not self.recording:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(zstd.compress(self.data.model_dump_json().encode("utf-8")))
+
+        logger.info(f"Cassette saved. ({self.path} | {len(self.data.entries)} response(s))")
+
+    @property
+    def stats(self) -> str:
+        if self.recording:
+            return f"recorded: {self.recorded}, entries: {len(self.data.entries)}"
+
+        return f"replayed: {self.hits}, missing: {self.misses}"
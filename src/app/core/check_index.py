@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Set
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.core.output import get_cache_dir, get_output_dir
+
+CHECK_INDEX_FILE = "last-checked.index"
+WRITE_MODES = ("changed", "always")
+
+
+class CheckIndexEntry(BaseModel):
+    checked: str
+    sha256: str
+    # 记录哈希时输出文件的大小和修改时间，与磁盘不一致（手工修改、回退）时重新计算哈希。
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+
+
+class CheckIndexData(BaseModel):
+    entries: Dict[str, CheckIndexEntry] = Field(default_factory=dict)
+    items: Dict[str, str] = Field(default_factory=dict)
+
+
+def payload_digest(payload: Dict[str, Any]) -> str:
+    """计算输出内容的语义哈希；`created_time` 每次都会变化，不参与比较。"""
+    data = {k: v for k, v in payload.items() if k != "created_time"}
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_write_mode() -> str:
+    """读取输出写入模式：changed 只在内容变化时重写文件，always 保持每次重写。"""
+    mode = os.environ.get("VERSION_CHECKER_WRITE_MODE", "changed").strip().lower()
+
+    if mode not in WRITE_MODES:
+        logger.warning(f"Invalid VERSION_CHECKER_WRITE_MODE value. Using default value: {WRITE_MODES[0]}.")
+        return WRITE_MODES[0]
+
+    return mode
+
+
+class CheckIndex:
+    """输出文件和软件条目的检查时间索引。
+
+    内容未变化时解析器不重写 `{name}.json`，只在这里记录最近一次成功检查的时间和内容哈希；同时按条目名称记录最近一次成功检测
+    的时间，供所有解析器判断缓存是否过期。检查时间每轮都会变化，索引保存在缓存目录而不是会被提交的输出目录。
+    """
+
+    def __init__(self, output_dir: Path, index_dir: Path, mode: str = "changed"):
+        self.output_dir = output_dir
+        self.index_dir = index_dir
+        self.mode = mode
+        self.data = CheckIndexData()
+        self.written = 0
+        self.unchanged = 0
+        # 本轮运行中检查过的输出文件，分片运行时据此打包结果。
+        self.touched: Set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, output_dir: Path, index_dir: Path, mode: str = "changed") -> "CheckIndex":
+        index = cls(output_dir, index_dir, mode=mode)
+        index_file = index_dir.joinpath(CHECK_INDEX_FILE)
+
+        if index_file.is_file():
+            try:
+                index.data = CheckIndexData.model_validate_json(index_file.read_bytes())
+            except Exception as e:
+                logger.warning(f"Check index is invalid and will be rebuilt: {type(e).__name__}: {e}")
+
+        return index
+
+    def get(self, file_name: str) -> Optional[CheckIndexEntry]:
+        return self.data.entries.get(file_name)
+
+    def last_checked(self, name: str) -> Optional[str]:
+        return self.data.items.get(name)
+
+    def mark_checked(self, name: str, checked: str):
+        self.data.items[name] = checked
+        self._dirty = True
+
+    def is_unchanged(self, file_name: str, digest: str) -> bool:
+        """判断输出内容是否与磁盘上的文件一致；always 模式始终返回 False。
+
+        文件大小和修改时间与索引记录一致时直接比较索引中的哈希，否则（索引缺失或文件被改动过）读取旧文件计算哈希。
+        """
+        if self.mode == "always":
+            return False
+
+        file = self.output_dir.joinpath(file_name)
+
+        try:
+            stat = file.stat()
+        except OSError:
+            return False
+
+        entry = self.get(file_name)
+        if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return entry.sha256 == digest
+
+        try:
+            with open(file, "r", encoding="utf-8") as f:
+                return payload_digest(json.loads(f.read())) == digest
+        except Exception:
+            return False
+
+    def _stat(self, file_name: str) -> Dict[str, Optional[int]]:
+        try:
+            stat = self.output_dir.joinpath(file_name).stat()
+        except OSError:
+            return {"size": None, "mtime_ns": None}
+
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def touch(self, file_name: str, digest: str, checked: str, written: bool):
+        """记录输出文件的检查结果；需要在文件写入之后调用，以便记录写入后的大小和修改时间。"""
+        self.data.entries[file_name] = CheckIndexEntry(checked=checked, sha256=digest, **self._stat(file_name))
+        self.touched.add(file_name)
+        self._dirty = True
+
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def update(self, entries: Mapping[str, CheckIndexEntry], items: Mapping[str, str]):
+        """合并其他运行（分片）记录的文件和条目检查时间；文件已写回本地输出目录，大小和修改时间按本地文件重新记录。"""
+        if not entries and not items:
+            return
+
+        self.data.entries.update({k: v.model_copy(update=self._stat(k)) for k, v in entries.items()})
+        self.data.items.update(items)
+        self._dirty = True
+
+    def save(self):
+        """按文件名排序写回缓存目录中的索引。"""
+        if not self._dirty:
+            return
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.data.entries = dict(sorted(self.data.entries.items()))
+        self.data.items = dict(sorted(self.data.items.items()))
+
+        with open(self.index_dir.joinpath(CHECK_INDEX_FILE), "w", encoding="utf-8") as f:
+            f.write(self.data.model_dump_json(indent=1))
+
+        self._dirty = False
+
+    @property
+    def stats(self) -> str:
+        return f"written: {self.written}, unchanged: {self.unchanged}"
+
+
+def load_check_index(workdir: str | Path | None) -> CheckIndex:
+    """读取工作目录的检查时间索引：输出文件位于输出目录，索引位于缓存目录。"""
+    return CheckIndex.load(get_output_dir(workdir), get_cache_dir(workdir), mode=get_write_mode())
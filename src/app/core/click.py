@@ -1,4 +1,7 @@
-from click.core import Option
+import importlib
+from typing import Dict, List, Optional
+
+from click.core import Command, Context, Group, Option
 from click.formatting import join_options
 
 
@@ -28,3 +31,33 @@ class ClickStdOption(Option):
             help_s = "%s\033[38;5;196m%s\033[0m" % (help_s and help_s + " " or "", "; ".join(extra))
 
         return (any_prefix_is_slash and "; " or " / ").join(rv), help_s
+
+
+class LazyGroup(Group):
+    """按需导入子命令模块的命令组。
+
+    `lazy_subcommands` 为 `{"命令名": "模块路径:属性名"}`，只有真正执行或展示某个子命令时才导入对应模块，避免 `version` 这类轻量
+    命令也加载全部依赖。
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> Command:
+        module_name, _, attr = self.lazy_subcommands[cmd_name].partition(":")
+        cmd = getattr(importlib.import_module(module_name), attr)
+
+        if not isinstance(cmd, Command):
+            raise ValueError(f"Lazy command {cmd_name} did not resolve to a click command. ({self.lazy_subcommands[cmd_name]})")
+
+        return cmd
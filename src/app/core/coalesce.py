@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+
+def make_request_key(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+    is_json: bool,
+    raise_for_status: bool,
+) -> Tuple[Hashable, ...]:
+    """生成本轮运行内的请求合并键；只保存在内存中，请求头原样参与比较。"""
+    query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    hdr = tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items()))
+
+    return method.upper(), url, query, hdr, is_json, raise_for_status
+
+
+class RequestCoalescer:
+    """运行期内的 GET 请求合并（single-flight）。
+
+    相同请求并发时只发出一次，其余调用等待同一个结果；完成后的结果在本轮运行内复用。失败结果和 `reusable` 判定为不可复用的
+    结果（例如 `raise_for_status=False` 时返回的 429/5xx）只共享给并发的等待方，不缓存，后续调用会重新请求。
+    返回的响应正文由所有调用方共享，解析器只能读取不能修改。
+    """
+
+    def __init__(self):
+        self.network = 0
+        self.joined = 0
+        self.reused = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._done: Dict[Hashable, Any] = {}
+
+    async def run(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], reusable: Optional[Callable[[Any], bool]] = None) -> Any:
+        if key in self._done:
+            self.reused += 1
+            return self._done[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.joined += 1
+            # shield 保证单个等待方被取消时不会取消共享请求；发起方被取消时由当前调用方重新发起。
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.run(key, fetch, reusable)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.network += 1
+
+        try:
+            result = await fetch()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # 没有其他等待方时消费异常，避免 "exception was never retrieved" 警告。
+                future.exception()
+            raise
+        else:
+            if reusable is None or reusable(result):
+                self._done[key] = result
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    @property
+    def deduplicated(self) -> int:
+        return self.joined + self.reused
+
+    @property
+    def stats(self) -> str:
+        return f"network: {self.network}, joined in-flight: {self.joined}, reused: {self.reused}"
@@ -1,6 +1,15 @@
-from typing import Any, List, Literal, Optional
+import hashlib
+import os
+import tomllib
+from pathlib import Path
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import AliasChoices, BaseModel, Field
+import pydantic
+from loguru import logger
+from pydantic import AliasChoices, BaseModel, Discriminator, Field, Tag
+
+from app import __version__
+from app.core.utils import safe_strtobool
 
 
 class AppSettingBase(BaseModel):
@@ -19,6 +28,7 @@ class AppSettingSoftItem(BaseModel):
     download_dynamic: bool = Field(default=False, description="动态生成下载地址")
     download_urls: List[str] = Field(default_factory=list)
     condition: Optional[str] = None  # 条件表达式: major >= 6 && minor < 5 或 major >= 6
+    cache_ttl: Optional[int] = Field(default=None, ge=0, description="缓存有效期（小时），0 表示每次都检测")
 
 
 class GithubSoftware(AppSettingSoftItem):
@@ -30,6 +40,7 @@ class GithubSoftware(AppSettingSoftItem):
     assets_patterns: List[str] = Field(default_factory=list)
     max_page: int = Field(default=1)
     page_size: int = Field(default=100)
+    watermark: bool = Field(default=False)  # 以上次抓取的列表为水位线，翻页遇到已知版本即停止，更早的条目沿用上次结果。
 
 
 class GiteaSoftware(AppSettingSoftItem):
@@ -168,45 +179,62 @@ class DockerHubSoftware(AppSettingSoftItem):
     repo: str = ...
     fixed_tags: List[str] = Field(default_factory=list)
     max_page: int = Field(default=1)
+    incremental: bool = Field(default=True)  # 按更新时间排序翻页，遇到上次已同步的 Tag 即停止，并与缓存的 Tag 列表合并；定期完整同步。
 
     def model_post_init(self, __context: Any) -> None:
         if self.name is None:
             self.name = self.repo
 
 
+def _software_parser(v: Any) -> str:
+    """返回软件条目的解析器标签；未配置 parser 的条目按 GitHub 处理。"""
+    if isinstance(v, dict):
+        return v.get("parser", "gh")
+
+    return getattr(v, "parser", "gh")
+
+
+# 按 parser 字段直接选择模型，避免逐个尝试 Union 成员。
+SoftwareItem = Annotated[
+    Union[
+        Annotated[ApacheFlumeSoftware, Tag("apache-flume")],
+        Annotated[NodeJsSoftware, Tag("nodejs")],
+        Annotated[VirtualBoxSoftware, Tag("virtualbox")],
+        Annotated[GoSoftware, Tag("go")],
+        Annotated[PhpSoftware, Tag("php")],
+        Annotated[GithubSoftware, Tag("gh")],
+        Annotated[GithubDesktopSoftware, Tag("github-desktop")],
+        Annotated[GiteaSoftware, Tag("gitea")],
+        Annotated[GitlabSoftware, Tag("gitlab")],
+        Annotated[CodebergSoftware, Tag("codeberg")],
+        Annotated[DotNetFxSoftware, Tag("dotnetfx")],
+        Annotated[DotNetSoftware, Tag("dotnet")],
+        Annotated[ChromeSoftware, Tag("chrome")],
+        Annotated[JetbrainsSoftware, Tag("jetbrains")],
+        Annotated[JetbrainsPluginSoftware, Tag("jetbrains-plugin")],
+        Annotated[FirefoxSoftware, Tag("firefox")],
+        Annotated[SublimeSoftware, Tag("sublime")],
+        Annotated[XShellSoftware, Tag("xshell")],
+        Annotated[AndroidStudioSoftware, Tag("android-studio")],
+        Annotated[SourceForgeSoftware, Tag("sf")],
+        Annotated[GitLsRemoteSoftware, Tag("git-ls-remote")],
+        Annotated[FlutterSoftware, Tag("flutter")],
+        Annotated[DartSoftware, Tag("dart")],
+        Annotated[NavicatSoftware, Tag("navicat")],
+        Annotated[HAProxySoftware, Tag("haproxy")],
+        Annotated[DockerHubSoftware, Tag("docker-hub")],
+        Annotated[AlmaLinuxSoftware, Tag("almalinux")],
+        Annotated[RockyLinuxSoftware, Tag("rockylinux")],
+        Annotated[IndexSoftware, Tag("index")],
+    ],
+    Discriminator(_software_parser),
+]
+
+
 class AppSetting(BaseModel):
     app: Optional[AppSettingBase] = None
-    softwares: List[
-        ApacheFlumeSoftware
-        | NodeJsSoftware
-        | VirtualBoxSoftware
-        | GoSoftware
-        | PhpSoftware
-        | GithubSoftware
-        | GithubDesktopSoftware
-        | GiteaSoftware
-        | GitlabSoftware
-        | CodebergSoftware
-        | DotNetFxSoftware
-        | DotNetSoftware
-        | ChromeSoftware
-        | JetbrainsSoftware
-        | JetbrainsPluginSoftware
-        | FirefoxSoftware
-        | SublimeSoftware
-        | XShellSoftware
-        | AndroidStudioSoftware
-        | SourceForgeSoftware
-        | GitLsRemoteSoftware
-        | FlutterSoftware
-        | DartSoftware
-        | NavicatSoftware
-        | HAProxySoftware
-        | DockerHubSoftware
-        | AlmaLinuxSoftware
-        | RockyLinuxSoftware
-        | IndexSoftware
-    ] = Field(alias="softwares", default_factory=list)
+    cache_ttl: Dict[str, int] = Field(default_factory=dict)  # 按解析器配置缓存有效期（小时），例如 docker-hub = 6
+    softwares: List[SoftwareItem] = Field(alias="softwares", default_factory=list)
 
 
 class Configuration(BaseModel):
@@ -232,3 +260,57 @@ class OutputResult(BaseModel):
     download_urls: List[str] = Field(default_factory=list)
     created_time: str
     jbp_extra: dict | None = Field(default=None, alias="jbp_extra")
+
+
+class AppSettingSnapshot(BaseModel):
+    key: str
+    settings: AppSetting
+
+
+def _settings_snapshot_key(raw: bytes) -> str:
+    """快照键包含配置文件内容、应用版本、pydantic 版本和配置模型源码，任一变化都会重新校验。"""
+    digest = hashlib.sha256(raw)
+    digest.update(f"\0{__version__}\0{pydantic.VERSION}\0".encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+
+    return digest.hexdigest()
+
+
+def load_app_setting(config_file: str | Path, cache_dir: Optional[Path] = None) -> AppSetting:
+    """读取并校验 TOML 配置。
+
+    传入缓存目录时会保存校验后的配置快照，配置文件未变化的后续调用直接读取快照，跳过 TOML 解析。缓存目录会在 CI 运行之间恢复，
+    内容不可信任，快照因此保存为 JSON 并重新经过模型校验，不使用 pickle 等可执行代码的格式。快照损坏或写入失败不影响配置加载。
+    """
+    raw = Path(config_file).read_bytes()
+
+    if cache_dir is None or not safe_strtobool(os.environ.get("VERSION_CHECKER_CONFIG_CACHE", "true"), default=True):
+        return AppSetting.model_validate(tomllib.loads(raw.decode("utf-8")))
+
+    key = _settings_snapshot_key(raw)
+    path_digest = hashlib.sha256(str(Path(config_file).resolve()).encode("utf-8")).hexdigest()[:16]
+    snapshot_file = cache_dir.joinpath("config", f"{path_digest}.json")
+
+    if snapshot_file.is_file():
+        try:
+            snapshot = AppSettingSnapshot.model_validate_json(snapshot_file.read_bytes())
+
+            if snapshot.key == key:
+                return snapshot.settings
+        except Exception as e:
+            logger.debug(f"Configuration snapshot ignored: {type(e).__name__}: {e}")
+
+    settings = AppSetting.model_validate(tomllib.loads(raw.decode("utf-8")))
+
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_suffix(".tmp")
+
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(AppSettingSnapshot(key=key, settings=settings).model_dump_json(by_alias=True))
+
+        os.replace(tmp_file, snapshot_file)
+    except Exception as e:
+        logger.warning(f"Configuration snapshot save skipped: {type(e).__name__}: {e}")
+
+    return settings
@@ -0,0 +1,79 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.utils import get_env_int
+
+PARSE_EXECUTOR_MODES = ("process", "thread", "inline")
+
+
+def get_parse_executor_mode() -> str:
+    """读取页面解析执行方式：process 使用进程池，thread 使用线程池，inline 在事件循环中直接解析。"""
+    mode = os.environ.get("VERSION_CHECKER_PARSE_EXECUTOR", "process").strip().lower()
+
+    if mode not in PARSE_EXECUTOR_MODES:
+        logger.warning(f"Invalid VERSION_CHECKER_PARSE_EXECUTOR value. Using default value: {PARSE_EXECUTOR_MODES[0]}.")
+        return PARSE_EXECUTOR_MODES[0]
+
+    return mode
+
+
+class ParseExecutor:
+    """HTML/XML/RSS 页面解析执行器。
+
+    html5lib 是纯 Python 实现，大页面解析会长时间占用事件循环，阻塞其他在途请求；解析器把页面文本交给模块级的纯函数，
+    由这里放到进程池（或线程池）执行，主进程只负责网络请求和版本汇总。进程池在第一次使用时创建，整轮运行共享；进程池
+    不可用时退回到事件循环中直接解析。
+    """
+
+    def __init__(self, mode: str = "process", max_workers: Optional[int] = None):
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.submitted = 0
+        self.inline = 0
+        self._pool: Optional[Executor] = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """执行解析函数并返回结果；进程模式下函数必须定义在模块顶层，参数和返回值必须可以 pickle。"""
+        if self.mode == "inline":
+            self.inline += 1
+            return func(*args)
+
+        pool = self._get_pool()
+        self.submitted += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            logger.warning("Parse process pool is broken. Falling back to inline parsing.")
+            self.shutdown()
+            self.mode = "inline"
+            self.inline += 1
+            return func(*args)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def stats(self) -> str:
+        return f"mode: {self.mode}, workers: {self.max_workers}, offloaded: {self.submitted}, inline: {self.inline}"
+
+
+def create_parse_executor() -> ParseExecutor:
+    """按环境变量创建解析执行器；工作进程数默认等于 CPU 核数。"""
+    return ParseExecutor(get_parse_executor_mode(), get_env_int("VERSION_CHECKER_PARSE_WORKERS", os.cpu_count() or 1))
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.core.config import GithubSoftware
+from app.core.http import AsyncHttpClient
+from app.core.utils import get_env_int, safe_strtobool
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_GRAPHQL_MAX_FIRST = 100
+GITHUB_GRAPHQL_ASSETS_FIRST = 100
+
+
+class GithubGraphQLSettings(BaseModel):
+    enabled: bool = Field(default=True)
+    batch_size: int = Field(default=50)
+    cost_budget: int = Field(default=20)
+    fallback: bool = Field(default=True)
+
+
+def get_graphql_settings() -> GithubGraphQLSettings:
+    """从环境变量读取 GraphQL 批量模式配置。"""
+    return GithubGraphQLSettings(
+        enabled=safe_strtobool(os.environ.get("VERSION_CHECKER_GH_GRAPHQL", "true"), default=True),
+        batch_size=get_env_int("VERSION_CHECKER_GH_GRAPHQL_BATCH_SIZE", 50),
+        cost_budget=get_env_int("VERSION_CHECKER_GH_GRAPHQL_COST_BUDGET", 20),
+        fallback=safe_strtobool(os.environ.get("VERSION_CHECKER_GH_GRAPHQL_FALLBACK", "true"), default=True),
+    )
+
+
+def _split_repo(repo: str) -> Tuple[str, str]:
+    owner, _, name = repo.partition("/")
+    return owner, name
+
+
+def _assets_fields() -> str:
+    return f"releaseAssets(first: {GITHUB_GRAPHQL_ASSETS_FIRST}) {{ nodes {{ downloadUrl }} }}"
+
+
+def build_repository_field(alias: str, soft: GithubSoftware) -> str:
+    """生成单个仓库的别名查询片段，字段选择与 REST 分支保持一致。"""
+    owner, name = _split_repo(soft.repo)
+    head = f"{alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)})"
+    assets = _assets_fields() if soft.assets else ""
+
+    if soft.latest:
+        body = f"latestRelease {{ tagName isDraft isPrerelease {assets} }}"
+    elif soft.release:
+        first = soft.max_page * soft.page_size
+        order = "orderBy: {field: CREATED_AT, direction: DESC}"
+        body = f"releases(first: {first}, {order}) {{ nodes {{ tagName isDraft isPrerelease {assets} }} }}"
+    else:
+        # 按标签提交时间倒序截取：按名称排序时 `v9.x` 排在 `v10.x` 前、`release-*` 排在 `v*` 前，标签较多的仓库会丢掉最新版本。
+        first = soft.max_page * soft.page_size
+        order = "orderBy: {field: TAG_COMMIT_DATE, direction: DESC}"
+        body = f'refs(refPrefix: "refs/tags/", first: {first}, {order}) {{ nodes {{ name }} }}'
+
+    return f"{head} {{ {body} }}"
+
+
+def estimate_cost(soft: GithubSoftware) -> int:
+    """按 GitHub 限额规则估算单个仓库需要的子请求数，100 个子请求约等于 1 点。"""
+    if soft.latest:
+        first = 1
+    else:
+        first = soft.max_page * soft.page_size
+
+    # 仓库节点和版本连接各算一次；附件连接在每个 Release 下展开一次。
+    return 2 + (first if soft.assets else 0)
+
+
+def to_rest_payload(soft: GithubSoftware, repository: Dict[str, Any]) -> Any:
+    """把 GraphQL 仓库结果转换为 REST 接口形状，解析器可以沿用原有处理分支。"""
+
+    def _release(node: Dict[str, Any]) -> Dict[str, Any]:
+        item = {"tag_name": node["tagName"], "draft": node["isDraft"], "prerelease": node["isPrerelease"]}
+        if "releaseAssets" in node:
+            item["assets"] = [{"browser_download_url": v["downloadUrl"]} for v in node["releaseAssets"]["nodes"]]
+        return item
+
+    if soft.latest:
+        node = repository.get("latestRelease")
+        return _release(node) if node else None
+    elif soft.release:
+        return [_release(v) for v in repository["releases"]["nodes"]]
+    else:
+        return [{"name": v["name"]} for v in repository["refs"]["nodes"]]
+
+
+class GithubGraphQLBatcher:
+    """把多个 gh 条目合并为带别名的 GraphQL 查询，按批次抓取 Tags/Releases。
+
+    条目调用 `fetch()` 后进入等待队列，同一轮事件循环内的请求会被合并；返回 None 表示应回退到 REST。
+    """
+
+    def __init__(
+        self,
+        httpc: AsyncHttpClient,
+        token: str,
+        settings: Optional[GithubGraphQLSettings] = None,
+        sem: Optional[asyncio.Semaphore] = None,
+    ):
+        self.httpc = httpc
+        self.token = token
+        self.settings = settings or get_graphql_settings()
+        self.sem = sem
+        self.rate_remaining: Optional[int] = None
+        self.query_count = 0
+        self._pending: List[Tuple[GithubSoftware, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def supports(self, soft: GithubSoftware) -> bool:
+        """单次 GraphQL 连接最多返回 100 个节点，超出范围的分页仍走 REST。"""
+        if soft.latest:
+            return True
+
+        return soft.max_page * soft.page_size <= GITHUB_GRAPHQL_MAX_FIRST
+
+    async def fetch(self, soft: GithubSoftware) -> Any:
+        """提交单个条目并等待所在批次完成。"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((soft, future))
+
+        if len(self._pending) >= self.settings.batch_size:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+
+        return await future
+
+    def _chunks(self, pending: List[Tuple[GithubSoftware, asyncio.Future]]) -> List[List[Tuple[GithubSoftware, asyncio.Future]]]:
+        """按条目数量和估算点数拆分批次，避免单个查询超出成本预算。"""
+        chunks = []
+        current = []
+        current_cost = 0
+        budget = self.settings.cost_budget * 100
+
+        for item in pending:
+            cost = estimate_cost(item[0])
+
+            if current and (len(current) >= self.settings.batch_size or current_cost + cost > budget):
+                chunks.append(current)
+                current, current_cost = [], 0
+
+            current.append(item)
+            current_cost += cost
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def _flush(self):
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+
+        for chunk in self._chunks(pending):
+            task = asyncio.create_task(self._run_chunk(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _resolve_fallback(self, chunk: List[Tuple[GithubSoftware, asyncio.Future]], error: Exception):
+        for _, future in chunk:
+            if future.done():
+                continue
+
+            if self.settings.fallback:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def _post(self, query: str) -> Any:
+        headers = {"Authorization": f"Bearer {self.token}"}
+
+        if self.sem is None:
+            _, _, _, data_r = await self.httpc.request("POST", GITHUB_GRAPHQL_URL, data={"query": query}, headers=headers, is_json=True)
+            return data_r
+
+        async with self.sem:
+            _, _, _, data_r = await self.httpc.request("POST", GITHUB_GRAPHQL_URL, data={"query": query}, headers=headers, is_json=True)
+            return data_r
+
+    async def _run_chunk(self, chunk: List[Tuple[GithubSoftware, asyncio.Future]]):
+        cost = max(1, sum(estimate_cost(soft) for soft, _ in chunk) // 100)
+
+        if self.rate_remaining is not None and self.rate_remaining < cost:
+            logger.warning(f"GitHub GraphQL rate limit budget exhausted. ({self.rate_remaining} < {cost}) Falling back to REST.")
+            self._resolve_fallback(chunk, RuntimeError("GitHub GraphQL rate limit budget exhausted."))
+            return
+
+        try:
+            await self._query_chunk(chunk)
+        except Exception as e:
+            logger.warning(f"GitHub GraphQL batch response cannot be processed: {type(e).__name__}: {e}")
+            self._resolve_fallback(chunk, e)
+        finally:
+            # 出错或任务被取消时，批次中尚未完成的条目一律回退，避免等待中的 gh 条目挂起整轮运行。
+            self._resolve_fallback(chunk, RuntimeError("GitHub GraphQL batch was interrupted."))
+
+    async def _query_chunk(self, chunk: List[Tuple[GithubSoftware, asyncio.Future]]):
+        fields = [build_repository_field(f"r{i}", soft) for i, (soft, _) in enumerate(chunk)]
+        query = "query { %s rateLimit { cost remaining resetAt } }" % " ".join(fields)
+
+        try:
+            data_r = await self._post(query)
+        except Exception as e:
+            logger.warning(f"GitHub GraphQL batch request failed: {type(e).__name__}: {e}")
+            self._resolve_fallback(chunk, e)
+            return
+
+        self.query_count += 1
+
+        data = data_r.get("data") if isinstance(data_r, dict) else None
+        if not isinstance(data, dict):
+            errors = data_r.get("errors") if isinstance(data_r, dict) else data_r
+            self._resolve_fallback(chunk, RuntimeError(f"Invalid GitHub GraphQL response: {errors}"))
+            return
+
+        rate = data.get("rateLimit") or {}
+        if "remaining" in rate:
+            self.rate_remaining = rate["remaining"]
+
+        logger.debug(f"GitHub GraphQL batch: {len(chunk)} item(s), cost: {rate.get('cost')}, remaining: {rate.get('remaining')}")
+
+        errors = {}
+        for error in data_r.get("errors") or []:
+            path = error.get("path") if isinstance(error, dict) else None
+            if path:
+                errors[path[0]] = error.get("message", "")
+
+        for i, (soft, future) in enumerate(chunk):
+            repository = data.get(f"r{i}")
+
+            if repository is None:
+                message = errors.get(f"r{i}", "Repository not found.")
+                logger.debug(f"[{soft.name}] GitHub GraphQL returned no repository: {message}")
+                self._resolve_fallback([(soft, future)], RuntimeError(f"GitHub GraphQL error. ({soft.repo} | {message})"))
+                continue
+
+            try:
+                payload = to_rest_payload(soft, repository)
+            except Exception as e:
+                # 节点结构与查询不符时只回退这一个条目，同批次的其他条目照常返回。
+                logger.warning(f"[{soft.name}] GitHub GraphQL repository node is malformed: {type(e).__name__}: {e}")
+                self._resolve_fallback([(soft, future)], RuntimeError(f"Malformed GitHub GraphQL repository node. ({soft.repo})"))
+                continue
+
+            if payload is None:
+                # 没有 latestRelease 时交给 REST 分支，保持与原实现一致的错误信息。
+                self._resolve_fallback([(soft, future)], RuntimeError(f"GitHub GraphQL latest release not found. ({soft.repo})"))
+            else:
+                future.set_result(payload)
@@ -0,0 +1,144 @@
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import arrow
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+HISTORY_FILE = "release-history.jsonl"
+# 先验强度：按全部条目的平均发布速率折算成 30 天的观察量。
+DEFAULT_PRIOR_DAYS = 30.0
+SECONDS_PER_DAY = 86400.0
+
+
+class ReleaseEvent(BaseModel):
+    name: str
+    latest: str
+    previous: Optional[str] = None
+    observed: str
+
+
+def parse_time(value: str) -> float:
+    """把输出文件中 `YYYY-MM-DD HH:mm:ss` 格式的本地时间转换为时间戳。"""
+    return arrow.get(value, tzinfo="local").timestamp()
+
+
+def diff_releases(new_records: Iterable[Mapping], old_records: Optional[Iterable[Mapping]]) -> List[ReleaseEvent]:
+    """按条目名称比较合并前后的 `latest`，生成版本变化事件；首次出现的条目记为 `previous` 为空的观察起点。
+
+    事件时间取输出记录的 `created_time`（检测到新版本的时间），缺失时取当前时间。
+    """
+    old_latest: Dict[str, str] = {x["name"]: x["latest"] for x in old_records or [] if "name" in x and "latest" in x}
+    now = arrow.now().format("YYYY-MM-DD HH:mm:ss")
+    events = []
+
+    for record in new_records:
+        if "name" not in record or "latest" not in record:
+            continue
+
+        name, latest = record["name"], record["latest"]
+        previous = old_latest.get(name)
+
+        if previous != latest:
+            events.append(ReleaseEvent(name=name, latest=latest, previous=previous, observed=record.get("created_time") or now))
+
+    return events
+
+
+def append_history(output_dir: Path, events: Sequence[ReleaseEvent]):
+    """把事件追加到 `release-history.jsonl`；只追加不改写，文件名不以 `.json` 结尾，不会被 combine 合并。"""
+    if not events:
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(output_dir.joinpath(HISTORY_FILE), "a", encoding="utf-8") as f:
+        f.writelines(x.model_dump_json() + "\n" for x in events)
+
+
+def load_history(output_dir: Path) -> List[ReleaseEvent]:
+    """读取版本变化历史；无法解析的行（例如写入中断留下的半行）跳过。"""
+    history_file = output_dir.joinpath(HISTORY_FILE)
+    events = []
+
+    if not history_file.is_file():
+        return events
+
+    with open(history_file, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                events.append(ReleaseEvent.model_validate_json(line))
+            except ValidationError:
+                logger.warning(f"Release history line {line_no} is invalid and was skipped.")
+
+    return events
+
+
+class ReleaseEstimator:
+    """按历史变化次数估计条目在一段时间内发布新版本的概率。
+
+    每个条目的发布视为泊松过程，速率（次/天）取 `(变化次数 + 先验次数) / (观察天数 + prior_days)`：先验按全部条目的平均速率
+    折算成 `prior_days` 天的观察量，历史很短的条目接近平均值，观察时间越长越接近自身的频率。观察从条目首次出现在历史中开始。
+    """
+
+    def __init__(self, events: Iterable[ReleaseEvent], now: Optional[float] = None, prior_days: float = DEFAULT_PRIOR_DAYS):
+        now = time.time() if now is None else now
+        first_seen: Dict[str, float] = {}
+        self.changes: Dict[str, int] = {}
+
+        for event in events:
+            try:
+                observed = parse_time(event.observed)
+            except ValueError, TypeError:
+                continue
+
+            first_seen[event.name] = min(first_seen.get(event.name, observed), observed)
+            self.changes[event.name] = self.changes.get(event.name, 0) + int(event.previous is not None)
+
+        self.exposure = {k: max(now - v, 0.0) / SECONDS_PER_DAY for k, v in first_seen.items()}
+        self.prior_days = prior_days
+
+        total_changes, total_days = sum(self.changes.values()), sum(self.exposure.values())
+        self.global_rate = total_changes / total_days if total_changes and total_days else 1 / prior_days
+
+    def rate(self, name: str) -> float:
+        """条目每天发布新版本的期望次数。"""
+        changes, days = self.changes.get(name, 0), self.exposure.get(name, 0.0)
+        return (changes + self.global_rate * self.prior_days) / (days + self.prior_days)
+
+    def probability(self, name: str, elapsed_days: Optional[float]) -> float:
+        """距上次检测 `elapsed_days` 天内至少发布一次新版本的概率；从未检测过的条目返回 1。"""
+        if elapsed_days is None:
+            return 1.0
+
+        return 1 - math.exp(-self.rate(name) * max(elapsed_days, 0.0))
+
+
+def plan_budget(
+    names: Sequence[str], probabilities: Mapping[str, float], costs: Mapping[str, float], budget: Optional[float]
+) -> Tuple[List[str], List[str]]:
+    """按每个请求的期望收益（发布概率 / 预计请求数）排序，返回（检测顺序，因预算跳过的条目）。
+
+    `budget` 为 None 时只排序不跳过；否则按顺序依次放入，超出剩余预算的条目跳过，后面请求更少的条目仍可放入。
+    """
+    ordered = sorted(names, key=lambda x: (-probabilities[x] / costs[x], -probabilities[x], x))
+
+    if budget is None:
+        return ordered, []
+
+    selected, skipped = [], []
+    remaining = budget
+
+    for name in ordered:
+        if costs[name] <= remaining:
+            selected.append(name)
+            remaining -= costs[name]
+        else:
+            skipped.append(name)
+
+    return selected, skipped
@@ -1,5 +1,7 @@
 import os
-from typing import Any, Dict, Optional, Tuple
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
 
 import aiohttp
 from loguru import logger
@@ -7,12 +9,37 @@ from multidict import CIMultiDictProxy
 from yarl import URL
 
 from . import DEFAULT_USERAGENT
+from .cassette import Cassette
+from .coalesce import RequestCoalescer, make_request_key
+from .http_cache import ValidatorCache
+from .json_stream import JsonArrayDecoder
+from .metrics import current_metrics, timed
+from .response_store import ResponseStore
+from .scheduler import RequestFeedback, RequestScheduler
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# 流式请求在条件请求缓存中保存原始正文，用单独的缓存键，避免与普通 JSON 请求保存的解析结果混用。
+STREAM_CACHE_METHOD = "GET-STREAM"
 
 
 class AsyncHttpClient:
-    def __init__(self, debug: bool = False, session: aiohttp.ClientSession | None = None):
+    def __init__(
+        self,
+        debug: bool = False,
+        session: aiohttp.ClientSession | None = None,
+        cache: ValidatorCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        coalescer: RequestCoalescer | None = None,
+        cassette: Cassette | None = None,
+        store: ResponseStore | None = None,
+    ):
         self.debug: bool = debug
         self.session = session
+        self.cache = cache
+        self.scheduler = scheduler
+        self.coalescer = coalescer
+        self.cassette = cassette
+        self.store = store
 
     async def _response_excerpt(self, resp, limit: int = 300) -> str:
         """读取响应正文摘要，用于错误日志，避免把完整远端响应写入异常。"""
@@ -39,6 +66,25 @@ class AsyncHttpClient:
             excerpt = await self._response_excerpt(resp)
             raise ValueError(f"HTTP request failed. ({resp.status} | {url} | {excerpt})")
 
+    async def _handle_response(self, resp, url: str, is_json: bool, raise_for_status: bool, cache_key: Optional[str]):
+        """在普通响应解析外处理条件请求缓存：304 返回缓存正文，带校验头的成功响应写入缓存。"""
+        if cache_key is not None and resp.status == 304:
+            if self.debug:
+                logger.debug(f"HTTP cache hit: {url}")
+
+            metrics = current_metrics.get()
+            if metrics is not None:
+                metrics.cache_hits += 1
+
+            return resp.url, 200, resp.headers, self.cache.get(cache_key)
+
+        result = await self._read_response(resp, url, is_json, raise_for_status=raise_for_status)
+
+        if cache_key is not None and 200 <= resp.status < 300:
+            self.cache.store(cache_key, resp.headers, result[3], is_json)
+
+        return result
+
     async def request(
         self,
         method: str,
@@ -52,13 +98,204 @@ class AsyncHttpClient:
     ) -> Tuple[URL, int, "CIMultiDictProxy[str]", Any | str]:
         """发送 HTTP 请求并返回最终 URL、状态码、响应头和响应内容。
 
-        当传入外部 session 时复用调用方的连接池；否则为单次请求创建短生命周期 session。
+        当传入外部 session 时复用调用方的连接池；否则为单次请求创建短生命周期 session。配置了条件请求缓存时，GET 请求会自动
+        附带 If-None-Match/If-Modified-Since，收到 304 后返回缓存正文，对解析器透明。配置了调度器时，请求会先占用目标主机和全局
+        并发槽位。配置了请求合并器时，本轮运行内相同的 GET 请求只发出一次。配置了录制存储时，录制模式保存每个真实响应，回放
+        模式直接返回录制的响应而不访问网络。配置了响应存储时，新鲜期内的 GET 响应直接从磁盘返回，成功的 GET 响应写入存储。
         """
         hdr = {"User-Agent": DEFAULT_USERAGENT}
 
         if headers:
             hdr.update(headers)
 
+        if self.coalescer is not None and method.upper() == "GET":
+            key = make_request_key(method, url, params, hdr, is_json, raise_for_status)
+            issued = False
+
+            async def fetch():
+                nonlocal issued
+                issued = True
+                return await self._request(method, url, params, data, hdr, timeout, is_json, raise_for_status)
+
+            # 只复用成功响应；限流或服务端错误（raise_for_status=False 时原样返回）需要调用方的重试循环重新请求。
+            result = await self.coalescer.run(key, fetch, reusable=lambda x: 200 <= x[1] < 300)
+
+            # 复用了其他条目的请求结果，计为当前条目的一次缓存命中。
+            metrics = current_metrics.get()
+            if not issued and metrics is not None:
+                metrics.cache_hits += 1
+
+            return result
+
+        return await self._request(method, url, params, data, hdr, timeout, is_json, raise_for_status)
+
+    async def iter_json_array(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Any]:
+        """以 GET 请求读取顶层为数组的 JSON 响应，边下载边解码，逐个返回数组元素；指定 `fields` 时对象元素只保留这些键。
+
+        不构造完整的响应对象，内存占用与单个元素相当，首个元素在下载完成前即可使用。请求同样占用调度器槽位、计入当前条目的
+        网络统计，并使用条件请求缓存（缓存原始正文）；流式请求不参与请求合并。配置了录制存储或响应存储时需要完整正文，退回
+        普通请求后再逐个返回元素。
+        """
+        if self.cassette is not None or self.store is not None:
+            _, _, _, data = await self.request("GET", url, params, headers=headers, timeout=timeout, is_json=True)
+            decoder = JsonArrayDecoder(fields)
+
+            if not isinstance(data, list):
+                raise ValueError(f"Invalid JSON response. (Expected an array | {url})")
+
+            for item in data:
+                yield decoder.project(item)
+
+            return
+
+        hdr = {"User-Agent": DEFAULT_USERAGENT}
+
+        if headers:
+            hdr.update(headers)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(STREAM_CACHE_METHOD, url, params, hdr)
+            hdr.update(self.cache.conditional_headers(cache_key))
+
+        if self.debug:
+            logger.debug(f"URL: {url}, PARAMS: {params}, TIMEOUT: {timeout}, JSON STREAM: {fields or 'all'}")
+
+        request_kwargs = {
+            "method": "GET",
+            "url": url,
+            "params": params,
+            "allow_redirects": True,
+            "headers": hdr,
+            "proxy": os.environ.get("PROXY"),
+            "timeout": timeout,
+        }
+
+        async with AsyncExitStack() as stack:
+            feedback = await stack.enter_async_context(self.scheduler.slot(url)) if self.scheduler is not None else RequestFeedback()
+            session = self.session
+
+            if session is None:
+                session = await stack.enter_async_context(aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)))
+
+            with timed("network_seconds"):
+                resp = await stack.enter_async_context(session.request(**request_kwargs))
+
+            feedback.status = resp.status
+            metrics = current_metrics.get()
+            if metrics is not None:
+                metrics.requests += 1
+
+            decoder = JsonArrayDecoder(fields)
+
+            if cache_key is not None and resp.status == 304:
+                if self.debug:
+                    logger.debug(f"HTTP cache hit: {url}")
+
+                if metrics is not None:
+                    metrics.cache_hits += 1
+
+                for chunk in (self.cache.get(cache_key).encode("utf-8"), None):
+                    for item in self._decode_chunk(decoder, resp, url, chunk):
+                        yield item
+
+                return
+
+            if not 200 <= resp.status < 300:
+                excerpt = await self._response_excerpt(resp)
+                raise ValueError(f"HTTP request failed. ({resp.status} | {url} | {excerpt})")
+
+            # 只有带校验头的响应才能写入条件请求缓存，其余响应不保留原始正文。
+            keep_body = cache_key is not None and ("ETag" in resp.headers or "Last-Modified" in resp.headers)
+            body = bytearray()
+            chunks = resp.content.iter_chunked(STREAM_CHUNK_SIZE)
+
+            while True:
+                with timed("network_seconds"):
+                    chunk = await anext(chunks, None)
+
+                if chunk is None:
+                    break
+
+                if metrics is not None:
+                    metrics.bytes_downloaded += len(chunk)
+
+                if keep_body:
+                    body += chunk
+
+                for item in self._decode_chunk(decoder, resp, url, chunk):
+                    yield item
+
+            for item in self._decode_chunk(decoder, resp, url, None):
+                yield item
+
+            if cache_key is not None:
+                self.cache.store(cache_key, resp.headers, body.decode("utf-8"), False)
+
+    @staticmethod
+    def _decode_chunk(decoder: JsonArrayDecoder, resp, url: str, chunk: Optional[bytes]):
+        """送入一个分块（None 表示正文结束），把解码错误转换为带上下文的异常。"""
+        try:
+            return decoder.feed(chunk) if chunk is not None else decoder.close()
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON response. ({resp.status} | {url} | {e})") from e
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, str]],
+        data: Optional[dict],
+        hdr: Dict[str, str],
+        timeout: float,
+        is_json: bool,
+        raise_for_status: bool,
+    ) -> Tuple[URL, int, "CIMultiDictProxy[str]", Any | str]:
+        store_key = None
+        if self.store is not None and method.upper() == "GET":
+            store_key = ValidatorCache.make_key(method, url, params, hdr)
+            stored = self.store.get(store_key, is_json)
+
+            if stored is not None:
+                if self.debug:
+                    logger.debug(f"HTTP response store hit: {url}")
+
+                metrics = current_metrics.get()
+                if metrics is not None:
+                    metrics.cache_hits += 1
+
+                return stored
+
+        result = await self._request_network(method, url, params, data, hdr, timeout, is_json, raise_for_status)
+
+        if store_key is not None and 200 <= result[1] < 300:
+            self.store.put(store_key, url, result[0], result[1], result[2], result[3], is_json)
+
+        return result
+
+    async def _request_network(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, str]],
+        data: Optional[dict],
+        hdr: Dict[str, str],
+        timeout: float,
+        is_json: bool,
+        raise_for_status: bool,
+    ) -> Tuple[URL, int, "CIMultiDictProxy[str]", Any | str]:
+        cache_key = None
+        if self.cache is not None and method.upper() == "GET":
+            cache_key = self.cache.make_key(method, url, params, hdr)
+            hdr.update(self.cache.conditional_headers(cache_key))
+
         if self.debug:
             logger.debug(f"URL: {url}, PARAMS: {params}, TIMEOUT: {timeout}, JSON RESULT: {is_json}")
 
@@ -73,10 +310,55 @@ class AsyncHttpClient:
             "timeout": timeout,
         }
 
+        if self.scheduler is None:
+            return await self._send(request_kwargs, url, is_json, raise_for_status, cache_key, RequestFeedback())
+
+        async with self.scheduler.slot(url) as feedback:
+            return await self._send(request_kwargs, url, is_json, raise_for_status, cache_key, feedback)
+
+    async def _send(
+        self, request_kwargs: dict, url: str, is_json: bool, raise_for_status: bool, cache_key: Optional[str], feedback: RequestFeedback
+    ):
+        """实际发送请求；收到响应后立即回填状态码，供调度器调整单主机并发。耗时（含读取正文）计入当前条目的网络时间。"""
+        with timed("network_seconds"):
+            return await self._send_timed(request_kwargs, url, is_json, raise_for_status, cache_key, feedback)
+
+    async def _send_timed(
+        self, request_kwargs: dict, url: str, is_json: bool, raise_for_status: bool, cache_key: Optional[str], feedback: RequestFeedback
+    ):
+        if self.cassette is not None and self.cassette.replaying:
+            resp = await self.cassette.replay(request_kwargs)
+            return await self._receive(resp, request_kwargs, url, is_json, raise_for_status, cache_key, feedback, time.monotonic())
+
+        started = time.monotonic()
+
         if self.session is not None:
             async with self.session.request(**request_kwargs) as resp:
-                return await self._read_response(resp, url, is_json, raise_for_status=raise_for_status)
+                return await self._receive(resp, request_kwargs, url, is_json, raise_for_status, cache_key, feedback, started)
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=request_kwargs["timeout"])) as session:
             async with session.request(**request_kwargs) as resp:
-                return await self._read_response(resp, url, is_json, raise_for_status=raise_for_status)
+                return await self._receive(resp, request_kwargs, url, is_json, raise_for_status, cache_key, feedback, started)
+
+    async def _receive(
+        self,
+        resp,
+        request_kwargs: dict,
+        url: str,
+        is_json: bool,
+        raise_for_status: bool,
+        cache_key: Optional[str],
+        feedback: RequestFeedback,
+        started: float,
+    ):
+        feedback.status = resp.status
+
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.requests += 1
+            metrics.bytes_downloaded += len(await resp.read())
+
+        if self.cassette is not None and self.cassette.recording:
+            await self.cassette.record(request_kwargs, resp, started)
+
+        return await self._handle_response(resp, url, is_json, raise_for_status, cache_key)
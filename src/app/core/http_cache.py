@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.core.utils import get_env_int, safe_strtobool
+
+VALIDATOR_INDEX_FILE = "index.json"
+
+
+class ValidatorCacheEntry(BaseModel):
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    is_json: bool = False
+    size: int = 0
+    accessed: float = 0
+
+
+class ValidatorCacheIndex(BaseModel):
+    entries: Dict[str, ValidatorCacheEntry] = Field(default_factory=dict)
+
+
+class ValidatorCache:
+    """基于 ETag/Last-Modified 的条件请求缓存，命中 304 时返回上次保存的响应正文。
+
+    索引和正文都保存在磁盘上，按请求方法、URL、查询参数和认证范围区分；总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index = ValidatorCacheIndex()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024) -> "ValidatorCache":
+        """读取磁盘索引；索引损坏时丢弃旧缓存，不影响本轮检测。"""
+        cache = cls(cache_dir, max_bytes=max_bytes)
+        index_file = cache_dir.joinpath(VALIDATOR_INDEX_FILE)
+
+        if index_file.is_file():
+            try:
+                cache.index = ValidatorCacheIndex.model_validate_json(index_file.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"HTTP validator cache index is invalid and will be rebuilt: {type(e).__name__}: {e}")
+
+        return cache
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None) -> str:
+        """生成请求缓存键；认证头只保留摘要，区分不同 Token 的可见范围但不落盘明文。"""
+        auth = ""
+        if headers:
+            for k, v in headers.items():
+                if k.lower() == "authorization":
+                    auth = hashlib.sha256(str(v).encode("utf-8")).hexdigest()[:16]
+
+        query = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([method.upper(), url, query, auth], ensure_ascii=True, separators=(",", ":"))
+
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _body_file(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}.body")
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """返回需要附加的条件请求头；正文文件缺失时不发送，避免收到无法还原的 304。"""
+        entry = self.index.entries.get(key)
+        if entry is None or not self._body_file(key).is_file():
+            return {}
+
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def get(self, key: str) -> Any:
+        """读取 304 对应的缓存正文，并刷新最近访问时间。"""
+        entry = self.index.entries[key]
+        body = self._body_file(key).read_text(encoding="utf-8")
+
+        entry.accessed = time.time()
+        self.hits += 1
+        self._dirty = True
+
+        return json.loads(body) if entry.is_json else body
+
+    def store(self, key: str, headers: Mapping[str, str], data: Any, is_json: bool):
+        """保存带校验头的成功响应；没有 ETag/Last-Modified 的响应无法复用，只计为未命中。"""
+        self.misses += 1
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+
+        if not etag and not last_modified:
+            self.drop(key)
+            return
+
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")) if is_json else data
+        encoded = body.encode("utf-8")
+
+        if len(encoded) > self.max_bytes:
+            self.drop(key)
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._body_file(key).write_bytes(encoded)
+
+        self.index.entries[key] = ValidatorCacheEntry(
+            etag=etag, last_modified=last_modified, is_json=is_json, size=len(encoded), accessed=time.time()
+        )
+        self._dirty = True
+
+    def drop(self, key: str):
+        if self.index.entries.pop(key, None) is not None:
+            self._body_file(key).unlink(missing_ok=True)
+            self._dirty = True
+
+    def evict(self):
+        """按最近访问时间淘汰条目，直到总大小回到上限以内。"""
+        total = sum(v.size for v in self.index.entries.values())
+
+        for key, entry in sorted(self.index.entries.items(), key=lambda x: x[1].accessed):
+            if total <= self.max_bytes:
+                break
+
+            total -= entry.size
+            self.drop(key)
+            self.evictions += 1
+
+    def save(self):
+        """淘汰超限条目后写回索引；本轮没有变化时不写磁盘。"""
+        if not self._dirty:
+            return
+
+        self.evict()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.joinpath(VALIDATOR_INDEX_FILE).write_text(self.index.model_dump_json(), encoding="utf-8")
+        self._dirty = False
+
+    @property
+    def stats(self) -> str:
+        return f"hits: {self.hits}, misses: {self.misses}, evictions: {self.evictions}, entries: {len(self.index.entries)}"
+
+
+def create_validator_cache(cache_dir: Path) -> Optional[ValidatorCache]:
+    """按环境变量创建条件请求缓存；关闭时返回 None。"""
+    if not safe_strtobool(os.environ.get("VERSION_CHECKER_HTTP_CACHE", "true"), default=True):
+        return None
+
+    max_bytes = get_env_int("VERSION_CHECKER_HTTP_CACHE_MAX_MB", 64) * 1024 * 1024
+
+    return ValidatorCache.load(cache_dir.joinpath("http"), max_bytes=max_bytes)
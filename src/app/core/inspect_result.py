@@ -2,6 +2,8 @@ from enum import StrEnum
 
 from pydantic import BaseModel
 
+from app.core.metrics import ItemMetrics
+
 
 class InspectStatus(StrEnum):
     SUCCESS = "success"
@@ -14,6 +16,8 @@ class InspectItemResult(BaseModel):
     status: InspectStatus
     error_type: str | None = None
     message: str | None = None
+    parser: str | None = None
+    metrics: ItemMetrics | None = None
 
     @classmethod
     def success(cls, name: str):
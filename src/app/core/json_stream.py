@@ -0,0 +1,105 @@
+import codecs
+import json
+import re
+from typing import Any, List, Optional, Sequence
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_START = 0
+_FIRST = 1
+_VALUE = 2
+_SEPARATOR = 3
+_DONE = 4
+
+
+class JsonArrayDecoder:
+    """顶层 JSON 数组的增量解码器：按到达顺序送入响应正文的分块，返回其中已经完整的数组元素。
+
+    元素本身仍交给标准库的 C 解码器解析，解码器只负责在分块之间定位元素边界；未完整的元素留在缓冲区，等待后续分块，
+    同一元素的重试按缓冲区长度翻倍，避免大元素被反复解析。指定 `fields` 时对象元素只保留这些键，其余内容解析后立即丢弃。
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields) if fields else None
+        self.count = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._retry_length = 0
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buffer += self._text.decode(data)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """处理剩余内容；正文在数组结束前中断或数组后还有其他内容时抛出 ValueError。"""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain(final=True)
+
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON array.")
+
+        return items
+
+    def project(self, value: Any) -> Any:
+        """按 `fields` 裁剪对象元素；其他类型的元素原样返回。"""
+        if self.fields is None or not isinstance(value, dict):
+            return value
+
+        return {k: value[k] for k in self.fields if k in value}
+
+    def _drain(self, final: bool) -> List[Any]:
+        buf, pos, items = self._buffer, 0, []
+
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+
+            ch = buf[pos]
+
+            if self._state == _START:
+                if ch != "[":
+                    raise ValueError(f"Expected a JSON array, got {ch!r}.")
+
+                pos += 1
+                self._state = _FIRST
+            elif self._state in (_FIRST, _SEPARATOR) and ch == "]":
+                pos += 1
+                self._state = _DONE
+            elif self._state == _SEPARATOR:
+                if ch != ",":
+                    raise ValueError(f"Expected ',' or ']' between JSON array elements, got {ch!r}.")
+
+                pos += 1
+                self._state = _VALUE
+            elif self._state == _DONE:
+                raise ValueError("Extra data after the JSON array.")
+            else:
+                pending = len(buf) - pos
+                if not final and pending < self._retry_length:
+                    break
+
+                try:
+                    value, end = self._decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+
+                    self._retry_length = pending * 2
+                    break
+
+                # 位于缓冲区末尾的数字可能被分块截断，等下一个分块确认。
+                if end == len(buf) and not final and (ch == "-" or ch.isdigit()):
+                    break
+
+                items.append(self.project(value))
+                pos = end
+                self._state = _SEPARATOR
+                self._retry_length = 0
+
+        self._buffer = buf[pos:]
+        self.count += len(items)
+
+        return items
@@ -0,0 +1,68 @@
+import time
+from asyncio import Semaphore
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from pydantic import BaseModel
+
+
+class ItemMetrics(BaseModel):
+    """单个软件条目的耗时和网络统计；时间均为秒。"""
+
+    elapsed_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+    network_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    write_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    requests: int = 0
+    bytes_downloaded: int = 0
+    cache_hits: int = 0
+    # 内容发生变化、实际重写的输出文件数；watch 据此调整条目的检测间隔。
+    files_written: int = 0
+
+    def rounded(self) -> "ItemMetrics":
+        return self.model_copy(update={k: round(v, 6) for k, v in self if isinstance(v, float)})
+
+
+# 当前条目的统计对象；每个条目在各自的任务中设置，`asyncio.gather` 派生的子任务继承同一个对象。
+current_metrics: ContextVar[Optional[ItemMetrics]] = ContextVar("current_metrics", default=None)
+
+
+@contextmanager
+def timed(field: str) -> Iterator[None]:
+    """把代码块的耗时累加到当前条目统计的 `field` 字段；不在条目上下文中时不做任何事。"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, field, getattr(metrics, field) + time.perf_counter() - started)
+
+
+class TimedSemaphore:
+    """记录排队等待时间的信号量包装，等待时间计入当前条目的 `queue_wait_seconds`。"""
+
+    def __init__(self, sem: Semaphore):
+        self._sem = sem
+
+    async def acquire(self):
+        with timed("queue_wait_seconds"):
+            await self._sem.acquire()
+
+    def release(self):
+        self._sem.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def locked(self) -> bool:
+        return self._sem.locked()
@@ -9,7 +9,6 @@ from email.mime.text import MIMEText
 from email.utils import formataddr
 from typing import List, Optional
 
-import requests
 from loguru import logger
 
 FEISHU_WEBHOOK_URL = "https://open.feishu.cn/open-apis/bot/v2/hook/1432d31b-6ec1-438d-81fc-59fd4b9354c9"
@@ -105,6 +104,9 @@ def send_feishu_updates(items: List[dict[str, str]]) -> bool:
     payload["timestamp"] = str(timestamp)
     payload["sign"] = gen_feishu_sign(timestamp, secret)
 
+    # requests 只在真正发送通知时导入，避免拖慢 combine 等命令的启动。
+    import requests
+
     try:
         response = requests.post(
             FEISHU_WEBHOOK_URL,
@@ -10,3 +10,13 @@ def get_output_dir(workdir: str | Path | None) -> Path:
     if output_path.is_absolute():
         return output_path
     return base.joinpath(output_path)
+
+
+def get_cache_dir(workdir: str | Path | None) -> Path:
+    """返回运行缓存目录；缓存只用于加速检测，不属于生成数据。"""
+    base = Path(workdir or ".")
+    cache_subdir = os.environ.get("VERSION_CHECKER_CACHE_DIR", ".cache")
+    cache_path = Path(cache_subdir)
+    if cache_path.is_absolute():
+        return cache_path
+    return base.joinpath(cache_path)
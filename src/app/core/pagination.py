@@ -0,0 +1,77 @@
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from yarl import URL
+
+_LINK_RE = re.compile(r'<([^>]*)>\s*;\s*rel="?([^";]+)"?')
+
+PageFetcher = Callable[[int], Awaitable[Tuple[Mapping[str, str], Any]]]
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """解析 RFC 8288 `Link` 响应头，返回 rel 到 URL 的映射。"""
+    links = {}
+
+    for url, rels in _LINK_RE.findall(value or ""):
+        for rel in rels.split():
+            links[rel] = url
+
+    return links
+
+
+def link_last_page(links: Mapping[str, str]) -> Optional[int]:
+    """从 `rel="last"` 链接的 page 查询参数读取总页数；没有或无法识别时返回 None。"""
+    last = links.get("last")
+    if not last:
+        return None
+
+    try:
+        return int(URL(last).query.get("page", ""))
+    except ValueError:
+        return None
+
+
+def _is_short(data: Any, page_size: int) -> bool:
+    return not isinstance(data, list) or len(data) < page_size
+
+
+async def fetch_pages(fetch: PageFetcher, max_page: int, page_size: int, is_known: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+    """按页读取列表接口，返回各页数据（按页码顺序）。
+
+    - 首页不足 `page_size` 条、`Link` 头没有 next 或已到 `max_page` 时停止；
+    - `Link` 头给出最后一页时，剩余页并发请求，实际并发由 HTTP 客户端的主机限流控制；
+    - 传入 `is_known` 时逐页读取，某页包含已知条目后停止，更早的数据由调用方从上次结果补齐；
+    - 响应没有 `Link` 头时无法判断总页数，逐页读取直到出现不足一页的数据。
+    """
+    headers, data = await fetch(1)
+    pages = [data]
+
+    if max_page <= 1 or _is_short(data, page_size) or (is_known is not None and is_known(data)):
+        return pages
+
+    link = headers.get("Link")
+    links = parse_link_header(link)
+
+    if link is not None and "next" not in links:
+        return pages
+
+    last = link_last_page(links)
+
+    if last is not None and is_known is None:
+        rest = await asyncio.gather(*(fetch(page) for page in range(2, min(last, max_page) + 1)))
+        pages.extend(data for _, data in rest)
+        return pages
+
+    for page in range(2, max_page + 1):
+        headers, data = await fetch(page)
+        pages.append(data)
+
+        if _is_short(data, page_size) or (is_known is not None and is_known(data)):
+            break
+
+        link = headers.get("Link")
+        if link is not None and "next" not in parse_link_header(link):
+            break
+
+    return pages
@@ -0,0 +1,42 @@
+import time
+import types
+from typing import Any, Coroutine
+
+
+class CpuTimer:
+    """累计协程在事件循环线程中实际执行的 CPU 时间，不包含等待网络和其他任务运行的时间。
+
+    协程每次被事件循环恢复执行时计时一次，被它 await 的子协程也在同一次恢复中执行，会一起计入；通过 `asyncio.gather`
+    另起的任务和进程池中的解析不计入。
+    """
+
+    __slots__ = ("seconds",)
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    async def run(self, coro: Coroutine) -> Any:
+        return await self._drive(coro)
+
+    @types.coroutine
+    def _drive(self, coro: Coroutine):
+        it = coro.__await__()
+        send, value = it.send, None
+
+        while True:
+            started = time.thread_time()
+            try:
+                future = send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.seconds += time.thread_time() - started
+
+            try:
+                value = yield future
+                send = it.send
+            except GeneratorExit:
+                it.close()
+                raise
+            except BaseException as e:
+                send, value = it.throw, e
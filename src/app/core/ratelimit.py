@@ -0,0 +1,218 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+
+class RateLimitBudgetExceeded(RuntimeError):
+    pass
+
+
+class RateLimitGovernor:
+    """整轮运行共享的限流令牌桶。
+
+    令牌数来自每个响应的 `x-ratelimit-remaining/reset`，扣除已发出但尚未返回的请求后才放行，额度用完之前就停止发送请求；
+    额度耗尽时只有一个共享的等待，所有仓库共用同一份重试等待预算。等待中的请求按优先级放行，数值越小越先执行（传入上次
+    检测时间，数据最旧的仓库优先）；`admit()` 按同样的优先级决定哪些仓库先占用条目槽位，额度只够一部分仓库时先检测数据最旧的。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget_seconds: int,
+        max_sleep_seconds: int,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        max_probes: int = 1,
+    ):
+        self.name = name
+        self.budget_seconds = budget_seconds
+        self.max_sleep_seconds = max_sleep_seconds
+        self.clock = clock
+        self.sleep = sleep
+        # 额度未知（尚未收到或响应缺少限流响应头）时最多同时放行的请求数。
+        self.max_probes = max(1, max_probes)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.in_flight = 0
+        self.waited = 0
+        self.granted = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._sleeper: Optional[asyncio.Task] = None
+        self._admission: List[Tuple[float, int, asyncio.Future]] = []
+        self._admitting = False
+        self._admit_scheduled = False
+
+    @property
+    def available(self) -> Optional[int]:
+        """当前可放行的令牌数；额度未知时返回 None。"""
+        if self.remaining is None:
+            return None
+
+        return self.remaining - self.in_flight
+
+    @asynccontextmanager
+    async def admit(self, sem: asyncio.Semaphore, priority: float = 0.0) -> AsyncIterator[None]:
+        """按优先级占用条目槽位 `sem`。
+
+        `sem` 本身按到达顺序放行，这里在它前面加一道按优先级排队的关口：同一时刻只有一个仓库在等待 `sem`，槽位空出时由它占用，
+        随后关口放行剩余仓库中优先级最高的一个。首次放行推迟到下一轮事件循环，同时创建的仓库全部排队之后再比较优先级。
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        heapq.heappush(self._admission, (priority, next(self._seq), waiter))
+
+        if not self._admitting and not self._admit_scheduled:
+            self._admit_scheduled = True
+            loop.call_soon(self._admit_next)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 已经轮到但调用方被取消，交出关口。
+                self._admitting = False
+                self._admit_next()
+            raise
+
+        try:
+            await sem.acquire()
+        finally:
+            self._admitting = False
+            self._admit_next()
+
+        try:
+            yield
+        finally:
+            sem.release()
+
+    def _admit_next(self):
+        self._admit_scheduled = False
+
+        if self._admitting:
+            return
+
+        while self._admission:
+            _, _, waiter = heapq.heappop(self._admission)
+
+            if not waiter.done():
+                self._admitting = True
+                waiter.set_result(None)
+                return
+
+    async def acquire(self, priority: float = 0.0):
+        """等待一个令牌；预算不足以等到额度重置时抛出 `RateLimitBudgetExceeded`。"""
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # 令牌已经分配但调用方被取消，归还令牌。
+                self.release()
+            raise
+
+    def release(self, remaining: Optional[str] = None, limit: Optional[str] = None, reset: Optional[str] = None):
+        """请求结束后归还在途计数，并用响应头刷新额度；没有响应（连接失败）时只归还计数。"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._update(remaining, limit, reset)
+        self._dispatch()
+
+    def exhausted(self, retry_after: Optional[str] = None, reset: Optional[str] = None, limit: Optional[str] = None):
+        """收到 429 后归还在途计数，并把额度置零直到 Retry-After 或 reset 时间。"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._update("0", limit, reset)
+
+        if retry_after:
+            try:
+                self.reset_at = self.clock() + max(1.0, float(retry_after))
+            except ValueError:
+                logger.warning(f"Invalid {self.name} Retry-After header. Falling back to X-RateLimit-Reset.")
+
+        self._dispatch()
+
+    def _update(self, remaining: Optional[str], limit: Optional[str], reset: Optional[str]):
+        try:
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if limit is not None:
+                self.limit = int(limit)
+            if reset is not None:
+                self.reset_at = float(reset)
+        except ValueError:
+            logger.warning(f"Invalid {self.name} rate limit header. ({remaining}/{limit}, reset: {reset})")
+
+    def _dispatch(self):
+        """按优先级放行等待者；额度未知时最多放行 `max_probes` 个请求，用它们的响应头探明额度。
+
+        额度本身已经耗尽时立即安排统一等待，不依赖在途计数归零：已放行但还没有返回（或没有发出）的令牌无法让额度回升，
+        只有令牌都在途、额度尚有剩余时才等待响应头刷新额度。
+        """
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+
+            available = self.available
+            if available is None:
+                if self.in_flight >= self.max_probes:
+                    return
+            elif available <= 0:
+                if self.remaining <= 0 or self.in_flight == 0:
+                    self._start_sleeper()
+                return
+
+            _, _, waiter = heapq.heappop(self._waiters)
+            self.in_flight += 1
+            self.granted += 1
+            waiter.set_result(None)
+
+    def _start_sleeper(self):
+        if self._sleeper is not None and not self._sleeper.done():
+            return
+
+        self._sleeper = asyncio.get_running_loop().create_task(self._wait_for_reset())
+
+    async def _wait_for_reset(self):
+        """额度耗尽时由一个任务统一等待；超过剩余预算时让所有等待者失败，而不是各自空等。"""
+        wait_seconds = max(1, int((self.reset_at or 0) - self.clock())) if self.reset_at is not None else 60
+        remaining_budget = self.budget_seconds - self.waited
+
+        if wait_seconds > remaining_budget:
+            error = RateLimitBudgetExceeded(
+                f"{self.name} rate limit retry budget exceeded. "
+                f"Requested wait: {wait_seconds}s, remaining budget: {remaining_budget}s, waiting: {len(self._waiters)}."
+            )
+            waiters, self._waiters = self._waiters, []
+            for _, _, waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+
+        sleep_seconds = min(wait_seconds, self.max_sleep_seconds)
+        logger.warning(
+            f"[{self.name}] rate limited. Waiting {sleep_seconds}s before retry. "
+            f"({self.remaining}/{self.limit}, waiting: {len(self._waiters)})"
+        )
+        await self.sleep(sleep_seconds)
+        self.waited += sleep_seconds
+
+        if self.reset_at is None or self.clock() >= self.reset_at:
+            # 额度已重置，但具体数值要等下一次响应头才能确认。
+            self.remaining = None
+            self.reset_at = None
+
+        self._sleeper = None
+        self._dispatch()
+
+    @property
+    def stats(self) -> str:
+        return f"granted: {self.granted}, waited: {self.waited}s, remaining: {self.remaining}/{self.limit}"
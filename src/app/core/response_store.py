@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import time
+from compression import zstd
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from multidict import CIMultiDict, CIMultiDictProxy
+from pydantic import BaseModel, Field
+from yarl import URL
+
+from app.core.utils import get_env_int, safe_strtobool
+
+RESPONSE_INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+
+
+class StoredResponse(BaseModel):
+    url: str
+    final_url: str
+    status: int = 200
+    headers: List[Tuple[str, str]] = Field(default_factory=list)
+    is_json: bool = False
+    digest: str
+    size: int = 0
+    stored: float = 0
+    accessed: float = 0
+
+
+class ResponseStoreIndex(BaseModel):
+    entries: Dict[str, StoredResponse] = Field(default_factory=dict)
+
+
+class ResponseStoreStats(BaseModel):
+    entries: int
+    objects: int
+    bytes: int
+    stale: int
+    oldest: Optional[float] = None
+    largest: List[StoredResponse] = Field(default_factory=list)
+
+
+class ResponseStore:
+    """持久化的 HTTP 响应存储：新鲜期内的 GET 响应直接从磁盘返回，不访问网络。
+
+    正文按内容的 sha256 命名并以 zstd 压缩保存在 `objects/` 下，不同请求得到相同内容时只保存一份；索引按请求键（与条件请求
+    缓存相同）记录最终 URL、状态码、响应头和保存时间。超过 `max_age` 的条目不再返回；总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, store_dir: Path, max_age: float = 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.store_dir = store_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.index = ResponseStoreIndex()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, store_dir: Path, max_age: float = 3600, max_bytes: int = 256 * 1024 * 1024) -> "ResponseStore":
+        """读取磁盘索引；索引损坏时丢弃旧记录，正文文件在下次清理时删除。"""
+        store = cls(store_dir, max_age=max_age, max_bytes=max_bytes)
+        index_file = store_dir.joinpath(RESPONSE_INDEX_FILE)
+
+        if index_file.is_file():
+            try:
+                store.index = ResponseStoreIndex.model_validate_json(index_file.read_bytes())
+            except Exception as e:
+                logger.warning(f"HTTP response store index is invalid and will be rebuilt: {type(e).__name__}: {e}")
+
+        return store
+
+    def _object_file(self, digest: str) -> Path:
+        return self.store_dir.joinpath(OBJECTS_DIR, digest[:2], f"{digest}.zst")
+
+    def is_fresh(self, entry: StoredResponse, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) - entry.stored < self.max_age
+
+    def get(self, key: str, is_json: bool) -> Optional[Tuple[URL, int, "CIMultiDictProxy[str]", Any]]:
+        """返回新鲜期内的响应（最终 URL、状态码、响应头、正文），过期或不存在时返回 None。"""
+        entry = self.index.entries.get(key)
+
+        if entry is None or entry.is_json != is_json or not self.is_fresh(entry):
+            self.misses += 1
+            return None
+
+        try:
+            body = zstd.decompress(self._object_file(entry.digest).read_bytes()).decode("utf-8")
+        except Exception as e:
+            logger.warning(f"HTTP response store object is unreadable and was dropped: {entry.url} | {type(e).__name__}: {e}")
+            self.drop(key)
+            self.misses += 1
+            return None
+
+        entry.accessed = time.time()
+        self.hits += 1
+        self._dirty = True
+
+        headers = CIMultiDictProxy(CIMultiDict(entry.headers))
+        return URL(entry.final_url), entry.status, headers, json.loads(body) if entry.is_json else body
+
+    def put(self, key: str, url: str, final_url: Any, status: int, headers: Any, data: Any, is_json: bool):
+        """保存成功响应；内容相同的正文不重复写入，超过总大小上限的单个响应不保存。"""
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")) if is_json else data
+        encoded = body.encode("utf-8")
+        digest = hashlib.sha256(encoded).hexdigest()
+        object_file = self._object_file(digest)
+
+        if not object_file.is_file():
+            compressed = zstd.compress(encoded)
+
+            if len(compressed) > self.max_bytes:
+                self.drop(key)
+                return
+
+            object_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = object_file.with_name(f".{object_file.name}.tmp")
+            tmp_file.write_bytes(compressed)
+            os.replace(tmp_file, object_file)
+
+        previous = self.index.entries.get(key)
+        now = time.time()
+
+        self.index.entries[key] = StoredResponse(
+            url=url,
+            final_url=str(final_url),
+            status=status,
+            headers=[(str(k), str(v)) for k, v in (headers or {}).items()],
+            is_json=is_json,
+            digest=digest,
+            size=object_file.stat().st_size,
+            stored=now,
+            accessed=now,
+        )
+        self._dirty = True
+
+        if previous is not None and previous.digest != digest:
+            self._release(previous.digest)
+
+    def _release(self, digest: str):
+        """没有条目再引用时删除正文文件。"""
+        if not any(x.digest == digest for x in self.index.entries.values()):
+            self._object_file(digest).unlink(missing_ok=True)
+
+    def drop(self, key: str):
+        entry = self.index.entries.pop(key, None)
+
+        if entry is not None:
+            self._release(entry.digest)
+            self._dirty = True
+
+    def total_bytes(self) -> int:
+        """按正文文件统计的总大小，多个条目共享的正文只计一次。"""
+        return sum({x.digest: x.size for x in self.index.entries.values()}.values())
+
+    def evict(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """删除保存时间超过 `max_age` 的条目，再按最近访问时间淘汰，直到总大小回到上限以内；返回删除的条目数。"""
+        max_age = self.max_age if max_age is None else max_age
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        now = time.time()
+        evicted = 0
+
+        for key, entry in list(self.index.entries.items()):
+            if now - entry.stored >= max_age:
+                self.drop(key)
+                evicted += 1
+
+        sizes = {x.digest: x.size for x in self.index.entries.values()}
+        total = sum(sizes.values())
+
+        for key, entry in sorted(self.index.entries.items(), key=lambda x: x[1].accessed):
+            if total <= max_bytes:
+                break
+
+            self.drop(key)
+            evicted += 1
+
+            if entry.digest in sizes and not any(x.digest == entry.digest for x in self.index.entries.values()):
+                total -= sizes.pop(entry.digest)
+
+        self.evictions += evicted
+
+        return evicted
+
+    def prune(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """淘汰条目并删除索引不再引用的正文文件（例如索引损坏或写入中断留下的文件），返回（删除的条目数，删除的文件数）。"""
+        evicted = self.evict(max_age, max_bytes)
+        referenced = {x.digest for x in self.index.entries.values()}
+        removed = 0
+
+        for file in self.store_dir.joinpath(OBJECTS_DIR).glob("*/*"):
+            if file.name.removesuffix(".zst") not in referenced:
+                file.unlink(missing_ok=True)
+                removed += 1
+
+        self._dirty = True
+        self.save()
+
+        return evicted, removed
+
+    def save(self):
+        """淘汰超限条目后写回索引；本轮没有变化时不写磁盘。"""
+        if not self._dirty:
+            return
+
+        self.evict()
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        index_file = self.store_dir.joinpath(RESPONSE_INDEX_FILE)
+        tmp_file = index_file.with_name(f".{index_file.name}.tmp")
+        tmp_file.write_text(self.index.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_file, index_file)
+
+        self._dirty = False
+
+    def describe(self, top: int = 10) -> ResponseStoreStats:
+        entries = list(self.index.entries.values())
+        now = time.time()
+
+        return ResponseStoreStats(
+            entries=len(entries),
+            objects=len({x.digest for x in entries}),
+            bytes=self.total_bytes(),
+            stale=sum(not self.is_fresh(x, now) for x in entries),
+            oldest=min((x.stored for x in entries), default=None),
+            largest=sorted(entries, key=lambda x: (-x.size, x.url))[:top],
+        )
+
+    @property
+    def stats(self) -> str:
+        return f"hits: {self.hits}, misses: {self.misses}, evictions: {self.evictions}, entries: {len(self.index.entries)}"
+
+
+def get_response_store_dir(cache_dir: Path) -> Path:
+    return cache_dir.joinpath("responses")
+
+
+def load_response_store(cache_dir: Path) -> ResponseStore:
+    """按环境变量中的新鲜期和大小上限读取响应存储，不检查是否启用；供 `cache` 命令查看和清理。"""
+    max_age = get_env_int("VERSION_CHECKER_RESPONSE_STORE_MAX_AGE_MINUTES", 60) * 60
+    max_bytes = get_env_int("VERSION_CHECKER_RESPONSE_STORE_MAX_MB", 256) * 1024 * 1024
+
+    return ResponseStore.load(get_response_store_dir(cache_dir), max_age=max_age, max_bytes=max_bytes)
+
+
+def create_response_store(cache_dir: Path) -> Optional[ResponseStore]:
+    """按环境变量创建响应存储；默认关闭，关闭时返回 None。"""
+    if not safe_strtobool(os.environ.get("VERSION_CHECKER_RESPONSE_STORE", "false"), default=False):
+        return None
+
+    return load_response_store(cache_dir)
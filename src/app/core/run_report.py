@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.inspect_result import InspectResult, InspectStatus
+from app.core.metrics import ItemMetrics
+
+DEFAULT_REPORT_TOP = 20
+
+
+class ParserAggregate(BaseModel):
+    items: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+    network_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    write_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    requests: int = 0
+    bytes_downloaded: int = 0
+    cache_hits: int = 0
+    files_written: int = 0
+
+
+class SlowItem(BaseModel):
+    name: str
+    parser: Optional[str] = None
+    status: str
+    metrics: ItemMetrics
+
+
+class RunReport(BaseModel):
+    elapsed_seconds: float
+    items: Dict[str, int]
+    totals: ParserAggregate
+    parsers: Dict[str, ParserAggregate] = Field(default_factory=dict)
+    slowest: List[SlowItem] = Field(default_factory=list)
+
+
+def build_run_report(result: InspectResult, elapsed_seconds: float, top: int = DEFAULT_REPORT_TOP) -> RunReport:
+    """汇总本轮检测：按状态计数、按解析器聚合各项耗时，并列出耗时最长的前 `top` 个条目。"""
+    totals = ParserAggregate()
+    parsers: Dict[str, ParserAggregate] = {}
+    statuses: Dict[str, int] = {}
+    measured = []
+
+    for item in result.items:
+        statuses[item.status.value] = statuses.get(item.status.value, 0) + 1
+
+        if item.metrics is None:
+            continue
+
+        measured.append(item)
+        aggregate = parsers.setdefault(item.parser or "<unknown>", ParserAggregate())
+
+        for target in (totals, aggregate):
+            target.items += 1
+            target.failed += int(item.status == InspectStatus.FAILED)
+            for field, value in item.metrics:
+                setattr(target, field, getattr(target, field) + value)
+
+    measured.sort(key=lambda x: x.metrics.elapsed_seconds, reverse=True)
+
+    return RunReport(
+        elapsed_seconds=round(elapsed_seconds, 3),
+        items=statuses,
+        totals=_round(totals),
+        parsers={k: _round(v) for k, v in sorted(parsers.items(), key=lambda x: x[1].elapsed_seconds, reverse=True)},
+        slowest=[SlowItem(name=x.name, parser=x.parser, status=x.status.value, metrics=x.metrics) for x in measured[:top]],
+    )
+
+
+def _round(aggregate: ParserAggregate) -> ParserAggregate:
+    return aggregate.model_copy(update={k: round(v, 3) for k, v in aggregate if isinstance(v, float)})
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_prometheus(report: RunReport) -> str:
+    """输出 Prometheus textfile collector 格式的指标。"""
+    lines = [
+        "# HELP version_checker_inspect_duration_seconds Wall time of the last inspect run.",
+        "# TYPE version_checker_inspect_duration_seconds gauge",
+        f"version_checker_inspect_duration_seconds {report.elapsed_seconds}",
+        "# HELP version_checker_inspect_items Number of items by status in the last inspect run.",
+        "# TYPE version_checker_inspect_items gauge",
+    ]
+    lines.extend(f'version_checker_inspect_items{{status="{_label(k)}"}} {v}' for k, v in sorted(report.items.items()))
+
+    for field in ParserAggregate.model_fields:
+        name = f"version_checker_parser_{field}"
+
+        lines.append(f"# HELP {name} Per-parser {field.replace('_', ' ')} in the last inspect run.")
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(f'{name}{{parser="{_label(p)}"}} {getattr(v, field)}' for p, v in report.parsers.items())
+
+    lines.append("# HELP version_checker_item_elapsed_seconds Elapsed time of the slowest items in the last inspect run.")
+    lines.append("# TYPE version_checker_item_elapsed_seconds gauge")
+    lines.extend(
+        f'version_checker_item_elapsed_seconds{{name="{_label(x.name)}",parser="{_label(x.parser or "")}"}} {x.metrics.elapsed_seconds}'
+        for x in report.slowest
+    )
+
+    return "\n".join(lines) + "\n"
+
+
+def write_run_report(report: RunReport, report_dir: Path):
+    """写出 `inspect-report.json` 和 `inspect-report.prom`；先写临时文件再替换，采集端不会读到半个文件。"""
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    for file_name, content in (
+        ("inspect-report.json", report.model_dump_json(indent=1)),
+        ("inspect-report.prom", format_prometheus(report)),
+    ):
+        file = report_dir.joinpath(file_name)
+        tmp_file = file.with_name(f".{file.name}.tmp")
+
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        os.replace(tmp_file, file)
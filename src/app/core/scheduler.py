@@ -0,0 +1,151 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from loguru import logger
+from yarl import URL
+
+from app.core.utils import get_env_int
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_HOST_INITIAL = 2
+DEFAULT_HOST_MAX = 8
+SLOW_RESPONSE_SECONDS = 5.0
+
+
+class RequestFeedback:
+    """单次请求的调度反馈；拿到响应状态后由 HTTP 客户端填写。"""
+
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status: Optional[int] = None
+
+
+class HostLimiter:
+    """单个主机的 AIMD 并发限制。
+
+    连续 `limit` 次快速成功后上限加一；收到 429/5xx 或连接失败时上限减半。同一窗口内的并发失败只降一次，避免突发错误把上限直接压到 1。
+    """
+
+    def __init__(self, host: str, initial: int = DEFAULT_HOST_INITIAL, maximum: int = DEFAULT_HOST_MAX, minimum: int = 1):
+        self.host = host
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = min(max(initial, minimum), self.maximum)
+        self.active = 0
+        self.successes = 0
+        self.epoch = 0
+        self.increases = 0
+        self.decreases = 0
+        self._waiters: List[asyncio.Future] = []
+
+    async def acquire(self) -> int:
+        """等待可用槽位，返回占用槽位时的窗口编号。"""
+        while self.active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        self.active += 1
+        return self.epoch
+
+    def release(self, epoch: int, status: Optional[int], elapsed: float):
+        """归还槽位并根据响应调整上限；同步执行，任务取消时也不会泄漏槽位。"""
+        if status is None or status == 429 or status >= 500:
+            if epoch == self.epoch:
+                self._decrease(status)
+        elif elapsed < SLOW_RESPONSE_SECONDS:
+            self._increase()
+
+        self.discard()
+
+    def discard(self):
+        """只归还槽位，不参与上限调整；用于任务被取消的场景。"""
+        self.active -= 1
+
+        # 唤醒全部等待者重新检查上限，上限提升时可以一次放行多个请求。
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _increase(self):
+        self.successes += 1
+
+        if self.successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self.successes = 0
+            self.increases += 1
+
+    def _decrease(self, status: Optional[int]):
+        previous = self.limit
+        self.limit = max(self.minimum, self.limit // 2)
+        self.successes = 0
+        self.epoch += 1
+        self.decreases += 1
+
+        logger.debug(f"Host concurrency decreased. ({self.host} | status: {status} | {previous} -> {self.limit})")
+
+
+class RequestScheduler:
+    """按主机分配请求并发，并用全局上限约束同时在途的连接数。
+
+    不同主机互不等待；同一主机的并发按响应情况自适应调整。
+    """
+
+    def __init__(
+        self, max_connections: int = DEFAULT_MAX_CONNECTIONS, host_initial: int = DEFAULT_HOST_INITIAL, host_max: int = DEFAULT_HOST_MAX
+    ):
+        self.max_connections = max_connections
+        self.host_initial = host_initial
+        self.host_max = host_max
+        self.hosts: Dict[str, HostLimiter] = {}
+        self._global = asyncio.Semaphore(max_connections)
+
+    def limiter(self, url: str) -> HostLimiter:
+        host = URL(url).host or ""
+
+        if host not in self.hosts:
+            self.hosts[host] = HostLimiter(host, initial=self.host_initial, maximum=self.host_max)
+
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[RequestFeedback]:
+        """占用目标主机和全局各一个槽位；未填写状态就退出视为连接失败。"""
+        limiter = self.limiter(url)
+        epoch = await limiter.acquire()
+        feedback = RequestFeedback()
+        started = time.monotonic()
+
+        try:
+            async with self._global:
+                started = time.monotonic()
+                yield feedback
+        except asyncio.CancelledError:
+            limiter.discard()
+            raise
+        except BaseException:
+            limiter.release(epoch, feedback.status, time.monotonic() - started)
+            raise
+
+        limiter.release(epoch, feedback.status, time.monotonic() - started)
+
+    @property
+    def stats(self) -> str:
+        items = [f"{v.host}: {v.limit} (+{v.increases}/-{v.decreases})" for v in sorted(self.hosts.values(), key=lambda x: x.host)]
+        return ", ".join(items) or "no request"
+
+
+def create_request_scheduler(max_connections: int) -> RequestScheduler:
+    """按命令行全局上限和环境变量中的单主机配置创建调度器。"""
+    host_max = get_env_int("VERSION_CHECKER_HOST_MAX_CONNECTIONS", DEFAULT_HOST_MAX)
+    host_initial = min(get_env_int("VERSION_CHECKER_HOST_INITIAL_CONNECTIONS", DEFAULT_HOST_INITIAL), host_max)
+
+    return RequestScheduler(max_connections=max_connections, host_initial=host_initial, host_max=min(host_max, max_connections))
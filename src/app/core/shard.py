@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import re
+import statistics
+from compression import zstd
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.core.check_index import CheckIndex, CheckIndexEntry
+from app.core.inspect_result import InspectItemResult, InspectResult, InspectStatus
+
+SHARD_COSTS_FILE = "shard-costs.index"
+# 历史耗时的指数平滑系数：新一轮的耗时占 30%，单次网络抖动不会让条目在分片之间来回移动。
+COST_SMOOTHING = 0.3
+DEFAULT_ITEM_COST = 1.0
+BUNDLE_FILE_PATTERN = re.compile(r"^shard-(\d+)-of-(\d+)\.json\.zst$")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """解析 `i/n` 形式的分片参数，返回（分片序号，分片总数）；序号从 1 开始。"""
+    index, _, count = value.partition("/")
+
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard: {value}. Expected the form i/n, e.g. 1/4.") from None
+
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"Invalid shard: {value}. The index must be between 1 and the shard count.")
+
+    return i, n
+
+
+def stable_hash(name: str) -> int:
+    """与进程无关的名称哈希；内置 `hash()` 对字符串加盐，不同机器上结果不同。"""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ShardCostsData(BaseModel):
+    costs: Dict[str, float] = Field(default_factory=dict)
+    requests: Dict[str, float] = Field(default_factory=dict)
+
+
+class ShardCosts:
+    """条目的历史耗时和请求数，用于分片时平衡各分片的工作量，以及 `--budget` 估算条目消耗的请求数。
+
+    保存在输出目录的 `shard-costs.index` 中并随数据一起提交，所有分片读取同一份历史，得到相同的划分。耗时取条目运行时间
+    减去排队等待时间，与请求数一样按指数平滑更新；跳过的条目和没有统计数据的结果不参与更新。文件名不以 `.json` 结尾，
+    不会被 combine 合并。
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.data = ShardCostsData()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, output_dir: Path) -> "ShardCosts":
+        costs = cls(output_dir)
+        costs_file = output_dir.joinpath(SHARD_COSTS_FILE)
+
+        if costs_file.is_file():
+            try:
+                costs.data = ShardCostsData.model_validate_json(costs_file.read_bytes())
+            except Exception as e:
+                logger.warning(f"Shard costs are invalid and will be rebuilt: {type(e).__name__}: {e}")
+
+        return costs
+
+    @property
+    def costs(self) -> Dict[str, float]:
+        return self.data.costs
+
+    @property
+    def requests(self) -> Dict[str, float]:
+        return self.data.requests
+
+    def update(self, result: InspectResult) -> int:
+        """按本轮检测结果更新历史耗时和请求数，返回更新的条目数。"""
+        updated = 0
+
+        for item in result.items:
+            if item.status == InspectStatus.SKIPPED or item.metrics is None:
+                continue
+
+            cost = max(item.metrics.elapsed_seconds - item.metrics.queue_wait_seconds, 0.001)
+            self.data.costs[item.name] = _smooth(self.data.costs.get(item.name), cost)
+            self.data.requests[item.name] = _smooth(self.data.requests.get(item.name), float(item.metrics.requests))
+            updated += 1
+
+        self._dirty = self._dirty or updated > 0
+
+        return updated
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.data.costs = dict(sorted(self.data.costs.items()))
+        self.data.requests = dict(sorted(self.data.requests.items()))
+
+        with open(self.output_dir.joinpath(SHARD_COSTS_FILE), "w", encoding="utf-8") as f:
+            f.write(self.data.model_dump_json(indent=1))
+
+        self._dirty = False
+
+
+def _smooth(previous: Optional[float], value: float) -> float:
+    if previous is not None:
+        value = previous * (1 - COST_SMOOTHING) + value * COST_SMOOTHING
+
+    return round(value, 3)
+
+
+class ShardPlan(BaseModel):
+    count: int
+    shards: List[List[str]]
+    loads: List[float]
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self.shards, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+    def names(self, index: int) -> List[str]:
+        return self.shards[index - 1]
+
+
+def plan_shards(names: Sequence[str], count: int, costs: Mapping[str, float]) -> ShardPlan:
+    """按历史耗时把条目划分为 `count` 个分片（最长处理时间优先的贪心算法）。
+
+    条目按耗时从大到小排序，耗时相同时按名称的稳定哈希排序，依次放入当前总耗时最小的分片；没有历史记录的条目按已知耗时的
+    中位数估算，完全没有历史时退化为按哈希轮流分配。划分只依赖名称和耗时表，不同机器上结果一致。
+    """
+    if count < 1:
+        raise ValueError("Shard count must be greater than or equal to 1.")
+
+    unique = list(dict.fromkeys(names))
+    known = [costs[x] for x in unique if x in costs]
+    default = statistics.median(known) if known else DEFAULT_ITEM_COST
+
+    weighted = sorted(((costs.get(x, default), x) for x in unique), key=lambda x: (-x[0], stable_hash(x[1]), x[1]))
+    shards: List[List[str]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+
+    for cost, name in weighted:
+        i = min(range(count), key=lambda k: (loads[k], k))
+        shards[i].append(name)
+        loads[i] += cost
+
+    return ShardPlan(count=count, shards=[sorted(x) for x in shards], loads=[round(x, 3) for x in loads])
+
+
+class ShardBundle(BaseModel):
+    version: int = 1
+    index: int
+    count: int
+    plan_digest: str
+    elapsed_seconds: float = 0.0
+    result: InspectResult
+    files: Dict[str, str] = Field(default_factory=dict)
+    entries: Dict[str, CheckIndexEntry] = Field(default_factory=dict)
+    checked: Dict[str, str] = Field(default_factory=dict)
+
+
+def bundle_file_name(index: int, count: int) -> str:
+    return f"shard-{index}-of-{count}.json.zst"
+
+
+def build_bundle(plan: ShardPlan, index: int, result: InspectResult, check_index: CheckIndex, elapsed_seconds: float) -> ShardBundle:
+    """打包分片的检测结果：本轮检查过的输出文件（无论是否重写）、对应的索引记录和条目检查时间。"""
+    files = {x: check_index.output_dir.joinpath(x).read_text(encoding="utf-8") for x in sorted(check_index.touched)}
+    checked = {x: v for x in plan.names(index) if (v := check_index.last_checked(x)) is not None}
+
+    return ShardBundle(
+        index=index,
+        count=plan.count,
+        plan_digest=plan.digest,
+        elapsed_seconds=round(elapsed_seconds, 3),
+        result=result,
+        files=files,
+        entries={x: check_index.data.entries[x] for x in files},
+        checked=checked,
+    )
+
+
+def write_bundle(bundle: ShardBundle, bundle_dir: Path) -> Path:
+    """写出 zstd 压缩的分片结果；先写临时文件再替换，合并端不会读到半个文件。"""
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    file = bundle_dir.joinpath(bundle_file_name(bundle.index, bundle.count))
+    tmp_file = file.with_name(f".{file.name}.tmp")
+
+    tmp_file.write_bytes(zstd.compress(bundle.model_dump_json().encode("utf-8")))
+    os.replace(tmp_file, file)
+
+    return file
+
+
+def load_bundles(bundle_dir: Path) -> List[ShardBundle]:
+    """读取目录中的全部分片结果（可以在子目录中，便于直接使用 CI 下载的构件目录），按分片序号排序。"""
+    bundles = [
+        ShardBundle.model_validate_json(zstd.decompress(x.read_bytes()))
+        for x in sorted(bundle_dir.rglob("shard-*.json.zst"))
+        if BUNDLE_FILE_PATTERN.match(x.name)
+    ]
+
+    return sorted(bundles, key=lambda x: x.index)
+
+
+def merge_bundles(bundles: Sequence[ShardBundle], check_index: CheckIndex) -> InspectResult:
+    """把各分片的输出文件和检查记录写回输出目录，返回合并后的检测结果。
+
+    内容与磁盘上一致的文件不重写，combine 的增量清单不会因此重新解析；缺失的分片记为失败条目，`--strict` 时命令失败。
+    所有分片必须来自同一个划分，否则条目可能被遗漏或重复检测。
+    """
+    if not bundles:
+        raise ValueError("No shard bundles to merge.")
+
+    if len({(x.count, x.plan_digest) for x in bundles}) != 1:
+        raise ValueError("Shard bundles were planned differently. Make sure every shard runs against the same shard-costs.index.")
+
+    count = bundles[0].count
+    indexes = [x.index for x in bundles]
+
+    if len(set(indexes)) != len(indexes):
+        raise ValueError(f"Duplicate shard bundles: {indexes}")
+
+    output_dir = check_index.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    items: List[InspectItemResult] = []
+    written = unchanged = 0
+
+    for bundle in bundles:
+        for file_name, content in bundle.files.items():
+            if Path(file_name).name != file_name:
+                raise ValueError(f"Invalid file name in shard bundle {bundle.index}/{count}: {file_name}")
+
+            file = output_dir.joinpath(file_name)
+
+            if file.is_file() and file.read_text(encoding="utf-8") == content:
+                unchanged += 1
+                continue
+
+            file.write_text(content, encoding="utf-8")
+            written += 1
+
+        check_index.update(bundle.entries, bundle.checked)
+        items.extend(bundle.result.items)
+
+    for i in sorted(set(range(1, count + 1)) - set(indexes)):
+        items.append(InspectItemResult.failed(f"<shard {i}/{count}>", "ShardMissing", "No bundle was found for this shard."))
+
+    logger.info(f"Shard merge | bundles: {len(bundles)}/{count}, files written: {written}, unchanged: {unchanged}")
+
+    return InspectResult(items=items)
@@ -1,3 +1,8 @@
+import os
+
+from loguru import logger
+
+
 def strtobool(val):
     """Convert a string representation of truth to true (1) or false (0).
     True values are 'y', 'yes', 't', 'true', 'on', and '1'; false values
@@ -19,3 +24,22 @@ def safe_strtobool(val, default=False):
         return bool(strtobool(val))
     except AttributeError, ValueError:
         return default
+
+
+def get_env_int(name: str, default: int, min_value: int = 1) -> int:
+    """读取整数环境变量；非法或低于下限的配置统一回退为默认值。"""
+    raw_value = os.environ.get(name)
+    if raw_value is None or raw_value.strip() == "":
+        return default
+
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning(f"Invalid {name} value. Using default value: {default}.")
+        return default
+
+    if value < min_value:
+        logger.warning(f"{name} must be greater than or equal to {min_value}. Using default value: {default}.")
+        return default
+
+    return value
@@ -1,5 +1,6 @@
 import re
-from typing import Any, List, Mapping, Optional, Tuple
+import sys
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -64,13 +65,106 @@ class VersionSummary(BaseModel):
         return f"Latest: {self.latest}, Versions: {self.versions}, Downloads: {self.downloads}"
 
 
+class _VersionRecord:
+    """VersionHelper 内部使用的紧凑版本记录。
+
+    解析时只保存命名组和预先计算好的排序键，排序、过滤和分组都直接使用记录；只有需要对外返回时才构造 `Version` 模型，
+    同一记录只构造一次。
+    """
+
+    __slots__ = (
+        "major",
+        "minor",
+        "patch",
+        "build",
+        "letter",
+        "version",
+        "year",
+        "month",
+        "day",
+        "other",
+        "raw_data",
+        "raw_str",
+        "key",
+        "_model",
+    )
+
+    MODEL_FIELDS = __slots__[:12]
+
+    def __init__(self, groups: Mapping[str, Optional[str]], raw_data: Any, raw_str: str):
+        get = groups.get
+        minor, patch, build, letter, other = get("minor"), get("patch"), get("build"), get("letter"), get("other")
+
+        self.major = int(groups["major"])
+        self.minor = int(minor) if minor is not None else None
+        self.patch = int(patch) if patch is not None else None
+        self.build = int(build) if build is not None else None
+        # 字母和后缀在同一软件的标签中大量重复，驻留后共享同一个字符串对象。
+        self.letter = sys.intern(letter) if letter is not None else None
+        self.other = sys.intern(other) if other is not None else None
+        self.version = get("version")
+        self.year = get("year")
+        self.month = get("month")
+        self.day = get("day")
+        self.raw_data = raw_data
+        self.raw_str = raw_str
+        # 与原先 Version 排序规则一致：缺失数字段低于显式数字段。
+        self.key = (
+            self.major,
+            self.minor if minor is not None else -1,
+            self.patch if patch is not None else -1,
+            self.build if build is not None else -1,
+            letter or "",
+        )
+        self._model: Optional[Version] = None
+
+    @classmethod
+    def parse(cls, groups: Mapping[str, Optional[str]], raw_data: Any, raw_str: str) -> "_VersionRecord":
+        """按命名组创建记录；数字段无法直接转换时交给 `Version` 校验，保持原有的校验结果和错误信息。"""
+        try:
+            return cls(groups, raw_data, raw_str)
+        except KeyError, TypeError, ValueError:
+            model = Version(
+                major=groups.get("major"),
+                minor=groups.get("minor"),
+                patch=groups.get("patch"),
+                build=groups.get("build"),
+                letter=groups.get("letter"),
+                version=groups.get("version"),
+                year=groups.get("year"),
+                month=groups.get("month"),
+                day=groups.get("day"),
+                other=groups.get("other"),
+                raw_data=raw_data,
+                raw_str=raw_str,
+            )
+
+            return cls(model.model_dump(exclude={"raw_data", "raw_str"}), raw_data, raw_str)
+
+    @property
+    def model(self) -> Version:
+        """返回对应的 `Version` 模型。
+
+        只传入非空字段：pydantic-core 校验这些已转换好的值比 `model_construct` 更快，输出结果与逐字段构造一致。
+        """
+        if self._model is None:
+            self._model = Version(**{k: v for k in self.MODEL_FIELDS if (v := getattr(self, k)) is not None})
+
+        return self._model
+
+
 class VersionHelper:
     """负责把远端版本字符串解析为 Version、排序、过滤并生成下载地址。"""
 
     def __init__(self, pattern: str, split: int = 0, download_urls: List[str] = None, filter_expr: str = None):
         self.split = split
         self.exp = re.compile(pattern, flags=re.IGNORECASE)
-        self._versions: List[Version] = []
+        self._versions: List[_VersionRecord] = []
+        self._views: Dict[Hashable, Any] = {}
+        # 按完整版本号、原始字符串和后缀建立的索引，随 append 增量维护，查找不再线性扫描。
+        self._version_index: set[Optional[str]] = set()
+        self._raw_index: set[str] = set()
+        self._suffixes: Dict[str, None] = {}
         self.download_urls = download_urls or []
         self.filter_expr = filter_expr
 
@@ -79,23 +173,15 @@ class VersionHelper:
         m = self.exp.match(version)
 
         if m:
-            d = m.groupdict()
-            v = Version(
-                major=d.get("major"),
-                minor=d.get("minor", None),
-                patch=d.get("patch", None),
-                build=d.get("build", None),
-                letter=d.get("letter", None),
-                version=d.get("version", None),
-                year=d.get("year", None),
-                month=d.get("month", None),
-                day=d.get("day", None),
-                other=d.get("other", None),
-                raw_data=raw_data,
-                raw_str=version,
-            )
+            record = _VersionRecord.parse(m.groupdict(), raw_data, version)
+
+            self._versions.append(record)
+            self._version_index.add(record.version)
+            self._raw_index.add(record.raw_str)
+            if record.other:
+                self._suffixes.setdefault(record.other)
 
-            self._versions.append(v)
+            self._views.clear()
 
     def add_download_url(self, url: str):
         """追加下载地址并保持列表去重。"""
@@ -104,19 +190,11 @@ class VersionHelper:
 
     def exists(self, version: str) -> bool:
         """检查原始解析列表中是否存在指定完整版本号。"""
-        for v in self._versions:
-            if v.version == version:
-                return True
-
-        return False
+        return version in self._version_index
 
     def raw_exists(self, version: str) -> bool:
         """检查原始解析列表中是否存在指定远端原始版本字符串。"""
-        for v in self._versions:
-            if v.raw_str == version:
-                return True
-
-        return False
+        return version in self._raw_index
 
     @property
     def is_empty(self) -> bool:
@@ -126,64 +204,96 @@ class VersionHelper:
     @property
     def latest_version(self) -> Version:
         """返回排序和过滤后的第一个版本。"""
-        return self.versions[0]
+        return self._sorted_records()[0].model
 
     @property
     def raw_versions(self) -> List[Version]:
         """返回未排序、未过滤的原始解析结果。"""
-        return self._versions
+        return [v.model for v in self._versions]
+
+    def _view(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """读取缓存的派生视图；缓存在 append 时清空，键中包含视图依赖的配置，修改 split/filter_expr/download_urls 后会重新生成。"""
+        if key not in self._views:
+            self._views[key] = build()
+
+        return self._views[key]
+
+    def _sorted_records(self) -> List[_VersionRecord]:
+        """按预先计算的排序键倒序排列记录，并按 filter 表达式过滤；每次 append 之后只排序一次。"""
+
+        def build() -> List[_VersionRecord]:
+            records = sorted(self._versions, key=self._sort_key, reverse=True)
+
+            if self.filter_expr:
+                return self.filter_versions(records, self.filter_expr)
+
+            return records
+
+        return self._view(("sorted", self.filter_expr), build)
+
+    def _split_records(self) -> Mapping[str, List[_VersionRecord]]:
+        """按 split 配置把排序结果拆为主版本或主次版本分组；分组沿用整体排序结果，组内无需再次排序。"""
+
+        def build() -> Mapping[str, List[_VersionRecord]]:
+            d = dict()
+
+            if self.split == 1:
+                for version in self._sorted_records():
+                    d.setdefault(f"{version.major}", []).append(version)
+            elif self.split == 2:
+                for version in self._sorted_records():
+                    if version.minor is not None:
+                        d.setdefault(f"{version.major}.{version.minor}", []).append(version)
+
+            return d
+
+        return self._view(("split", self.filter_expr, self.split), build)
 
     @property
     def versions(self) -> List[Version]:
         """返回按数字版本倒序排列、并按 filter 表达式过滤后的版本列表。"""
-        if self.filter_expr:
-            return self.filter_versions(sorted(self._versions, key=self._sort_key, reverse=True), self.filter_expr)
-        else:
-            return sorted(self._versions, key=self._sort_key, reverse=True)
+        return [v.model for v in self._sorted_records()]
 
     @staticmethod
-    def _sort_key(version: Version) -> tuple[int, int, int, int, str]:
-        """把可选版本段规整为稳定排序键，缺失数字段低于显式数字段。"""
-        return (
-            version.major,
-            version.minor if version.minor is not None else -1,
-            version.patch if version.patch is not None else -1,
-            version.build if version.build is not None else -1,
-            version.letter or "",
-        )
+    def _sort_key(version: _VersionRecord) -> tuple[int, int, int, int, str]:
+        """返回记录上预先计算的排序键，缺失数字段低于显式数字段。"""
+        return version.key
 
     @property
     def split_versions(self) -> Mapping[str, List[Version]]:
         """按 split 配置把版本列表拆为主版本或主次版本分组。"""
-        d = dict()
-
-        if self.split == 1:
-            for version in self.versions:
-                k = f"{version.major}"
+        return {k: [v.model for v in records] for k, records in self._split_records().items()}
 
-                if k not in d:
-                    d[k] = []
-
-                d[k].append(version)
-        elif self.split == 2:
-            for version in self.versions:
-                if version.minor is not None:
-                    k = f"{version.major}.{version.minor}"
+    def latest_versions(self) -> List[Version]:
+        """返回整体或每个拆分分组的最新版本，只构造这些版本的模型；分组顺序与 `summary` 一致。"""
+        if self.split == 0:
+            latest = self._sorted_records()[:1]
+        else:
+            latest = [records[0] for records in self._split_records().values()]
 
-                    if k not in d:
-                        d[k] = []
+        if not latest:
+            raise ValueError("No versions matched the configured pattern.")
 
-                    d[k].append(version)
+        return [v.model for v in latest]
 
-        if len(d) > 0:
-            for k, v in d.items():
-                d[k] = sorted(v, key=self._sort_key, reverse=True)
+    @property
+    def raw_suffixes(self) -> List[str]:
+        """按解析顺序返回去重后的 `other` 命名组，例如 Docker 标签的 `-alpine`。"""
+        return list(self._suffixes)
 
-        return d
+    def latest_suffixes(self, latests: List[str]) -> List[str]:
+        """返回至少有一个最新版本仍带有该后缀标签（`{latest}{suffix}`）的后缀，顺序与 `raw_suffixes` 一致。"""
+        return [sfix for sfix in self._suffixes if any(f"{vv}{sfix}" in self._raw_index for vv in latests)]
 
     @property
     def summary(self) -> VersionSummary | Mapping[str, VersionSummary]:
-        """生成写出 JSON 所需的摘要数据；拆分模式会返回分组到摘要的映射。"""
+        """生成写出 JSON 所需的摘要数据；拆分模式会返回分组到摘要的映射。
+
+        摘要会缓存到下一次 append，调用方只能读取不能修改。
+        """
+        return self._view(("summary", self.filter_expr, self.split, tuple(self.download_urls)), self._build_summary)
+
+    def _build_summary(self) -> VersionSummary | Mapping[str, VersionSummary]:
         if self.split == 0:
             versions = self.versions  # 引用已排序的版本号数组
 
@@ -219,10 +329,10 @@ class VersionHelper:
         return d
 
     @staticmethod
-    def filter_versions(versions: List[Version], filter_expr: str) -> List[Version]:
+    def filter_versions(versions: List[Any], filter_expr: str) -> List[Any]:
         """按逗号分隔的范围表达式过滤版本，支持 >、>=、<、<=、==。
 
-        表达式中的版本最多比较 major/minor/patch 三段；缺失段按 0 处理。
+        表达式中的版本最多比较 major/minor/patch 三段；缺失段按 0 处理。列表元素只需提供这三个属性，`Version` 和内部记录都可以使用。
         """
         if not filter_expr.strip():
             return versions
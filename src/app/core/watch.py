@@ -0,0 +1,141 @@
+import heapq
+import os
+import time
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+WATCH_STATE_FILE = "watch-state.json"
+DEFAULT_MIN_INTERVAL = 15 * 60
+DEFAULT_MAX_INTERVAL = 7 * 24 * 3600
+# 内容变化时检测间隔减半，未变化时放大 1.5 倍：变化频繁的条目很快收敛到最小间隔，长期不变的条目逐步放慢。
+SHRINK_FACTOR = 0.5
+GROWTH_FACTOR = 1.5
+
+
+class WatchItemState(BaseModel):
+    interval: float
+    next_due: float
+    checks: int = 0
+    changes: int = 0
+    last_changed: Optional[float] = None
+
+
+class WatchStateData(BaseModel):
+    items: Dict[str, WatchItemState] = Field(default_factory=dict)
+
+
+class WatchSchedule:
+    """watch 模式下按下次到期时间排列的条目队列。
+
+    每个条目有自己的检测间隔，初始值为条目的缓存有效期；每次检测后按内容是否变化缩短或放大，并限制在
+    [`min_interval`, `max_interval`] 之间。失败的条目保持原间隔。状态（间隔、到期时间、检测和变化次数）保存在缓存目录中，
+    进程重启后继续沿用。时间均为 Unix 时间戳和秒。
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL):
+        if min_interval <= 0:
+            raise ValueError("min_interval must be greater than 0.")
+
+        if max_interval < min_interval:
+            raise ValueError("max_interval must be greater than or equal to min_interval.")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.data = WatchStateData()
+        self._heap: List[Tuple[float, str]] = []
+
+    @classmethod
+    def load(cls, path: Path, min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL) -> "WatchSchedule":
+        """读取保存的调度状态；状态文件只提供间隔和到期时间，条目仍需通过 `add()` 加入队列。"""
+        schedule = cls(min_interval, max_interval)
+
+        if path.is_file():
+            try:
+                schedule.data = WatchStateData.model_validate_json(path.read_bytes())
+            except Exception as e:
+                logger.warning(f"Watch state is invalid and will be rebuilt: {type(e).__name__}: {e}")
+
+        return schedule
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(f".{path.name}.tmp")
+
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(self.data.model_dump_json(indent=1))
+
+        os.replace(tmp_file, path)
+
+    @property
+    def items(self) -> Dict[str, WatchItemState]:
+        return self.data.items
+
+    def clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def add(self, name: str, interval: float, last_checked: Optional[float] = None, now: Optional[float] = None):
+        """加入条目：新条目在上次检测时间加上间隔后到期（没有记录时立即到期），已有状态的条目沿用原来的间隔。"""
+        now = time.time() if now is None else now
+        state = self.data.items.get(name)
+
+        if state is None:
+            interval = self.clamp(interval)
+            state = WatchItemState(interval=interval, next_due=now if last_checked is None else last_checked + interval)
+            self.data.items[name] = state
+        else:
+            # 间隔上下限可能在两次启动之间调整过。
+            state.interval = self.clamp(state.interval)
+            state.next_due = min(state.next_due, now + state.interval)
+
+        heapq.heappush(self._heap, (state.next_due, name))
+
+    def retain(self, names: Collection[str]):
+        """丢弃配置中已经不存在的条目的状态。"""
+        for name in [x for x in self.data.items if x not in names]:
+            del self.data.items[name]
+
+    def next_due(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, window: float = 0.0) -> List[str]:
+        """取出 `now + window` 之前到期的全部条目；窗口内的条目合成一批，便于合并请求和 GraphQL 批量查询。"""
+        due = []
+
+        while True:
+            self._drop_stale()
+
+            if not self._heap or self._heap[0][0] > now + window:
+                return due
+
+            due.append(heapq.heappop(self._heap)[1])
+
+    def complete(self, name: str, changed: bool, failed: bool = False, now: Optional[float] = None):
+        """记录一次检测结果并重新排入队列。"""
+        now = time.time() if now is None else now
+        state = self.data.items[name]
+        state.checks += 1
+
+        if changed:
+            state.changes += 1
+            state.last_changed = now
+            state.interval = self.clamp(state.interval * SHRINK_FACTOR)
+        elif not failed:
+            state.interval = self.clamp(state.interval * GROWTH_FACTOR)
+
+        state.next_due = now + state.interval
+        heapq.heappush(self._heap, (state.next_due, name))
+
+    def _drop_stale(self):
+        # 条目重新排队后旧的堆元素不会删除，取出时按当前状态跳过。
+        while self._heap:
+            due, name = self._heap[0]
+            state = self.data.items.get(name)
+
+            if state is not None and state.next_due == due:
+                return
+
+            heapq.heappop(self._heap)
@@ -2,19 +2,25 @@ import importlib
 import json
 import operator
 import os
+import time
 from abc import ABCMeta, abstractmethod
 from asyncio import Semaphore
-from typing import Dict, List, Mapping, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import aiofiles
 import arrow
 from loguru import logger
+from pydantic import BaseModel
 
+from app.core.check_index import CheckIndex, payload_digest
 from app.core.config import AppSettingSoftItem, Configuration, OutputResult
+from app.core.executor import ParseExecutor
 from app.core.http import AsyncHttpClient
 from app.core.inspect_result import InspectItemResult
+from app.core.metrics import ItemMetrics, TimedSemaphore, current_metrics, timed
 from app.core.output import get_output_dir
-from app.core.version import VersionSummary
+from app.core.profiling import CpuTimer
+from app.core.version import VersionHelper, VersionSummary
 from app.link import UrlMakerBase
 
 
@@ -79,6 +85,13 @@ def check_requirements(requirement_string: str, major: int, minor: Optional[int]
 
 
 class Base(metaclass=ABCMeta):
+    # 由 inspect 注入的运行期检查时间索引；为 None 时每次都重写输出文件。
+    check_index: Optional[CheckIndex] = None
+    # 由 inspect 注入的页面解析执行器；为 None 时在事件循环中直接解析。
+    parse_executor: Optional[ParseExecutor] = None
+    # 由 watch 设置：检测时机由调度队列决定，不再按缓存有效期跳过。
+    ignore_cache_ttl: bool = False
+
     def __init__(self, cfg: Configuration):
         self.cfg = cfg
         self.httpc = AsyncHttpClient(debug=self.cfg.debug)
@@ -88,16 +101,70 @@ class Base(metaclass=ABCMeta):
         """解析器入口方法，子类负责抓取远端版本并调用 `write()` 写出结果。"""
         ...
 
-    async def wrap_handle(self, sem: Semaphore, soft: AppSettingSoftItem):
-        """包装单个软件条目的解析流程，把异常转换为结构化检测结果。"""
+    async def wrap_handle(self, sem: Semaphore, soft: AppSettingSoftItem) -> InspectItemResult:
+        """包装单个软件条目的解析流程，把异常转换为结构化检测结果。
+
+        缓存有效期内的条目直接跳过，不占用并发槽位也不发起网络请求；检测成功后在运行期索引中记录本次检测时间。结果中附带
+        解析器名称和条目的耗时统计：排队、网络、解析、写出时间，请求数、下载字节数、缓存命中数、实际重写的文件数，以及在
+        事件循环中消耗的 CPU 时间。
+        """
+        metrics = ItemMetrics()
+        token = current_metrics.set(metrics)
+        timer = CpuTimer()
+        started = time.perf_counter()
+
+        try:
+            result = await timer.run(self._check(TimedSemaphore(sem), soft))
+        finally:
+            current_metrics.reset(token)
+
+        metrics.elapsed_seconds = time.perf_counter() - started
+        metrics.cpu_seconds = timer.seconds
+        result.parser = soft.parser
+        result.metrics = metrics.rounded()
+
+        return result
+
+    async def _check(self, sem: Semaphore, soft: AppSettingSoftItem) -> InspectItemResult:
         try:
+            expired, last_checked = (True, None) if self.ignore_cache_ttl else self.is_expired(soft)
+            if not expired:
+                logger.info(f"[{soft.name}] SKIPPED: The last update time is: {last_checked}, cache is still valid.")
+                return InspectItemResult.skipped(soft.name, f"Cache is still valid. (Last update: {last_checked})")
+
             await self.handle(sem, soft)
+
+            if self.check_index is not None:
+                self.check_index.mark_checked(soft.name, arrow.now().format("YYYY-MM-DD HH:mm:ss"))
+
             return InspectItemResult.success(soft.name)
         except Exception as e:
             logger.error(f"[{soft.name}] error found.")
             logger.exception(e)
             return InspectItemResult.failed(soft.name, type(e).__name__, str(e))
 
+    def debug_versions(self, name: str, vhlp: VersionHelper):
+        """输出版本解析结果的调试日志。
+
+        参数延迟到 DEBUG 级别启用时才计算，INFO 模式下不会为日志排序版本或生成摘要；拆分模式会额外输出分组结果。
+        """
+        log = logger.opt(lazy=True, depth=1)
+        log.debug("Name: {}, Versions: {}, Summary: {}", lambda: name, lambda: vhlp.versions, lambda: vhlp.summary)
+
+        if vhlp.split > 0:
+            log.debug("Split Versions: {}", lambda: vhlp.split_versions)
+
+    async def run_parse(self, func: Callable[..., Any], *args: Any) -> Any:
+        """执行页面解析函数（BeautifulSoup、feedparser 等 CPU 密集操作），避免阻塞事件循环。
+
+        `func` 需要定义在模块顶层，参数和返回值只使用字符串、列表等可以 pickle 的简单类型，不能返回 BeautifulSoup 节点。
+        """
+        with timed("parse_seconds"):
+            if self.parse_executor is None:
+                return func(*args)
+
+            return await self.parse_executor.run(func, *args)
+
     async def request(
         self,
         method: str,
@@ -116,6 +183,18 @@ class Base(metaclass=ABCMeta):
 
         return url, http_status_code, headers, data
 
+    async def iter_json_array(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Any]:
+        """流式读取顶层为数组的 JSON 响应并逐个返回元素，适合体积很大、只需要少数字段的版本列表。"""
+        async for item in self.httpc.iter_json_array(url, params, headers, timeout, fields):
+            yield item
+
     def _build_download_urls(self, soft: AppSettingSoftItem, version_summary: VersionSummary, download_urls: List[str]) -> List[str]:
         """根据配置决定直接使用下载模板，还是委托 `app.link` 动态生成下载地址。"""
         if soft.download_dynamic:
@@ -131,8 +210,24 @@ class Base(metaclass=ABCMeta):
 
         return download_urls
 
-    def is_expired(self, soft: AppSettingSoftItem) -> Tuple[bool, str]:
-        """检查软件输出文件是否超过缓存有效期，返回是否过期和上次更新时间。"""
+    def cache_ttl_hours(self, soft: AppSettingSoftItem) -> int:
+        """返回条目的缓存有效期：条目配置优先，其次是按解析器的 `cache_ttl` 表，最后是环境变量默认值。"""
+        if soft.cache_ttl is not None:
+            return soft.cache_ttl
+
+        ttl_hours = self.cfg.settings.cache_ttl.get(getattr(soft, "parser", ""))
+        if ttl_hours is not None:
+            return ttl_hours
+
+        return get_cache_ttl_hours()
+
+    def _last_checked(self, soft: AppSettingSoftItem) -> Optional[str]:
+        """查找条目最近一次成功检测的时间；运行期索引没有记录时回退到读取输出文件的 `created_time`。"""
+        if self.check_index is not None:
+            last_checked = self.check_index.last_checked(soft.name)
+            if last_checked is not None:
+                return last_checked
+
         output_path = get_output_dir(self.cfg.workdir)
 
         file = None
@@ -146,16 +241,62 @@ class Base(metaclass=ABCMeta):
                 break
 
         if file and file.is_file():
+            entry = self.check_index.get(file.name) if self.check_index is not None else None
+
+            if entry is not None:
+                # 内容未变化时输出文件不会重写，最近检查时间以索引为准。
+                return entry.checked
+
             with open(file, "r", encoding="utf-8") as f:
-                data = json.loads(f.read())
+                return json.loads(f.read())["created_time"]
+
+        return None
+
+    def is_expired(self, soft: AppSettingSoftItem) -> Tuple[bool, str]:
+        """检查软件条目是否超过缓存有效期，返回是否过期和上次检测时间。"""
+        last_checked = self._last_checked(soft)
+
+        if last_checked is None:
+            return True, "2000-01-01 00:00:00"
+
+        ttl_hours = self.cache_ttl_hours(soft)
+        if ttl_hours <= 0 or arrow.now().shift(hours=-ttl_hours) >= arrow.get(last_checked):
+            return True, last_checked
+        else:
+            return False, last_checked
 
-                ttl_hours = get_cache_ttl_hours()
-                if arrow.now().shift(hours=-ttl_hours) >= arrow.get(data["created_time"]):
-                    return True, data["created_time"]
-                else:
-                    return False, data["created_time"]
+    async def write_output(self, file_name: str, result: BaseModel, exclude_none: bool = True) -> bool:
+        """写出单个输出文件，返回是否实际写入。
 
-        return True, "2000-01-01 00:00:00"
+        配置了检查时间索引时按语义内容（不含 `created_time`）比较哈希，内容未变化则保留旧文件，只在索引中记录本次检查时间。
+        """
+        with timed("write_seconds"):
+            written = await self._write_output(file_name, result, exclude_none)
+
+        metrics = current_metrics.get()
+        if written and metrics is not None:
+            metrics.files_written += 1
+
+        return written
+
+    async def _write_output(self, file_name: str, result: BaseModel, exclude_none: bool) -> bool:
+        output_path = get_output_dir(self.cfg.workdir)
+
+        if self.check_index is not None:
+            digest = payload_digest(result.model_dump(mode="json", by_alias=True, exclude_none=exclude_none))
+            checked = getattr(result, "created_time")
+
+            if self.check_index.is_unchanged(file_name, digest):
+                self.check_index.touch(file_name, digest, checked, written=False)
+                return False
+
+        async with aiofiles.open(output_path.joinpath(file_name), "w", encoding="utf-8") as f:
+            await f.write(result.model_dump_json(by_alias=True, exclude_none=exclude_none))
+
+        if self.check_index is not None:
+            self.check_index.touch(file_name, digest, checked, written=True)
+
+        return True
 
     async def write(
         self,
@@ -187,12 +328,11 @@ class Base(metaclass=ABCMeta):
                         download_urls=self._build_download_urls(soft, v, v.downloads),
                         created_time=arrow.now().format("YYYY-MM-DD HH:mm:ss"),
                         **kwargs,
-                    ).model_dump_json(by_alias=True, exclude_none=True)
+                    )
 
-                    async with aiofiles.open(output_path.joinpath(f"{soft.name}-{k}.json"), "w", encoding="utf-8") as f:
-                        await f.write(result)
+                    written = await self.write_output(f"{soft.name}-{k}.json", result)
 
-                    logger.info(f"<\033[1;32m{soft.name}-{k}\033[0m> done.")
+                    logger.info(f"<\033[1;32m{soft.name}-{k}\033[0m> done.{'' if written else ' (unchanged)'}")
         else:
             result = OutputResult(
                 name=f"{soft.name}{suffix}",
@@ -204,9 +344,8 @@ class Base(metaclass=ABCMeta):
                 download_urls=self._build_download_urls(soft, version_summary, version_summary.downloads),
                 created_time=arrow.now().format("YYYY-MM-DD HH:mm:ss"),
                 **kwargs,
-            ).model_dump_json(by_alias=True, exclude_none=True)
+            )
 
-            async with aiofiles.open(output_path.joinpath(f"{soft.name}{suffix}.json"), "w", encoding="utf-8") as f:
-                await f.write(result)
+            written = await self.write_output(f"{soft.name}{suffix}.json", result)
 
-            logger.info(f"<\033[1;32m{soft.name}{suffix}\033[0m> done.")
+            logger.info(f"<\033[1;32m{soft.name}{suffix}\033[0m> done.{'' if written else ' (unchanged)'}")
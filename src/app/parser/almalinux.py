@@ -1,13 +1,56 @@
 from asyncio import Semaphore
+from typing import List, Sequence
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 from loguru import logger
+from lxml.html import HtmlElement
 
 from app.core.config import AlmaLinuxSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract
+
+
+def _versions_lxml(doc: HtmlElement, os_major_vers: Sequence[int]) -> List[str]:
+    versions = []
+
+    for os_ver in os_major_vers:
+        table = doc.xpath(f"//*[@id='almalinux-os-{os_ver}']/following-sibling::table[1]")[0]
+
+        for tr in table.xpath("tbody/tr | tr"):
+            link_ver = tr.xpath("*[1][self::td]/*[1][self::a]")[0].text_content().strip()
+            release_date = tr.xpath("*[4][self::td]")[0].text_content().strip()
+
+            if len(release_date) > 0:
+                versions.append(link_ver)
+
+    return versions
+
+
+def _versions_soup(soup: BeautifulSoup, os_major_vers: Sequence[int]) -> List[str]:
+    versions = []
+
+    for os_ver in os_major_vers:
+        el_almalinux = soup.select_one(f"#almalinux-os-{os_ver}")
+        el_almalinux_table = el_almalinux.find_next_sibling("table")
+        el_almalinux_trs = el_almalinux_table.select("tbody > tr")
+
+        for v in el_almalinux_trs:
+            if isinstance(v, Tag):
+                link_ver = v.select_one("td:nth-child(1) > a:nth-child(1)").text.strip()
+                release_date = v.select_one("td:nth-child(4)").text.strip()
+
+                if len(release_date) > 0:
+                    versions.append(link_ver)
+
+    return versions
+
+
+def extract_versions(data_s: str, os_major_vers: Sequence[int]) -> List[str]:
+    """提取发行说明页面中各主版本表格里已发布（填写了发布日期）的版本号。"""
+    return extract(data_s, _versions_lxml, _versions_soup, os_major_vers)
 
 
 class Parser(Base):
@@ -19,26 +62,12 @@ class Parser(Base):
         async with sem:
             _, status, _, data_s = await self.request("GET", "https://wiki.almalinux.org/release-notes/", is_json=False)
 
-            # Analyzing HTML text data.
-            soup = BeautifulSoup(data_s, "html5lib")
-
             os_major_vers = (10, 9, 8)
 
-            for os_ver in os_major_vers:
-                el_almalinux = soup.select_one(f"#almalinux-os-{os_ver}")
-                el_almalinux_table = el_almalinux.find_next_sibling("table")
-                el_almalinux_trs = el_almalinux_table.select("tbody > tr")
-
-                for v in el_almalinux_trs:
-                    if isinstance(v, Tag):
-                        link_ver = v.select_one("td:nth-child(1) > a:nth-child(1)").text.strip()
-                        release_date = v.select_one("td:nth-child(4)").text.strip()
-
-                        if len(release_date) > 0:
-                            vhlp.append(link_ver)
+            # Analyzing HTML text data.
+            for version in await self.run_parse(extract_versions, data_s, os_major_vers):
+                vhlp.append(version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
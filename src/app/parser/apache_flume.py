@@ -1,12 +1,40 @@
 from asyncio import Semaphore
+from typing import List
 
 from bs4 import BeautifulSoup
 from loguru import logger
+from lxml.html import HtmlElement
 
 from app.core.config import ApacheFlumeSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract
+
+
+def _versions_lxml(doc: HtmlElement) -> List[str]:
+    latest_href = doc.xpath("//*[@id='releases']/*[3][self::p]/a/@href")[0]
+    other_hrefs = doc.xpath("//*[@id='releases']/*[6][self::div]/ul/li/a/@href")
+
+    return [href.removesuffix(".html") for href in [latest_href, *other_hrefs]]
+
+
+def _versions_soup(soup: BeautifulSoup) -> List[str]:
+    latest_a_element = soup.select_one("#releases > p:nth-child(3) > a")
+    other_a_elements = soup.select("#releases > div:nth-child(6) > ul > li > a")
+
+    versions = [latest_a_element.attrs["href"].removesuffix(".html")]
+
+    for v in other_a_elements:
+        if v:
+            versions.append(v.attrs["href"].removesuffix(".html"))
+
+    return versions
+
+
+def extract_versions(data_s: str) -> List[str]:
+    """提取发布页面中的版本号，最新版本在前。"""
+    return extract(data_s, _versions_lxml, _versions_soup)
 
 
 class Parser(Base):
@@ -19,19 +47,9 @@ class Parser(Base):
             _, status, _, data_s = await self.request("GET", "https://flume.apache.org/releases/index.html", is_json=False)
 
             # Analyzing HTML text data.
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            latest_a_element = soup.select_one("#releases > p:nth-child(3) > a")
-            other_a_elements = soup.select("#releases > div:nth-child(6) > ul > li > a")
-
-            vhlp.append(latest_a_element.attrs["href"].removesuffix(".html"))
-
-            for v in other_a_elements:
-                if v:
-                    vhlp.append(v.attrs["href"].removesuffix(".html"))
+            for version in await self.run_parse(extract_versions, data_s):
+                vhlp.append(version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
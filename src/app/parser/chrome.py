@@ -25,8 +25,6 @@ class Parser(Base):
                     if v["channel"] == "Stable" and v["platform"] == "Windows":
                         vhlp.append(v["version"])
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
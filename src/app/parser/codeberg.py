@@ -1,4 +1,5 @@
 from asyncio import Semaphore
+from typing import List
 
 import feedparser
 from loguru import logger
@@ -9,6 +10,19 @@ from app.core.version import VersionHelper
 from . import Base
 
 
+def extract_titles(data_s: str) -> List[str]:
+    """提取 RSS 订阅中每个条目的标题。"""
+    rss = feedparser.parse(data_s)
+    titles = []
+
+    if rss and isinstance(rss.entries, list):
+        for v in rss.entries:
+            if isinstance(v, feedparser.FeedParserDict):
+                titles.append(v["title"])
+
+    return titles
+
+
 class Parser(Base):
     async def handle(self, sem: Semaphore, soft: CodebergSoftware):
         logger.debug(f"Name: {soft.name} ({soft.parser})")
@@ -23,15 +37,9 @@ class Parser(Base):
 
             _, status, _, data_s = await self.request("GET", api_url)
 
-            rss = feedparser.parse(data_s)
-
-            if rss and isinstance(rss.entries, list):
-                for v in rss.entries:
-                    if isinstance(v, feedparser.FeedParserDict):
-                        vhlp.append(v["title"])
+            for title in await self.run_parse(extract_titles, data_s):
+                vhlp.append(title)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
@@ -26,8 +26,6 @@ class Parser(Base):
                 for v in data_r["prefixes"]:
                     vhlp.append(str(v).removeprefix("channels/stable/release/").rstrip("/"))
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
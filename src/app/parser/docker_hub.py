@@ -1,21 +1,24 @@
 import asyncio
 import time
 from asyncio import Semaphore
-from typing import List, Mapping, Optional
+from pathlib import Path
+from typing import List, Optional
 
-import aiofiles
 import arrow
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from app.core.config import DockerHubSoftware
-from app.core.output import get_output_dir
-from app.core.version import VersionHelper, VersionSummary
+from app.core.output import get_cache_dir, get_output_dir
+from app.core.ratelimit import RateLimitGovernor
+from app.core.utils import get_env_int
+from app.core.version import VersionHelper
 
 from . import Base
 
 DOCKER_HUB_RATE_LIMIT_RETRY_BUDGET_SECONDS = 25 * 60
 DOCKER_HUB_RATE_LIMIT_MAX_SLEEP_SECONDS = 120
+DOCKER_HUB_PAGE_SIZE = 100
 
 
 class RepositoryTagItem(BaseModel):
@@ -26,6 +29,13 @@ class RepositoryTagItem(BaseModel):
 
 
 class RepositoryTags(BaseModel):
+    next: Optional[str] = None
+    results: List[RepositoryTagItem] = Field(default_factory=list)
+
+
+class TagSnapshot(BaseModel):
+    # 上次完整同步（不按水位线停止、不与旧记录合并）的时间戳，旧格式的快照没有该字段，按需要完整同步处理。
+    full_synced: int = 0
     results: List[RepositoryTagItem] = Field(default_factory=list)
 
 
@@ -46,6 +56,15 @@ class OutputResult(BaseModel):
 
 
 class Parser(Base):
+    # 由 inspect 注入的整轮共享限流器；为空时每个仓库各自按响应头等待（旧逻辑）。
+    governor: Optional[RateLimitGovernor] = None
+
+    @staticmethod
+    def create_governor(max_probes: int = 1) -> RateLimitGovernor:
+        return RateLimitGovernor(
+            "Docker Hub", DOCKER_HUB_RATE_LIMIT_RETRY_BUDGET_SECONDS, DOCKER_HUB_RATE_LIMIT_MAX_SLEEP_SECONDS, max_probes=max_probes
+        )
+
     async def sleep(self, seconds: int):
         await asyncio.sleep(seconds)
 
@@ -87,8 +106,108 @@ class Parser(Base):
 
         return waited_seconds + sleep_seconds
 
+    @staticmethod
+    def _pushed_at(value: str) -> float:
+        try:
+            return arrow.get(value).timestamp()
+        except Exception:
+            return 0.0
+
+    def _snapshot_file(self, soft: DockerHubSoftware) -> Path:
+        return get_cache_dir(self.cfg.workdir).joinpath("docker-hub", f"docker-{soft.repo.replace('/', '-')}.json")
+
+    def _load_snapshot(self, file: Path) -> Optional[TagSnapshot]:
+        """读取上次同步的完整 Tag 列表；缓存目录中没有快照时返回 None，由 `_seed_from_output` 从输出文件还原。"""
+        if not file.is_file():
+            return None
+
+        try:
+            return TagSnapshot.model_validate_json(file.read_bytes())
+        except Exception as e:
+            logger.warning(f"[Docker Hub][{file.name}] tag snapshot is invalid and will be rebuilt: {type(e).__name__}: {e}")
+            return None
+
+    def _seed_from_output(self, soft: DockerHubSoftware) -> Optional[TagSnapshot]:
+        """从已提交的输出文件还原上次同步的 Tag 列表，缓存目录为空（例如 CI 首次运行）时同样可以增量同步。
+
+        输出文件只保留匹配版本的 Tag，带后缀的变体（例如 `1.2.3-alpine`）按最新版本和后缀列表补回，推送时间取对应版本的时间；
+        输出文件的生成时间视为上次完整同步的时间。
+        """
+        file = get_output_dir(self.cfg.workdir).joinpath(f"docker-{soft.repo.replace('/', '-')}.json")
+
+        if not file.is_file():
+            return None
+
+        try:
+            output = OutputResult.model_validate_json(file.read_bytes())
+            full_synced = arrow.get(output.created_time).int_timestamp
+        except Exception as e:
+            logger.warning(f"[Docker Hub][{file.name}] output file cannot seed the incremental sync: {type(e).__name__}: {e}")
+            return None
+
+        tags = {v.name: v for v in output.tags}
+
+        for latest in output.latest_tags:
+            if latest in tags:
+                for sfix in output.suffix:
+                    tags.setdefault(f"{latest}{sfix}", tags[latest].model_copy(update={"name": f"{latest}{sfix}"}))
+
+        return TagSnapshot(full_synced=full_synced, results=list(tags.values()))
+
+    def _full_sync_due(self, snapshot: TagSnapshot) -> bool:
+        """增量合并只会新增或更新 Tag，上游删除或停用的 Tag 需要定期完整同步才能移除；间隔为 0 时不强制完整同步。"""
+        days = get_env_int("VERSION_CHECKER_DOCKER_HUB_FULL_SYNC_DAYS", 7)
+
+        return days > 0 and self._now() - snapshot.full_synced >= days * 86400
+
+    def _merge_tags(
+        self, soft: DockerHubSoftware, fresh: List[RepositoryTagItem], known: List[RepositoryTagItem]
+    ) -> List[RepositoryTagItem]:
+        """本轮抓到的 Tag 覆盖同名旧记录，按推送时间倒序合并，并保持与完整同步相同的 max_page 窗口。"""
+        names = {v.name for v in fresh}
+        merged = fresh + [v for v in known if v.name not in names]
+        merged.sort(key=lambda v: self._pushed_at(v.tag_last_pushed), reverse=True)
+
+        return merged[: soft.max_page * DOCKER_HUB_PAGE_SIZE]
+
+    def _priority(self, soft: DockerHubSoftware) -> float:
+        """共享限流时的放行优先级：上次检测时间越早越优先，从未检测过的仓库最先执行。"""
+        last_checked = self._last_checked(soft)
+
+        try:
+            return arrow.get(last_checked).timestamp() if last_checked else 0.0
+        except Exception:
+            return 0.0
+
+    async def _request_tags(self, url: str, params: dict, priority: float):
+        """请求一页 Tag；配置了共享限流器时先取得令牌，并把响应头回馈给限流器。"""
+        if self.governor is not None:
+            await self.governor.acquire(priority)
+
+        try:
+            _, status, headers, data_r = await self.request("GET", url, params=params, is_json=True, raise_for_status=False)
+        except BaseException:
+            if self.governor is not None:
+                self.governor.release()
+            raise
+
+        if self.governor is not None:
+            header = RatelimitHeader.model_validate(headers)
+
+            if status == 429:
+                self.governor.exhausted(headers.get("Retry-After"), header.rate_reset, header.rate_limit)
+            else:
+                self.governor.release(header.rate_remaining, header.rate_limit, header.rate_reset)
+
+        return status, headers, data_r
+
     async def handle(self, sem: Semaphore, soft: DockerHubSoftware):
-        """分页读取 Docker Hub Tag 列表，并保留限流响应头用于输出和日志。"""
+        """分页读取 Docker Hub Tag 列表，并保留限流响应头用于输出和日志。
+
+        增量模式下按更新时间倒序翻页，某页出现不晚于上次同步水位线的 Tag 后停止，稳定状态下每个仓库只需请求一页。距上次完整同步
+        超过 `VERSION_CHECKER_DOCKER_HUB_FULL_SYNC_DAYS` 天（默认 7 天）时不使用快照，完整翻页并以本轮结果替换快照，移除上游已删除的
+        Tag，使结果与完整同步模式一致。
+        """
         logger.debug(f"Repository: {soft.repo} ({soft.parser})")
 
         vhlp = VersionHelper(pattern=soft.pattern, split=soft.split, download_urls=[])
@@ -102,42 +221,77 @@ class Parser(Base):
         data_header = RatelimitHeader.model_validate({})
         waited_seconds = 0
 
-        async with sem:
+        snapshot_file = self._snapshot_file(soft) if soft.incremental else None
+        snapshot = (self._load_snapshot(snapshot_file) or self._seed_from_output(soft)) if snapshot_file else None
+        known: List[RepositoryTagItem] = []
+        full_synced = self._now()
+
+        if snapshot is not None:
+            if self._full_sync_due(snapshot):
+                logger.debug(f"[Docker Hub][{soft.repo}] periodic full sync, the tag snapshot is not used.")
+            else:
+                known, full_synced = snapshot.results, snapshot.full_synced
+
+        watermark = max((self._pushed_at(v.tag_last_pushed) for v in known), default=None)
+
+        params = {"status": "active", "page_size": f"{DOCKER_HUB_PAGE_SIZE}"}
+        if soft.incremental:
+            params["ordering"] = "last_updated"
+
+        url = f"https://hub.docker.com/v2/namespaces/{repo_parts[0]}/repositories/{repo_parts[1]}/tags"
+        priority = self._priority(soft) if self.governor is not None else 0.0
+        # 共享限流时按数据新旧决定仓库占用条目槽位的顺序，仓库数超过槽位数时数据最旧的先检测。
+        slot = self.governor.admit(sem, priority) if self.governor is not None else sem
+
+        async with slot:
             while True:
                 if current_page > max_page:
                     break
 
-                _, status, headers, data_r = await self.request(
-                    "GET",
-                    f"https://hub.docker.com/v2/namespaces/{repo_parts[0]}/repositories/{repo_parts[1]}/tags",
-                    params={"status": "active", "page": f"{current_page}", "page_size": "100"},
-                    is_json=True,
-                    raise_for_status=False,
-                )
+                page_params = {**params, "page": f"{current_page}"}
+                # 令牌在占用条目槽位之后、发出请求之前取得，排队等待槽位的仓库不占用额度。
+                status, headers, data_r = await self._request_tags(url, page_params, priority)
 
                 data_header = RatelimitHeader.model_validate(headers)
 
                 if status == 429:
-                    waited_seconds = await self._wait_for_rate_limit(soft, data_header, headers.get("Retry-After"), waited_seconds)
+                    if self.governor is None:
+                        retry_after = headers.get("Retry-After")
+                        waited_seconds = await self._wait_for_rate_limit(soft, data_header, retry_after, waited_seconds)
                     continue
 
                 if status == 200:
                     data = RepositoryTags.model_validate(data_r)
 
-                    for v in data.results:
-                        vhlp.append(v.name)
-
                     results.extend(data.results)
 
-                    if data_header.rate_remaining == "0" and current_page < max_page:
+                    # 已经读到上次同步过的 Tag，或者没有下一页时停止翻页。
+                    if watermark is not None and any(self._pushed_at(v.tag_last_pushed) <= watermark for v in data.results):
+                        break
+
+                    if "next" in data_r and not data.next:
+                        break
+
+                    if self.governor is None and data_header.rate_remaining == "0" and current_page < max_page:
                         waited_seconds = await self._wait_for_rate_limit(soft, data_header, None, waited_seconds)
                 else:
                     raise RuntimeError(f"[Docker Hub][{soft.repo}] HTTP status {status} error.")
 
                 current_page += 1
 
+            if known:
+                logger.debug(f"[Docker Hub][{soft.repo}] incremental sync: {len(results)} fresh tag(s), {len(known)} known tag(s).")
+                results = self._merge_tags(soft, results, known)
+
+            for v in results:
+                vhlp.append(v.name)
+
             await self.write_data(soft, results, data_header, vhlp)
 
+        if snapshot_file:
+            snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            snapshot_file.write_text(TagSnapshot(full_synced=full_synced, results=results).model_dump_json(), encoding="utf-8")
+
     async def write_data(self, soft: DockerHubSoftware, items: List[RepositoryTagItem], header: RatelimitHeader, vhlp: VersionHelper):
         """写出 Docker Hub 专用 JSON，包含匹配版本、最新标签、可用后缀和限流信息。"""
         output_path = get_output_dir(self.cfg.workdir)
@@ -148,35 +302,17 @@ class Parser(Base):
         # 只保留能被版本正则识别的 Tag，避免输出无关镜像标签。
         tags = []
         latests = []
-        suffix = []
 
         for v in items:
             if vhlp.exists(v.name):
                 tags.append(v)
 
-        version_summary = vhlp.summary
-
-        if isinstance(version_summary, Mapping):
-            for k, v in version_summary.items():
-                if isinstance(v, VersionSummary):
-                    latests.append(v.latest.version)
-        elif isinstance(version_summary, VersionSummary):
-            latests.append(version_summary.latest.version)
-
-        def is_latest_exists(sfix: str) -> bool:
-            """判断某个 Tag 后缀是否仍存在于最新版本对应的标签中。"""
-            for vv in latests:
-                fv = f"{vv}{sfix}"
-
-                if vhlp.raw_exists(fv):
-                    return True
-
-            return False
+        # 只需要各分组最新版本，避免为全部 Tag 构造版本模型。
+        for v in vhlp.latest_versions():
+            latests.append(v.version)
 
         # 收集最新版本仍然存在的 Tag 后缀，例如 alpine、slim 等变体。
-        for v in vhlp.raw_versions:
-            if v.other and v.other not in suffix and is_latest_exists(v.other):
-                suffix.append(v.other)
+        suffix = vhlp.latest_suffixes(latests)
 
         soft_name = f"docker-{soft.repo.replace('/', '-')}"
 
@@ -188,12 +324,13 @@ class Parser(Base):
             suffix=suffix,
             fixed_tags=soft.fixed_tags,
             created_time=arrow.now().format("YYYY-MM-DD HH:mm:ss"),
-        ).model_dump_json(by_alias=True)
+        )
 
-        async with aiofiles.open(output_path.joinpath(f"{soft_name}.json"), "w", encoding="utf-8") as f:
-            await f.write(result)
+        written = await self.write_output(f"{soft_name}.json", result, exclude_none=False)
 
+        # 缓存命中或代理去掉限流响应头时没有重置时间。
+        reset = arrow.get(int(header.rate_reset)).format("YYYY-MM-DD HH:mm:ss") if (header.rate_reset or "").isdigit() else "-"
         logger.info(
-            f"<\033[1;32m{soft.repo}\033[0m> done. "
-            f"({header.rate_remaining}/{header.rate_limit}, {arrow.get(int(header.rate_reset)).format('YYYY-MM-DD HH:mm:ss')})"
+            f"<\033[1;32m{soft.repo}\033[0m> done{'' if written else ' (unchanged)'}. "
+            f"({header.rate_remaining}/{header.rate_limit}, {reset})"
         )
@@ -83,7 +83,7 @@ class Parser(Base):
                             if "win-x64.exe" in v3["url"] or "linux-x64.tar.gz" in v3["url"]:
                                 vhlp.add_download_url(v3["url"])
 
-                logger.debug(f"Name: {soft.name}-{v['channel-version']}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+                self.debug_versions(f"{soft.name}-{v['channel-version']}", vhlp)
                 vlatest = vhlp.versions[0]
 
                 await self.write(soft, vhlp.summary, suffix=f"-{vlatest.major}.{vlatest.minor}")
@@ -1,12 +1,37 @@
 from asyncio import Semaphore
+from typing import List, Optional
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import DotNetFxSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_attrs, extract_texts, has_class
+
+
+def extract_versions(data_s: str) -> List[str]:
+    """提取 .NET Framework 下载页面支持版本表格中的版本号。"""
+    # lxml 不会像浏览器那样补全 tbody，两种表格结构都要匹配。
+    table = "//*[@id='supported-versions-table']/div/table"
+
+    return extract_texts(
+        data_s,
+        f"{table}/tbody/tr//td[1] | {table}/tr//td[1]",
+        "#supported-versions-table > div > table > tbody > tr td:nth-of-type(1)",
+    )
+
+
+def extract_download_link(data_s: str) -> Optional[str]:
+    """提取下载感谢页面中的离线安装包地址。"""
+    hrefs = extract_attrs(
+        data_s,
+        f"/html/body/div[{has_class('main-container')}]/div[{has_class('swim-container')}]/*[1][self::div]/div/p/a",
+        "body > div.main-container > div.swim-container > div:nth-child(1) > div > p > a",
+        "href",
+    )
+
+    return hrefs[0] if hrefs else None
 
 
 class Parser(Base):
@@ -18,11 +43,8 @@ class Parser(Base):
         async with sem:
             _, status, _, data_s = await self.request("GET", "https://dotnet.microsoft.com/en-us/download/dotnet-framework", is_json=False)
 
-            soup = BeautifulSoup(data_s, "html5lib")
-            elements = soup.select("#supported-versions-table > div > table > tbody > tr td:nth-of-type(1)")
-
-            for element in elements:
-                vhlp.append(element.text.strip())
+            for version in await self.run_parse(extract_versions, data_s):
+                vhlp.append(version)
 
             # Continue to crawling the offline package download URL.
             vlatest = vhlp.versions[0]
@@ -39,18 +61,13 @@ class Parser(Base):
                 )
 
                 if data_s:
-                    soup = BeautifulSoup(data_s, "html5lib")
-                    element = soup.select_one("body > div.main-container > div.swim-container > div:nth-child(1) > div > p > a")
-                    if element:
-                        href = element.attrs["href"]
-
+                    href = await self.run_parse(extract_download_link, data_s)
+                    if href is not None:
                         if href and "/fwlink/?linkid=" in href:
                             vhlp.add_download_url(href)
 
                         logger.debug(f".NET Framework {suffix} {vlatest.version}: {href}")
 
-        logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+        self.debug_versions(soft.name, vhlp)
 
-        if soft.split > 0:
-            logger.debug(f"Split Versions: {vhlp.split_versions}")
         await self.write(soft, vhlp.summary)
@@ -0,0 +1,79 @@
+import os
+from typing import Any, Callable, List, TypeVar
+
+import lxml.html
+from bs4 import BeautifulSoup
+from loguru import logger
+
+HTML_ENGINES = ("lxml", "html5lib")
+
+T = TypeVar("T")
+
+
+def get_html_engine() -> str:
+    """读取 HTML 解析引擎：lxml 优先使用 XPath 快速提取，html5lib 始终使用 BeautifulSoup 完整解析。"""
+    engine = os.environ.get("VERSION_CHECKER_HTML_ENGINE", "lxml").strip().lower()
+
+    if engine not in HTML_ENGINES:
+        logger.warning(f"Invalid VERSION_CHECKER_HTML_ENGINE value. Using default value: {HTML_ENGINES[0]}.")
+        return HTML_ENGINES[0]
+
+    return engine
+
+
+def has_class(name: str) -> str:
+    """生成匹配 class 属性中某个类名的 XPath 条件，等价于 CSS 的 `.name`。"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def lxml_document(data_s: str) -> lxml.html.HtmlElement:
+    # 统一按 UTF-8 字节解析，带 XML 编码声明的页面不会因为传入 str 而报错。
+    return lxml.html.document_fromstring(data_s.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+def html5lib_soup(data_s: str) -> BeautifulSoup:
+    return BeautifulSoup(data_s, "html5lib")
+
+
+def extract(data_s: str, fast: Callable[..., T], fallback: Callable[..., T], *args: Any) -> T:
+    """从 HTML 文本中提取数据。
+
+    默认用 lxml 解析，再由 `fast(doc, *args)` 通过 XPath 只读取需要的元素；lxml 解析失败、XPath 结构不匹配抛出异常或结果
+    为空时，改用 html5lib 完整解析并调用 `fallback(soup, *args)`（沿用原来的 CSS 选择器）。html5lib 按浏览器规则容错但比
+    lxml 慢一个数量级，只在快速路径失败时使用。
+    """
+    if get_html_engine() == "lxml":
+        try:
+            result = fast(lxml_document(data_s), *args)
+            if result:
+                return result
+        except Exception as e:
+            logger.debug(f"lxml extraction failed, falling back to html5lib: {type(e).__name__}: {e}")
+
+    return fallback(html5lib_soup(data_s), *args)
+
+
+def _xpath_texts(doc: lxml.html.HtmlElement, xpath: str) -> List[str]:
+    return [el.text_content().strip() for el in doc.xpath(xpath)]
+
+
+def _soup_texts(soup: BeautifulSoup, css: str) -> List[str]:
+    return [el.text.strip() for el in soup.select(css)]
+
+
+def _xpath_attrs(doc: lxml.html.HtmlElement, xpath: str, attr: str) -> List[str]:
+    return [el.get(attr) for el in doc.xpath(xpath) if el.get(attr) is not None]
+
+
+def _soup_attrs(soup: BeautifulSoup, css: str, attr: str) -> List[str]:
+    return [el.attrs[attr] for el in soup.select(css) if isinstance(el.attrs.get(attr), str)]
+
+
+def extract_texts(data_s: str, xpath: str, css: str) -> List[str]:
+    """提取匹配元素去掉首尾空白的文本；`xpath` 和 `css` 需要选中同一组元素。"""
+    return extract(data_s, lambda doc: _xpath_texts(doc, xpath), lambda soup: _soup_texts(soup, css))
+
+
+def extract_attrs(data_s: str, xpath: str, css: str, attr: str) -> List[str]:
+    """提取匹配元素的属性值，缺少该属性的元素会被忽略；`xpath` 和 `css` 需要选中同一组元素。"""
+    return extract(data_s, lambda doc: _xpath_attrs(doc, xpath, attr), lambda soup: _soup_attrs(soup, css, attr))
@@ -1,17 +1,40 @@
+import hashlib
+import json
 import os
 import re
 from asyncio import Semaphore
-from typing import List
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
 from app.core.config import GithubSoftware
+from app.core.github_graphql import GithubGraphQLBatcher
+from app.core.output import get_cache_dir
+from app.core.pagination import fetch_pages
 from app.core.version import VersionHelper
 
 from . import Base
 
 
+def _item_key(item: Dict[str, Any]) -> Optional[str]:
+    return item.get("tag_name") or item.get("name")
+
+
+def _trim_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留 `_collect` 用到的字段，避免把 Release 正文等大字段写入缓存。"""
+    trimmed = {k: item[k] for k in ("name", "tag_name", "draft", "prerelease") if k in item}
+
+    if isinstance(item.get("assets"), list):
+        trimmed["assets"] = [{"browser_download_url": v["browser_download_url"]} for v in item["assets"]]
+
+    return trimmed
+
+
 class Parser(Base):
+    # 由 inspect 在批量模式下注入；为空时逐条调用 REST API。
+    graphql: Optional[GithubGraphQLBatcher] = None
+
     def _check_assets_allowed(self, patterns: List[str], url: str):
         """检查 Release 附件文件名是否命中配置中的任一 assets_patterns。"""
         for pattern in patterns:
@@ -36,16 +59,91 @@ class Parser(Base):
 
             vhlp.add_download_url(url)
 
+    def _watermark_file(self, soft: GithubSoftware, api_by: str) -> Path:
+        digest = hashlib.sha256(f"{soft.repo}|{api_by}".encode("utf-8")).hexdigest()[:16]
+
+        return get_cache_dir(self.cfg.workdir).joinpath("github", f"{digest}.json")
+
+    def _load_watermark(self, file: Path) -> List[Dict[str, Any]]:
+        """读取上次抓取的列表；文件缺失或损坏时返回空列表，本轮按完整翻页处理。"""
+        if not file.is_file():
+            return []
+
+        try:
+            items = json.loads(file.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"GitHub watermark cache is invalid and will be rebuilt: {type(e).__name__}: {e}")
+            return []
+
+        return items if isinstance(items, list) else []
+
+    @staticmethod
+    def _merge_watermark(soft: GithubSoftware, fresh: List[Dict[str, Any]], known: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """用本轮抓到的条目覆盖上次结果，按原有翻页窗口（max_page * page_size）截断。"""
+        keys = {_item_key(v) for v in fresh}
+        merged = fresh + [v for v in known if _item_key(v) not in keys]
+
+        return merged[: soft.max_page * soft.page_size]
+
+    async def _fetch_rest(self, soft: GithubSoftware, api_by: str, headers: Dict[str, str]):
+        """通过 REST API 翻页读取，返回与单页响应相同形状的数据（latest 为对象，其余为列表）。"""
+        url = f"https://api.github.com/repos/{soft.repo}/{api_by}"
+
+        async def fetch(page: int):
+            params = None
+
+            if not soft.latest:
+                params = {"per_page": soft.page_size, "page": str(page)}
+
+            _, _, resp_headers, data = await self.request("GET", url, params=params, headers=headers, is_json=True)
+
+            return resp_headers, data
+
+        if soft.latest:
+            _, data_r = await fetch(1)
+            return data_r
+
+        watermark_file = self._watermark_file(soft, api_by) if soft.watermark else None
+        known = self._load_watermark(watermark_file) if watermark_file else []
+        known_keys = {_item_key(v) for v in known}
+
+        def is_known(page_data) -> bool:
+            return any(_item_key(v) in known_keys for v in page_data)
+
+        pages = await fetch_pages(fetch, soft.max_page, soft.page_size, is_known=is_known if known_keys else None)
+        data_r = [_trim_item(v) if watermark_file else v for page in pages for v in page]
+
+        if watermark_file:
+            logger.debug(f"[{soft.name}] GitHub pages fetched: {len(pages)}, known items: {len(known)}")
+            data_r = self._merge_watermark(soft, data_r, known)
+            watermark_file.parent.mkdir(parents=True, exist_ok=True)
+            watermark_file.write_text(json.dumps(data_r, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+        return data_r
+
+    def _collect(self, soft: GithubSoftware, vhlp: VersionHelper, data_r):
+        """把 REST 形状的单页数据追加到版本列表，GraphQL 批量结果也会先转换为同样结构。"""
+        if soft.latest:
+            if data_r["draft"] is False and data_r["prerelease"] is False:
+                if soft.assets:
+                    vhlp.append(data_r["tag_name"], raw_data={"tag_name": data_r["tag_name"], "assets": data_r["assets"]})
+                else:
+                    vhlp.append(data_r["tag_name"])
+        else:
+            for v in data_r:
+                if soft.release:
+                    if v["draft"] is False and v["prerelease"] is False:
+                        if soft.assets:
+                            vhlp.append(v["tag_name"], raw_data={"tag_name": v["tag_name"], "assets": v["assets"]})
+                        else:
+                            vhlp.append(v["tag_name"])
+                else:
+                    vhlp.append(v["name"])
+
     async def handle(self, sem: Semaphore, soft: GithubSoftware):
         """通过 GitHub Tags 或 Releases API 获取版本，并按配置过滤草稿和预发布版本。"""
         logger.debug(f"Name: {soft.name} ({soft.parser}, Release: {soft.release})")
 
-        # GitHub API 有限额，未过期的数据直接复用本地输出。
-        expired, last_update_time = self.is_expired(soft)
-        if not expired:
-            logger.info(f"[{soft.name}] SKIPPED: The last update time is: {last_update_time}, cache is still valid.")
-            return
-
         if soft.latest:
             soft.release = True
             soft.max_page = 1
@@ -70,36 +168,16 @@ class Parser(Base):
 
         vhlp = VersionHelper(pattern=soft.pattern, split=soft.split, download_urls=soft.download_urls, filter_expr=soft.filter)
 
-        gns = soft.repo
-
-        async with sem:
-            for page in range(0, soft.max_page):
-                params = None
-
-                if not soft.latest:
-                    params = {"per_page": soft.page_size, "page": str(page + 1)}
-
-                url, http_status_code, _, data_r = await self.request(
-                    "GET", f"https://api.github.com/repos/{gns}/{api_by}", params=params, headers=headers, is_json=True
-                )
+        data_r = None
+        if self.graphql is not None and self.graphql.supports(soft):
+            # 批量模式下在信号量外排队，由批处理器统一占用并发槽位发起查询。
+            data_r = await self.graphql.fetch(soft)
 
-                if soft.latest:
-                    if data_r["draft"] is False and data_r["prerelease"] is False:
-                        if soft.assets:
-                            vhlp.append(data_r["tag_name"], raw_data={"tag_name": data_r["tag_name"], "assets": data_r["assets"]})
-                        else:
-                            vhlp.append(data_r["tag_name"])
+        if data_r is None:
+            async with sem:
+                data_r = await self._fetch_rest(soft, api_by, headers)
 
-                else:
-                    for v in data_r:
-                        if soft.release:
-                            if v["draft"] is False and v["prerelease"] is False:
-                                if soft.assets:
-                                    vhlp.append(v["tag_name"], raw_data={"tag_name": v["tag_name"], "assets": v["assets"]})
-                                else:
-                                    vhlp.append(v["tag_name"])
-                        else:
-                            vhlp.append(v["name"])
+        self._collect(soft, vhlp, data_r)
 
         if vhlp.is_empty:
             logger.warning(f"[{soft.name}] versions is empty.")
@@ -107,9 +185,6 @@ class Parser(Base):
 
         self._append_latest_assets(soft, vhlp)
 
-        logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
-
-        if soft.split > 0:
-            logger.debug(f"Split Versions: {vhlp.split_versions}")
+        self.debug_versions(soft.name, vhlp)
 
         await self.write(soft, vhlp.summary)
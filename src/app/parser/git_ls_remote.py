@@ -33,10 +33,7 @@ class Parser(Base):
                 if v is not None:
                     vhlp.append(v)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
-
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
+            self.debug_versions(soft.name, vhlp)
 
             await self.write(soft, vhlp.summary)
 
@@ -1,8 +1,7 @@
 from asyncio import Semaphore
-from typing import List
 
 from loguru import logger
-from pydantic import BaseModel, TypeAdapter
+from pydantic import BaseModel
 
 from app.core.config import GoSoftware
 from app.core.version import VersionHelper
@@ -10,20 +9,9 @@ from app.core.version import VersionHelper
 from . import Base
 
 
-class File(BaseModel):
-    filename: str
-    os: str
-    arch: str
-    version: str
-    sha256: str
-    size: int
-    kind: str
-
-
 class DataItem(BaseModel):
     version: str
     stable: bool
-    files: List[File]
 
 
 class Parser(Base):
@@ -31,20 +19,16 @@ class Parser(Base):
         logger.debug(f"Name: {soft.name} ({soft.parser})")
 
         async with sem:
-            _, status, _, data_r = await self.request("GET", "https://go.dev/dl/?mode=json&include=all", is_json=True)
-
-            ta = TypeAdapter(List[DataItem])
-            data = ta.validate_python(data_r)
-
             vhlp = VersionHelper(pattern=soft.pattern, split=soft.split, download_urls=soft.download_urls)
 
-            for v in data:
+            # 完整列表有数 MB，其中大部分是各平台的文件清单；流式解码并只保留版本号和稳定标记。
+            async for item in self.iter_json_array("https://go.dev/dl/?mode=json&include=all", fields=("version", "stable")):
+                v = DataItem.model_validate(item)
+
                 # 仅支持 Stable 版本号 ...
                 if v.stable:
                     vhlp.append(v.version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
@@ -1,13 +1,19 @@
 import asyncio
 from asyncio import Semaphore
+from typing import List
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import HAProxySoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_texts
+
+
+def extract_tags(data_s: str) -> List[str]:
+    """提取 gitweb 标签列表页面中的标签名称。"""
+    return extract_texts(data_s, "//pre/a", "pre > a")
 
 
 class Parser(Base):
@@ -26,22 +32,20 @@ class Parser(Base):
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        pages = []
+
         for url, http_status, _, data_s in results:
             if http_status != 200:
                 logger.warning(f"HTTP status {http_status} | URL: {url}")
                 continue
 
-            # Analyzing HTML text data.
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            elements = soup.select("pre > a")
+            pages.append(data_s)
 
-            # noinspection DuplicatedCode
-            for el in elements:
-                vhlp.append(el.text.strip())
+        # Analyzing HTML text data.
+        for tags in await asyncio.gather(*(self.run_parse(extract_tags, data_s) for data_s in pages)):
+            for tag in tags:
+                vhlp.append(tag)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+        self.debug_versions(soft.name, vhlp)
 
-        if soft.split > 0:
-            logger.debug(f"Split Versions: {vhlp.split_versions}")
         await self.write(soft, vhlp.summary)
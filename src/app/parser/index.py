@@ -1,13 +1,21 @@
 from asyncio import Semaphore
 from pathlib import Path
+from typing import List
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import IndexSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_attrs
+
+
+def extract_links(data_s: str) -> List[str]:
+    """提取目录索引页面中链接指向的文件名。"""
+    hrefs = extract_attrs(data_s, "//pre/a[@href] | //td/a[@href]", "pre > a[href], td > a[href]", "href")
+
+    return [Path(href).name for href in hrefs]
 
 
 class Parser(Base):
@@ -19,15 +27,9 @@ class Parser(Base):
         async with sem:
             _, status, _, data_s = await self.request("GET", soft.url, is_json=False)
 
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            link_elements = soup.select("pre > a[href], td > a[href]")
-
-            for v in link_elements:
-                vhlp.append(Path(v.attrs["href"]).name)
+            for v in await self.run_parse(extract_links, data_s):
+                vhlp.append(v)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
@@ -2,7 +2,6 @@ import os.path
 from asyncio import Semaphore
 from typing import List, Optional
 
-from loguru import logger
 from pydantic import BaseModel, Field
 
 from app.core.config import JetbrainsPluginSoftware
@@ -83,5 +82,5 @@ class Parser(Base):
                     f"https://downloads.marketplace.jetbrains.com/files/{last_raw_data.file}#{last_raw_data.plugin_id}-{os.path.basename(last_raw_data.file)}"
                 )
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
             await self.write(soft, version_summary=vhlp.summary, storage_dir="jetbrains/plugins", jbp_extra=additional)
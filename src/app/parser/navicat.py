@@ -1,12 +1,18 @@
 from asyncio import Semaphore
+from typing import List
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import NavicatSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_texts, has_class
+
+
+def extract_versions(data_s: str) -> List[str]:
+    """提取发行说明页面中的版本标题。"""
+    return extract_texts(data_s, f"//div[{has_class('note-title')}]/b", "div.note-title > b")
 
 
 class Parser(Base):
@@ -24,16 +30,9 @@ class Parser(Base):
             )
 
             # Analyzing HTML text data.
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            elements = soup.select("div.note-title > b")
-
-            # noinspection DuplicatedCode
-            for el in elements:
-                vhlp.append(el.text.strip())
+            for version in await self.run_parse(extract_versions, data_s):
+                vhlp.append(version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
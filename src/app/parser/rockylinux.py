@@ -1,13 +1,52 @@
 from asyncio import Semaphore
+from typing import List
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 from loguru import logger
+from lxml.html import HtmlElement
 
 from app.core.config import RockyLinuxSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract, has_class
+
+
+def _versions_lxml(doc: HtmlElement) -> List[str]:
+    versions = []
+    table = f"//*[{has_class('tabbed-block')}]/table"
+
+    for tr in doc.xpath(f"{table}/tbody/tr | {table}/tr"):
+        ver_s = tr.xpath("*[1][self::td]")[0].text_content()
+        release_date_s = tr.xpath("*[3][self::td]")[0].text_content()
+
+        if len(release_date_s.strip()) > 0:
+            versions.append(str(ver_s))
+
+    return versions
+
+
+def _versions_soup(soup: BeautifulSoup) -> List[str]:
+    versions = []
+
+    # RockyLinux 8/9
+    el_table_rows = soup.select(".tabbed-block > table > tbody > tr")
+
+    for el_row in el_table_rows:
+        if isinstance(el_row, Tag):
+            ver_s = el_row.select_one("td:nth-child(1)").text
+            release_date_s = el_row.select_one("td:nth-child(3)").text
+
+            if len(release_date_s.strip()) > 0:
+                versions.append(ver_s)
+
+    return versions
+
+
+def extract_versions(data_s: str) -> List[str]:
+    """提取版本说明页面表格中已发布（填写了发布日期）的版本号。"""
+    return extract(data_s, _versions_lxml, _versions_soup)
 
 
 class Parser(Base):
@@ -21,21 +60,9 @@ class Parser(Base):
             _, status, _, data_s = await self.request("GET", "https://wiki.rockylinux.org/rocky/version/", is_json=False)
 
             # Analyzing HTML text data.
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            # RockyLinux 8/9
-            el_table_rows = soup.select(".tabbed-block > table > tbody > tr")
-
-            for el_row in el_table_rows:
-                if isinstance(el_row, Tag):
-                    ver_s = el_row.select_one("td:nth-child(1)").text
-                    release_date_s = el_row.select_one("td:nth-child(3)").text
-
-                    if len(release_date_s.strip()) > 0:
-                        vhlp.append(ver_s)
+            for version in await self.run_parse(extract_versions, data_s):
+                vhlp.append(version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
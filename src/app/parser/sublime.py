@@ -1,12 +1,17 @@
 from asyncio import Semaphore
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import SublimeSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_texts, has_class
+
+
+def extract_version(data_s: str) -> str:
+    """提取下载页面中的最新版本文本。"""
+    return extract_texts(data_s, f"//div[{has_class('downloads')}]/p[{has_class('latest')}]", "div.downloads > p.latest")[0]
 
 
 class Parser(Base):
@@ -18,13 +23,8 @@ class Parser(Base):
         async with sem:
             _, status, _, data_s = await self.request("GET", "https://www.sublimetext.com/download", is_json=False)
 
-            soup = BeautifulSoup(data_s, "html5lib")
-            element = soup.select_one("div.downloads > p.latest")
-
-            vhlp.append(element.text.strip())
+            vhlp.append(await self.run_parse(extract_version, data_s))
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
@@ -1,14 +1,20 @@
 import re
 from asyncio import Semaphore
+from typing import List
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import VirtualBoxSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_attrs
+
+
+def extract_hrefs(data_s: str) -> List[str]:
+    """提取目录索引页面中的链接地址。"""
+    return extract_attrs(data_s, "//pre/a[@href]", "pre > a[href]", "href")
 
 
 class Parser(Base):
@@ -20,14 +26,10 @@ class Parser(Base):
         async with sem:
             _, status, _, data_s = await self.request("GET", "https://download.virtualbox.org/virtualbox/", is_json=False)
 
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            link_elements = soup.select("pre > a[href]")
-
             exp_ver = re.compile(r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))$", flags=re.I)
 
-            for v in link_elements:
-                m = exp_ver.match(v.attrs["href"].rstrip("/"))
+            for href in await self.run_parse(extract_hrefs, data_s):
+                m = exp_ver.match(href.rstrip("/"))
 
                 if m:
                     version = m.group("version")
@@ -57,19 +59,10 @@ class Parser(Base):
                 "GET", f"https://download.virtualbox.org/virtualbox/{latest_version.version}/", is_json=False
             )
 
-            soup = BeautifulSoup(data_s, "html5lib")
-
-            link_elements = soup.select("pre > a[href]")
-
-            for v in link_elements:
-                href = v.attrs["href"]
-
-                if isinstance(href, str):
-                    if href.endswith(".exe") or href.endswith(".zip") or href.endswith(".vbox-extpack"):
-                        vhlp.add_download_url(urljoin(url.__str__(), href))
+            for href in await self.run_parse(extract_hrefs, data_s):
+                if href.endswith(".exe") or href.endswith(".zip") or href.endswith(".vbox-extpack"):
+                    vhlp.add_download_url(urljoin(url.__str__(), href))
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
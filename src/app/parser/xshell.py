@@ -1,13 +1,23 @@
 import json
 from asyncio import Semaphore
+from typing import List
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from app.core.config import XShellSoftware
 from app.core.version import VersionHelper
 
 from . import Base
+from .extract import extract_texts, has_class
+
+
+def extract_versions(data_s: str) -> List[str]:
+    """提取更新历史接口返回的 HTML 片段中的版本标题。"""
+    data_r = json.loads(data_s)
+
+    content = data_r["message"]
+
+    return extract_texts(content, f"//dt[{has_class('h4')}]", "dt.h4")
 
 
 class Parser(Base):
@@ -28,19 +38,9 @@ class Parser(Base):
                 is_json=False,
             )
 
-            data_r = json.loads(data_s)
-
-            content = data_r["message"]
-
-            soup = BeautifulSoup(content, "html5lib")
-            elements = soup.select("dt.h4")
-
-            # noinspection DuplicatedCode
-            for element in elements:
-                vhlp.append(element.text.strip())
+            for version in await self.run_parse(extract_versions, data_s):
+                vhlp.append(version)
 
-            logger.debug(f"Name: {soft.name}, Versions: {vhlp.versions}, Summary: {vhlp.summary}")
+            self.debug_versions(soft.name, vhlp)
 
-            if soft.split > 0:
-                logger.debug(f"Split Versions: {vhlp.split_versions}")
             await self.write(soft, vhlp.summary)
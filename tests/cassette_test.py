@@ -0,0 +1,122 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from app.commands.bench import run_bench
+from app.core.cassette import Cassette, CassetteMiss, parse_latency
+from app.core.config import AppSetting, AppSettingBase, Configuration, IndexSoftware
+from app.core.http import AsyncHttpClient
+from app.core.profiling import CpuTimer
+
+INDEX_URL = "https://downloads.example/demo/"
+INDEX_HTML = '<html><body><pre><a href="demo-1.0.0.tar.gz">demo-1.0.0.tar.gz</a>\n<a href="demo-1.1.0.tar.gz">x</a></pre></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, url, status, body, headers=None):
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self.body = body
+
+    async def text(self, errors="strict"):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = 0
+
+    def request(self, **kwargs):
+        self.calls += 1
+        return self.responses[kwargs["url"]]
+
+
+class CassetteTestCase(unittest.TestCase):
+    def test_parse_latency(self):
+        self.assertIsNone(parse_latency("recorded"))
+        self.assertEqual(0.25, parse_latency("250"))
+
+        with self.assertRaises(ValueError):
+            parse_latency("-1")
+
+    def test_record_then_replay_without_network(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "run.json.zst")
+            session = FakeSession(
+                {
+                    INDEX_URL: FakeResponse(INDEX_URL, 200, INDEX_HTML, {"ETag": '"v1"'}),
+                    "https://api.example/limited": FakeResponse("https://api.example/limited", 429, "slow down"),
+                }
+            )
+
+            recorder = Cassette.load(path, "record")
+            client = AsyncHttpClient(session=session, cassette=recorder)
+            asyncio.run(client.request("GET", INDEX_URL, params={"b": "2", "a": "1"}))
+            asyncio.run(client.request("GET", "https://api.example/limited", raise_for_status=False))
+            recorder.save()
+
+            player = Cassette.load(path, "replay", latency=0)
+            client = AsyncHttpClient(cassette=player)
+            url, status, headers, body = asyncio.run(client.request("GET", INDEX_URL, params={"a": "1", "b": "2"}))
+
+            with self.assertRaises(CassetteMiss):
+                asyncio.run(client.request("GET", "https://api.example/limited", raise_for_status=False))
+
+        self.assertEqual((1, 2), (recorder.recorded, session.calls))
+        self.assertEqual((INDEX_URL, 200, '"v1"', INDEX_HTML), (str(url), status, headers["ETag"], body))
+        self.assertEqual((1, 1), (player.hits, player.misses))
+
+    def test_replay_requires_existing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            Cassette.load(Path(tempfile.gettempdir(), "missing-cassette.json.zst"), "replay")
+
+    def test_cpu_timer_counts_only_running_time(self):
+        async def work():
+            await asyncio.sleep(0.05)
+            return sum(range(200_000))
+
+        timer = CpuTimer()
+
+        self.assertEqual(sum(range(200_000)), asyncio.run(timer.run(work())))
+        self.assertGreater(timer.seconds, 0)
+        self.assertLess(timer.seconds, 0.05)
+
+    def test_bench_replays_inspect_offline_in_temporary_workdir(self):
+        soft = IndexSoftware(
+            name="demo", parser="index", url=INDEX_URL, pattern=r"^demo-(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "run.json.zst")
+            recorder = Cassette.load(path, "record")
+            client = AsyncHttpClient(session=FakeSession({INDEX_URL: FakeResponse(INDEX_URL, 200, INDEX_HTML)}), cassette=recorder)
+            asyncio.run(client.request("GET", INDEX_URL))
+            recorder.save()
+
+            cfg = Configuration(workdir=tmp, settings=AppSetting(app=AppSettingBase(title="test"), softwares=[soft]))
+
+            with patch.dict(os.environ, {"VERSION_CHECKER_PARSE_EXECUTOR": "inline"}):
+                report = run_bench(cfg, path, 0, worker_num=2, max_connections=4)
+
+            self.assertFalse(Path(tmp, "data").exists())
+
+        self.assertEqual((1, 1, 0, 1, 0), (report.items, report.success, report.failed, report.requests, report.missing))
+        self.assertEqual(["index"], list(report.parsers))
+        self.assertGreater(report.wall_seconds, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import unittest
+
+from multidict import CIMultiDict
+
+from app.core.coalesce import RequestCoalescer, make_request_key
+from app.core.http import AsyncHttpClient
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.headers = CIMultiDict()
+        self.url = "https://example.com/releases"
+        self._body = body
+
+    async def json(self):
+        await asyncio.sleep(0)
+        return self._body
+
+    async def text(self):
+        return str(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, **kwargs):
+        self.calls.append((kwargs["method"], kwargs["url"], kwargs["params"]))
+        return FakeResponse({"n": len(self.calls)})
+
+
+class RequestCoalescerTestCase(unittest.TestCase):
+    def test_concurrent_and_repeated_gets_share_one_round_trip(self):
+        session = FakeSession()
+        coalescer = RequestCoalescer()
+        client = AsyncHttpClient(session=session, coalescer=coalescer)
+
+        async def run():
+            first = await asyncio.gather(
+                *(client.request("GET", "https://example.com/releases", {"code": "IIU"}, is_json=True) for _ in range(3))
+            )
+            later = await client.request("GET", "https://example.com/releases", {"code": "IIU"}, is_json=True)
+            other = await client.request("GET", "https://example.com/releases", {"code": "PCP"}, is_json=True)
+            return first, later, other
+
+        first, later, other = asyncio.run(run())
+
+        self.assertEqual(2, len(session.calls))
+        self.assertEqual([{"n": 1}] * 3, [v[3] for v in first])
+        self.assertIs(first[0][3], later[3])
+        self.assertEqual({"n": 2}, other[3])
+        self.assertEqual(2, coalescer.joined)
+        self.assertEqual(1, coalescer.reused)
+        self.assertEqual(3, coalescer.deduplicated)
+
+    def test_post_requests_are_not_coalesced(self):
+        session = FakeSession()
+        client = AsyncHttpClient(session=session, coalescer=RequestCoalescer())
+
+        async def run():
+            await client.request("POST", "https://example.com/graphql", data={"query": "{}"}, is_json=True)
+            await client.request("POST", "https://example.com/graphql", data={"query": "{}"}, is_json=True)
+
+        asyncio.run(run())
+
+        self.assertEqual(2, len(session.calls))
+
+    def test_failures_are_shared_but_not_cached(self):
+        coalescer = RequestCoalescer()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            if len(calls) == 1:
+                raise ValueError("HTTP request failed. (502)")
+            return "ok"
+
+        async def run():
+            first = await asyncio.gather(coalescer.run("k", fetch), coalescer.run("k", fetch), return_exceptions=True)
+            second = await coalescer.run("k", fetch)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(v, ValueError) for v in first))
+        self.assertEqual("ok", second)
+        self.assertEqual(2, len(calls))
+
+    def test_error_responses_are_not_reused(self):
+        statuses = [429, 429, 200]
+
+        class StatusSession(FakeSession):
+            def request(self, **kwargs):
+                response = super().request(**kwargs)
+                response.status = statuses[len(self.calls) - 1]
+                return response
+
+        session = StatusSession()
+        client = AsyncHttpClient(session=session, coalescer=RequestCoalescer())
+
+        async def run():
+            return [(await client.request("GET", "https://example.com/tags", is_json=True, raise_for_status=False))[1] for _ in range(4)]
+
+        self.assertEqual([429, 429, 200, 200], asyncio.run(run()))
+        self.assertEqual(3, len(session.calls))
+
+    def test_key_distinguishes_headers_and_decode_mode(self):
+        base = make_request_key("GET", "https://example.com", None, {"Accept": "a"}, True, True)
+
+        self.assertEqual(base, make_request_key("get", "https://example.com", {}, {"accept": "a"}, True, True))
+        self.assertNotEqual(base, make_request_key("GET", "https://example.com", None, {"Accept": "b"}, True, True))
+        self.assertNotEqual(base, make_request_key("GET", "https://example.com", None, {"Accept": "a"}, False, True))
@@ -1,4 +1,5 @@
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -6,6 +7,7 @@ from unittest.mock import patch
 
 from click.testing import CliRunner
 
+from app.commands.combine import MANIFEST_FILE, combine_data
 from app.commands.combine import cli as combine_cli
 from app.core.config import AppSetting, AppSettingBase, Configuration
 
@@ -77,3 +79,93 @@ class CombineCliTestCase(unittest.TestCase):
 
         self.assertEqual(0, result.exit_code)
         send_feishu_updates.assert_called_once_with([{"name": "demo", "latest": "1.0.0", "previous": "0.9.0"}])
+
+
+def write_item(data_dir: Path, name: str, latest: str, display_name: str = ""):
+    data_dir.joinpath(f"{name}.json").write_text(
+        json.dumps({"name": name, "display_name": display_name, "url": "https://example.com", "latest": latest, "versions": [latest]}),
+        encoding="utf-8",
+    )
+
+
+class CombineManifestTestCase(unittest.TestCase):
+    def test_incremental_combine_only_reports_changed_items(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp).joinpath("data")
+            data_dir.mkdir()
+            write_item(data_dir, "a", "1.0.0")
+            write_item(data_dir, "b", "2.0.0")
+            write_item(data_dir, "c", "3.0.0")
+            cfg = Configuration(workdir=tmp)
+
+            combine_data(cfg)
+            self.assertTrue(Path(tmp, ".cache", MANIFEST_FILE).is_file())
+
+            write_item(data_dir, "b", "2.1.0", display_name="B")
+            data_dir.joinpath("c.json").unlink()
+            write_item(data_dir, "d", "4.0.0")
+
+            with patch("app.commands.combine.json.loads", wraps=json.loads) as loads:
+                new_all_json, differences = combine_data(cfg)
+
+            all_json = json.loads(data_dir.joinpath("all.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(2, loads.call_count)
+        self.assertEqual([("B", "2.1.0", "2.0.0"), ("d", "4.0.0", "")], differences)
+        self.assertEqual(["a", "b", "d"], [v["name"] for v in new_all_json])
+        self.assertEqual(new_all_json, all_json)
+
+    def test_unchanged_data_does_not_rewrite_all_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp).joinpath("data")
+            data_dir.mkdir()
+            write_item(data_dir, "a", "1.0.0")
+            cfg = Configuration(workdir=tmp)
+
+            combine_data(cfg)
+            mtime_ns = data_dir.joinpath("all.json").stat().st_mtime_ns
+
+            # 内容不变只刷新时间戳时，通过内容哈希判定为未变化。
+            write_item(data_dir, "a", "1.0.0")
+            new_all_json, differences = combine_data(cfg)
+
+            self.assertEqual(mtime_ns, data_dir.joinpath("all.json").stat().st_mtime_ns)
+
+        self.assertEqual([], differences)
+        self.assertEqual(["a"], [v["name"] for v in new_all_json])
+
+    def test_fresh_checkout_timestamps_keep_the_incremental_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp).joinpath("data")
+            data_dir.mkdir()
+            write_item(data_dir, "a", "1.0.0")
+            write_item(data_dir, "b", "2.0.0")
+            cfg = Configuration(workdir=tmp)
+
+            combine_data(cfg)
+
+            # 重新检出后所有文件的修改时间都会变化，内容不变。
+            for file in data_dir.iterdir():
+                os.utime(file, ns=(1, 1))
+
+            write_item(data_dir, "b", "2.1.0")
+
+            with patch("app.commands.combine.json.loads", wraps=json.loads) as loads:
+                _, differences = combine_data(cfg)
+
+        self.assertEqual(1, loads.call_count)
+        self.assertEqual([("b", "2.1.0", "2.0.0")], differences)
+
+    def test_externally_modified_all_json_falls_back_to_full_combine(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp).joinpath("data")
+            data_dir.mkdir()
+            write_item(data_dir, "a", "1.0.0")
+            cfg = Configuration(workdir=tmp)
+
+            combine_data(cfg)
+            data_dir.joinpath("all.json").write_text(json.dumps([{"name": "a", "latest": "0.1.0"}]), encoding="utf-8")
+
+            _, differences = combine_data(cfg)
+
+        self.assertEqual([("a", "1.0.0", "0.1.0")], differences)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from app.core.config import AppSetting, DockerHubSoftware, GithubSoftware, load_app_setting
+
+CONFIG = """
+[app]
+title = "test"
+
+[[softwares]]
+name = "demo"
+repo = "owner/demo"
+pattern = "^v(?P<version>(?P<major>\\\\d+))$"
+
+[[softwares]]
+parser = "docker-hub"
+repo = "library/redis"
+pattern = "^(?P<version>(?P<major>\\\\d+))$"
+"""
+
+
+class AppSettingTestCase(unittest.TestCase):
+    def test_softwares_are_discriminated_by_parser_with_gh_default(self):
+        settings = AppSetting.model_validate(
+            {
+                "softwares": [
+                    {"name": "demo", "repo": "owner/demo"},
+                    {"parser": "docker-hub", "repo": "library/redis"},
+                ]
+            }
+        )
+
+        self.assertIsInstance(settings.softwares[0], GithubSoftware)
+        self.assertIsInstance(settings.softwares[1], DockerHubSoftware)
+        self.assertEqual("library/redis", settings.softwares[1].name)
+
+    def test_unknown_parser_reports_tag_error(self):
+        with self.assertRaisesRegex(ValidationError, "union_tag_invalid"):
+            AppSetting.model_validate({"softwares": [{"name": "demo", "parser": "missing"}]})
+
+    def test_load_app_setting_reuses_snapshot_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {}, clear=True):
+            config_file = Path(tmp).joinpath("version-checker.toml")
+            cache_dir = Path(tmp).joinpath(".cache")
+            config_file.write_text(CONFIG, encoding="utf-8")
+
+            first = load_app_setting(config_file, cache_dir)
+
+            with patch("app.core.config.AppSetting.model_validate") as model_validate:
+                second = load_app_setting(config_file, cache_dir)
+
+            model_validate.assert_not_called()
+
+            config_file.write_text(CONFIG.replace('title = "test"', 'title = "changed"'), encoding="utf-8")
+            third = load_app_setting(config_file, cache_dir)
+
+        self.assertEqual(first, second)
+        self.assertEqual(["demo", "library/redis"], [v.name for v in second.softwares])
+        self.assertEqual("changed", third.app.title)
+
+    def test_load_app_setting_snapshot_is_json_and_round_trips_the_real_config(self):
+        config_file = Path(__file__).parents[1].joinpath("version-checker.toml")
+
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {}, clear=True):
+            cache_dir = Path(tmp).joinpath(".cache")
+            first = load_app_setting(config_file, cache_dir)
+            second = load_app_setting(config_file, cache_dir)
+            snapshots = [x.name for x in cache_dir.joinpath("config").iterdir()]
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(snapshots))
+        self.assertTrue(snapshots[0].endswith(".json"))
+
+    def test_load_app_setting_ignores_corrupt_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = Path(tmp).joinpath("version-checker.toml")
+            cache_dir = Path(tmp).joinpath(".cache")
+            config_file.write_text(CONFIG, encoding="utf-8")
+
+            load_app_setting(config_file, cache_dir)
+            for snapshot in cache_dir.joinpath("config").glob("*.json"):
+                snapshot.write_bytes(b"broken")
+
+            settings = load_app_setting(config_file, cache_dir)
+
+        self.assertEqual("test", settings.app.title)
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from app.core.executor import ParseExecutor, create_parse_executor, get_parse_executor_mode
+from app.parser.index import extract_links
+
+INDEX_HTML = """
+<html><body><pre>
+<a href="../">../</a>
+<a href="demo-1.0.0.tar.gz">demo-1.0.0.tar.gz</a>
+<a href="/pub/demo-1.1.0.tar.gz">demo-1.1.0.tar.gz</a>
+</pre></body></html>
+"""
+
+
+class ParseExecutorTestCase(unittest.TestCase):
+    def test_mode_falls_back_to_process_for_invalid_value(self):
+        with patch.dict(os.environ, {"VERSION_CHECKER_PARSE_EXECUTOR": "fiber"}):
+            self.assertEqual("process", get_parse_executor_mode())
+
+        with patch.dict(os.environ, {"VERSION_CHECKER_PARSE_EXECUTOR": " Thread ", "VERSION_CHECKER_PARSE_WORKERS": "3"}):
+            executor = create_parse_executor()
+
+        self.assertEqual(("thread", 3), (executor.mode, executor.max_workers))
+
+    def test_inline_mode_runs_on_event_loop_thread(self):
+        executor = ParseExecutor("inline")
+
+        self.assertEqual(threading.get_ident(), asyncio.run(executor.run(threading.get_ident)))
+        self.assertEqual((0, 1), (executor.submitted, executor.inline))
+
+    def test_thread_mode_runs_in_worker_thread(self):
+        executor = ParseExecutor("thread", max_workers=2)
+        self.addCleanup(executor.shutdown)
+
+        self.assertNotEqual(threading.get_ident(), asyncio.run(executor.run(threading.get_ident)))
+        self.assertEqual(1, executor.submitted)
+
+    def test_process_mode_runs_module_level_parse_function(self):
+        executor = ParseExecutor("process", max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        async def run():
+            return await asyncio.gather(executor.run(extract_links, INDEX_HTML), executor.run(os.getpid))
+
+        links, pid = asyncio.run(run())
+
+        self.assertEqual(["..", "demo-1.0.0.tar.gz", "demo-1.1.0.tar.gz"], links)
+        self.assertNotEqual(os.getpid(), pid)
+
+        executor.shutdown()
+        self.assertIsNone(executor._pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from app.core.utils import safe_strtobool
+from app.parser import almalinux, apache_flume, dotnetfx, haproxy, index, navicat, rockylinux, sublime, virtualbox, xshell
+from app.parser.extract import extract, extract_texts, get_html_engine
+
+
+def apache_index(count):
+    rows = "\n".join(
+        f'<a href="demo-{i // 100}.{i % 100}.0.tar.gz">demo-{i // 100}.{i % 100}.0.tar.gz</a>  01-Jan-2026 00:00  1M' for i in range(count)
+    )
+    return f"<html><head><title>Index of /demo</title></head><body><h1>Index of /demo</h1><hr><pre>\n{rows}\n</pre><hr></body></html>"
+
+
+def almalinux_wiki(rows_per_release):
+    sections = []
+
+    for os_ver in (10, 9, 8):
+        rows = "".join(
+            f'<tr><td><a href="/release-notes/{os_ver}.{i}.html">{os_ver}.{i}</a></td><td>x86_64</td><td>Yes</td>'
+            f"<td>{'2026-01-01' if i else ''}</td></tr>"
+            for i in range(rows_per_release)
+        )
+        sections.append(
+            f'<h2 id="almalinux-os-{os_ver}">AlmaLinux OS {os_ver}</h2><p>Notes</p>'
+            f"<table><thead><tr><th>Version</th><th>Arch</th><th>Stable</th><th>Date</th></tr></thead>{rows}</table>"
+        )
+
+    return f"<html><body><nav>{'<a href=#>menu</a>' * 200}</nav><main>{''.join(sections)}</main></body></html>"
+
+
+def dotnetfx_page(rows):
+    trs = "".join(f"<tr><td>.NET Framework 4.{i}.{i % 3}</td><td>Supported</td><td>Windows</td></tr>" for i in range(rows))
+    body = f"<div class='card'>{'<p>text</p>' * 50}</div>" * 40
+
+    return f'<html><body>{body}<div id="supported-versions-table"><div><table>{trs}</table></div></div></body></html>'
+
+
+class ExtractTestCase(unittest.TestCase):
+    def both_engines(self, func, *args):
+        results = []
+
+        for engine in ("lxml", "html5lib"):
+            with patch.dict(os.environ, {"VERSION_CHECKER_HTML_ENGINE": engine}):
+                results.append(func(*args))
+
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_engine_falls_back_to_lxml_for_invalid_value(self):
+        with patch.dict(os.environ, {"VERSION_CHECKER_HTML_ENGINE": "regex"}):
+            self.assertEqual("lxml", get_html_engine())
+
+    def test_parsers_extract_same_values_with_both_engines(self):
+        self.assertEqual(["demo-0.0.0.tar.gz", "demo-0.1.0.tar.gz"], self.both_engines(index.extract_links, apache_index(2)))
+        self.assertEqual(["demo-0.0.0.tar.gz"], self.both_engines(virtualbox.extract_hrefs, apache_index(1)))
+        self.assertEqual(["demo-0.0.0.tar.gz"], self.both_engines(haproxy.extract_tags, apache_index(1)))
+        self.assertEqual(["9.1", "9.2", "8.1", "8.2"], self.both_engines(almalinux.extract_versions, almalinux_wiki(3), (9, 8)))
+        self.assertEqual([".NET Framework 4.0.0", ".NET Framework 4.1.1"], self.both_engines(dotnetfx.extract_versions, dotnetfx_page(2)))
+
+        self.assertEqual(
+            ["1.12.0", "1.11.0"],
+            self.both_engines(
+                apache_flume.extract_versions,
+                '<section id="releases"><h1>Releases</h1><p>Current</p><p><a href="1.12.0.html">1.12.0</a></p><p></p><p></p>'
+                '<div><ul><li><a href="1.11.0.html">1.11.0</a></li></ul></div></section>',
+            ),
+        )
+        self.assertEqual(
+            "https://go.microsoft.com/fwlink/?linkid=1",
+            self.both_engines(
+                dotnetfx.extract_download_link,
+                '<html><body><div class="main-container"><div class="swim-container"><div><div><p>'
+                '<a href="https://go.microsoft.com/fwlink/?linkid=1">Download</a></p></div></div></div></div></body></html>',
+            ),
+        )
+        self.assertEqual(
+            ["8.10 ", "9.6"],
+            self.both_engines(
+                rockylinux.extract_versions,
+                '<div class="tabbed-block"><table><tbody><tr><td>8.10 </td><td>x</td><td>2024-05-30</td></tr>'
+                "<tr><td>9.6</td><td>x</td><td>2025-06-04</td></tr><tr><td>10.1</td><td>x</td><td> </td></tr></tbody></table></div>",
+            ),
+        )
+        self.assertEqual(["17.2.1"], self.both_engines(navicat.extract_versions, '<div class="note-title x"><b> 17.2.1 </b></div>'))
+        self.assertEqual(
+            "Build 4200", self.both_engines(sublime.extract_version, '<div class="downloads"><p class="latest">Build 4200</p></div>')
+        )
+        self.assertEqual(
+            ["Xshell 8"], self.both_engines(xshell.extract_versions, '{"message": "<dl><dt class=\\"h4\\">Xshell 8</dt></dl>"}')
+        )
+
+    def test_extract_falls_back_to_html5lib_when_fast_path_fails(self):
+        def broken(_doc):
+            raise IndexError("list index out of range")
+
+        self.assertEqual(["ok"], extract("<p>ok</p>", broken, lambda soup: [p.text for p in soup.select("p")]))
+        self.assertEqual(["ok"], extract("<p>ok</p>", lambda _doc: [], lambda soup: [p.text for p in soup.select("p")]))
+        self.assertEqual([], extract_texts("", "//p", "p"))
+
+    def test_large_pages_extract_same_values_with_both_engines(self):
+        # 真实页面不随仓库分发，这里用结构相同的合成页面：Apache 目录索引、AlmaLinux 发行说明和 .NET Framework 下载页。
+        self.assertEqual(300, len(self.both_engines(index.extract_links, apache_index(300))))
+        self.assertEqual(57, len(self.both_engines(almalinux.extract_versions, almalinux_wiki(20), (10, 9, 8))))
+        self.assertEqual(40, len(self.both_engines(dotnetfx.extract_versions, dotnetfx_page(40))))
+
+
+@unittest.skipUnless(safe_strtobool(os.environ.get("VERSION_CHECKER_BENCHMARKS", "false"), default=False), "benchmarks are opt-in")
+class ExtractBenchmarkTestCase(unittest.TestCase):
+    """引擎耗时对比，受机器负载和覆盖率统计影响，不放在默认测试中；设置 `VERSION_CHECKER_BENCHMARKS=true` 后运行。"""
+
+    def test_lxml_engine_is_faster_than_html5lib(self):
+        pages = [
+            (index.extract_links, (apache_index(3000),)),
+            (almalinux.extract_versions, (almalinux_wiki(100), (10, 9, 8))),
+            (dotnetfx.extract_versions, (dotnetfx_page(200),)),
+        ]
+        elapsed = {}
+
+        for engine in ("lxml", "html5lib"):
+            with patch.dict(os.environ, {"VERSION_CHECKER_HTML_ENGINE": engine}):
+                started = time.perf_counter()
+                for func, args in pages:
+                    func(*args)
+                elapsed[engine] = time.perf_counter() - started
+
+        self.assertLess(elapsed["lxml"] * 3, elapsed["html5lib"], elapsed)
+
+
+if __name__ == "__main__":
+    unittest.main()
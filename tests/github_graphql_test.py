@@ -0,0 +1,224 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import GithubSoftware
+from app.core.github_graphql import (
+    GithubGraphQLBatcher,
+    GithubGraphQLSettings,
+    build_repository_field,
+    get_graphql_settings,
+    to_rest_payload,
+)
+from app.parser.gh import Parser as GithubParser
+
+PATTERN = r"^v(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))$"
+
+
+class FakeHttpClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.queries = []
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=15, is_json=False, raise_for_status=True):
+        self.queries.append(data["query"])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return url, 200, {}, response
+
+
+class GithubGraphQLTestCase(unittest.TestCase):
+    def test_settings_read_env_values(self):
+        env = {
+            "VERSION_CHECKER_GH_GRAPHQL": "false",
+            "VERSION_CHECKER_GH_GRAPHQL_BATCH_SIZE": "10",
+            "VERSION_CHECKER_GH_GRAPHQL_COST_BUDGET": "bad",
+            "VERSION_CHECKER_GH_GRAPHQL_FALLBACK": "no",
+        }
+
+        with patch.dict(os.environ, env, clear=True):
+            settings = get_graphql_settings()
+
+        self.assertFalse(settings.enabled)
+        self.assertEqual(10, settings.batch_size)
+        self.assertEqual(20, settings.cost_budget)
+        self.assertFalse(settings.fallback)
+
+    def test_repository_field_selects_tags_releases_and_latest(self):
+        tags = GithubSoftware(name="a", repo="o/a", pattern=PATTERN)
+        releases = GithubSoftware(name="b", repo="o/b", pattern=PATTERN, release=True, assets=True)
+        latest = GithubSoftware(name="c", repo="o/c", pattern=PATTERN, latest=True)
+
+        self.assertIn('r0: repository(owner: "o", name: "a")', build_repository_field("r0", tags))
+        self.assertIn('refs(refPrefix: "refs/tags/", first: 100', build_repository_field("r0", tags))
+        self.assertIn("orderBy: {field: TAG_COMMIT_DATE, direction: DESC}", build_repository_field("r0", tags))
+        self.assertIn("releaseAssets(first: 100)", build_repository_field("r1", releases))
+        self.assertIn("latestRelease", build_repository_field("r2", latest))
+
+    def test_rest_payload_matches_release_api_shape(self):
+        soft = GithubSoftware(name="demo", repo="o/demo", pattern=PATTERN, release=True, assets=True)
+        repository = {
+            "releases": {
+                "nodes": [
+                    {
+                        "tagName": "v1.0.0",
+                        "isDraft": False,
+                        "isPrerelease": False,
+                        "releaseAssets": {"nodes": [{"downloadUrl": "https://example.com/a.zip"}]},
+                    }
+                ]
+            }
+        }
+
+        self.assertEqual(
+            [
+                {
+                    "tag_name": "v1.0.0",
+                    "draft": False,
+                    "prerelease": False,
+                    "assets": [{"browser_download_url": "https://example.com/a.zip"}],
+                }
+            ],
+            to_rest_payload(soft, repository),
+        )
+
+    def test_batcher_merges_items_into_one_query(self):
+        httpc = FakeHttpClient(
+            [
+                {
+                    "data": {
+                        "r0": {"refs": {"nodes": [{"name": "v1.0.0"}]}},
+                        "r1": {"refs": {"nodes": [{"name": "v2.0.0"}]}},
+                        "rateLimit": {"cost": 1, "remaining": 4999},
+                    }
+                }
+            ]
+        )
+        batcher = GithubGraphQLBatcher(httpc, "token", settings=GithubGraphQLSettings())
+        softs = [GithubSoftware(name=name, repo=f"o/{name}", pattern=PATTERN) for name in ("a", "b")]
+
+        async def run():
+            return await asyncio.gather(*(batcher.fetch(soft) for soft in softs))
+
+        results = asyncio.run(run())
+
+        self.assertEqual([[{"name": "v1.0.0"}], [{"name": "v2.0.0"}]], results)
+        self.assertEqual(1, len(httpc.queries))
+        self.assertEqual(4999, batcher.rate_remaining)
+
+    def test_batcher_splits_queries_by_batch_size_and_cost_budget(self):
+        batcher = GithubGraphQLBatcher(FakeHttpClient([]), "token", settings=GithubGraphQLSettings(batch_size=2, cost_budget=2))
+        softs = [GithubSoftware(name=f"s{i}", repo=f"o/s{i}", pattern=PATTERN) for i in range(3)]
+        assets = GithubSoftware(name="assets", repo="o/assets", pattern=PATTERN, release=True, assets=True)
+
+        self.assertEqual([2, 1], [len(chunk) for chunk in batcher._chunks([(soft, None) for soft in softs])])
+        self.assertEqual([1, 1], [len(chunk) for chunk in batcher._chunks([(assets, None), (assets, None)])])
+
+    def test_batcher_falls_back_to_rest_on_failure_and_missing_repository(self):
+        httpc = FakeHttpClient(
+            [
+                {
+                    "data": {"r0": None, "r1": {"refs": {"nodes": []}}},
+                    "errors": [{"type": "NOT_FOUND", "path": ["r0"], "message": "Could not resolve to a Repository"}],
+                },
+                ValueError("HTTP request failed. (502)"),
+            ]
+        )
+        batcher = GithubGraphQLBatcher(httpc, "token", settings=GithubGraphQLSettings())
+        softs = [GithubSoftware(name=name, repo=f"o/{name}", pattern=PATTERN) for name in ("missing", "empty")]
+
+        async def run():
+            first = await asyncio.gather(*(batcher.fetch(soft) for soft in softs))
+            second = await batcher.fetch(softs[1])
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual([None, []], first)
+        self.assertIsNone(second)
+
+    def test_batcher_falls_back_to_rest_on_malformed_repository_node(self):
+        httpc = FakeHttpClient(
+            [
+                {
+                    "data": {"r0": {"refs": {"nodes": [{"tagName": "v1.0.0"}]}}, "r1": {"refs": {"nodes": [{"name": "v2.0.0"}]}}},
+                    "errors": ["unexpected error entry"],
+                }
+            ]
+        )
+        batcher = GithubGraphQLBatcher(httpc, "token", settings=GithubGraphQLSettings())
+        softs = [GithubSoftware(name=name, repo=f"o/{name}", pattern=PATTERN) for name in ("malformed", "ok")]
+
+        async def run():
+            return await asyncio.wait_for(asyncio.gather(*(batcher.fetch(soft) for soft in softs)), 5)
+
+        self.assertEqual([None, [{"name": "v2.0.0"}]], asyncio.run(run()))
+
+    def test_batcher_resolves_pending_items_when_the_batch_is_cancelled(self):
+        class HangingHttpClient:
+            def __init__(self):
+                self.started = asyncio.Event()
+
+            async def request(self, *_args, **_kwargs):
+                self.started.set()
+                await asyncio.sleep(3600)
+
+        async def run():
+            httpc = HangingHttpClient()
+            batcher = GithubGraphQLBatcher(httpc, "token", settings=GithubGraphQLSettings())
+            fetch = asyncio.create_task(batcher.fetch(GithubSoftware(name="demo", repo="o/demo", pattern=PATTERN)))
+            await httpc.started.wait()
+
+            for task in list(batcher._tasks):
+                task.cancel()
+
+            return await asyncio.wait_for(fetch, 5)
+
+        self.assertIsNone(asyncio.run(run()))
+
+    def test_batcher_raises_when_fallback_disabled(self):
+        batcher = GithubGraphQLBatcher(FakeHttpClient([ValueError("boom")]), "token", settings=GithubGraphQLSettings(fallback=False))
+        soft = GithubSoftware(name="demo", repo="o/demo", pattern=PATTERN)
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            asyncio.run(batcher.fetch(soft))
+
+
+class GithubParserGraphQLTestCase(unittest.TestCase):
+    def test_parser_uses_batch_result_without_rest_request(self):
+        parser = GithubParser.__new__(GithubParser)
+        parser.is_expired = lambda _soft: (True, "2000-01-01 00:00:00")
+        parser.graphql = GithubGraphQLBatcher(FakeHttpClient([]), "token", settings=GithubGraphQLSettings())
+        parser.graphql.fetch = AsyncMock(return_value=[{"name": "v1.0.0"}, {"name": "v1.2.0"}])
+        parser.request = AsyncMock()
+        parser.write = AsyncMock()
+        soft = GithubSoftware(name="demo", repo="owner/demo", pattern=PATTERN)
+
+        asyncio.run(parser.handle(asyncio.Semaphore(1), soft))
+
+        summary = parser.write.await_args.args[1]
+        self.assertEqual(["1.2.0", "1.0.0"], [v.version for v in summary.versions])
+        parser.request.assert_not_awaited()
+
+    def test_parser_uses_rest_when_batch_falls_back(self):
+        parser = GithubParser.__new__(GithubParser)
+        parser.is_expired = lambda _soft: (True, "2000-01-01 00:00:00")
+        parser.graphql = GithubGraphQLBatcher(FakeHttpClient([]), "token", settings=GithubGraphQLSettings())
+        parser.graphql.fetch = AsyncMock(return_value=None)
+        parser.request = AsyncMock(return_value=("https://api.github.com/repos/owner/demo/tags", 200, {}, [{"name": "v3.0.0"}]))
+        parser.write = AsyncMock()
+        soft = GithubSoftware(name="demo", repo="owner/demo", pattern=PATTERN)
+
+        asyncio.run(parser.handle(asyncio.Semaphore(1), soft))
+
+        summary = parser.write.await_args.args[1]
+        self.assertEqual("3.0.0", summary.latest.version)
+        parser.request.assert_awaited_once()
+
+    def test_parser_skips_batch_for_multi_page_items(self):
+        batcher = GithubGraphQLBatcher(FakeHttpClient([]), "token", settings=GithubGraphQLSettings())
+
+        self.assertFalse(batcher.supports(GithubSoftware(name="demo", repo="o/demo", pattern=PATTERN, max_page=2)))
+        self.assertTrue(batcher.supports(GithubSoftware(name="demo", repo="o/demo", pattern=PATTERN, max_page=5, page_size=5)))
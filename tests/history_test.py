@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import arrow
+
+from app.commands.combine import combine_data
+from app.commands.inspect import process
+from app.core.check_index import CheckIndex
+from app.core.config import AppSetting, Configuration, GithubSoftware
+from app.core.history import HISTORY_FILE, ReleaseEstimator, ReleaseEvent, append_history, diff_releases, load_history, plan_budget
+from app.core.inspect_result import InspectItemResult, InspectStatus
+from app.parser import Base as BaseParser
+
+DAY = 86400
+
+
+def days_ago(days: float, now: float) -> str:
+    return arrow.get(now - days * DAY).to("local").format("YYYY-MM-DD HH:mm:ss")
+
+
+def write_item(data_dir: Path, name: str, latest: str, created_time: str = "2026-01-01 00:00:00"):
+    data_dir.joinpath(f"{name}.json").write_text(
+        json.dumps({"name": name, "url": "https://example.com", "latest": latest, "versions": [latest], "created_time": created_time}),
+        encoding="utf-8",
+    )
+
+
+class ReleaseHistoryTestCase(unittest.TestCase):
+    def test_diff_releases_records_changes_and_first_observations(self):
+        events = diff_releases(
+            [
+                {"name": "a", "latest": "1.1", "created_time": "2026-02-01 00:00:00"},
+                {"name": "b", "latest": "2.0", "created_time": "2026-02-01 00:00:00"},
+                {"name": "c", "latest": "3.0"},
+            ],
+            [{"name": "a", "latest": "1.0"}, {"name": "b", "latest": "2.0"}],
+        )
+
+        self.assertEqual([("a", "1.1", "1.0"), ("c", "3.0", None)], [(x.name, x.latest, x.previous) for x in events])
+        self.assertEqual("2026-02-01 00:00:00", events[0].observed)
+
+    def test_history_is_append_only_and_skips_broken_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            append_history(Path(tmp), [ReleaseEvent(name="a", latest="1.0", observed="2026-01-01 00:00:00")])
+
+            with open(Path(tmp, HISTORY_FILE), "a", encoding="utf-8") as f:
+                f.write('{"name": "broken"\n')
+
+            append_history(Path(tmp), [ReleaseEvent(name="a", latest="1.1", previous="1.0", observed="2026-01-02 00:00:00")])
+
+            self.assertEqual(["1.0", "1.1"], [x.latest for x in load_history(Path(tmp))])
+
+    def test_combine_appends_release_history(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp, "data")
+            data_dir.mkdir()
+            write_item(data_dir, "a", "1.0.0")
+            write_item(data_dir, "b", "2.0.0")
+            cfg = Configuration(workdir=tmp)
+
+            combine_data(cfg)
+            write_item(data_dir, "b", "2.1.0", created_time="2026-01-02 00:00:00")
+            combine_data(cfg)
+            combine_data(cfg)
+
+            events = load_history(data_dir)
+
+        self.assertEqual(
+            [("a", "1.0.0", None), ("b", "2.0.0", None), ("b", "2.1.0", "2.0.0")], [(x.name, x.latest, x.previous) for x in events]
+        )
+        self.assertEqual("2026-01-02 00:00:00", events[-1].observed)
+
+
+class ReleaseEstimatorTestCase(unittest.TestCase):
+    def test_frequent_items_have_higher_probability(self):
+        now = arrow.get("2026-06-01T00:00:00").timestamp()
+        events = [ReleaseEvent(name=x, latest="0", observed=days_ago(100, now)) for x in ("hot", "cold")]
+        events += [ReleaseEvent(name="hot", latest=str(i), previous="0", observed=days_ago(i * 10, now)) for i in range(1, 10)]
+
+        estimator = ReleaseEstimator(events, now=now)
+
+        self.assertGreater(estimator.rate("hot"), estimator.rate("cold"))
+        self.assertAlmostEqual(estimator.global_rate, estimator.rate("unknown"))
+        self.assertGreater(estimator.probability("cold", 30), estimator.probability("cold", 1))
+        self.assertEqual(1.0, estimator.probability("cold", None))
+        self.assertEqual(0.0, estimator.probability("hot", 0))
+
+    def test_plan_budget_orders_by_value_per_request(self):
+        probabilities = {"a": 0.9, "b": 0.5, "c": 0.4, "d": 0.1}
+        costs = {"a": 4.0, "b": 1.0, "c": 1.0, "d": 1.0}
+
+        self.assertEqual((["b", "c", "a", "d"], []), plan_budget(list(probabilities), probabilities, costs, None))
+        self.assertEqual((["b", "c", "d"], ["a"]), plan_budget(list(probabilities), probabilities, costs, 3))
+
+
+class InspectBudgetTestCase(unittest.TestCase):
+    def test_process_checks_likely_items_first_and_skips_over_budget(self):
+        now = arrow.now().timestamp()
+        pattern = r"^(?P<version>(?P<major>\d+))$"
+        cfg = Configuration(
+            settings=AppSetting(softwares=[GithubSoftware(name=x, repo=f"owner/{x}", pattern=pattern) for x in ("dormant", "hot", "new")])
+        )
+        calls = []
+
+        class FakeParser(BaseParser):
+            def __init__(self, _cfg):
+                self.cfg = _cfg
+
+            async def wrap_handle(self, _sem, soft):
+                calls.append(soft.name)
+                return InspectItemResult.success(soft.name)
+
+            async def handle(self, _sem, _soft):
+                raise NotImplementedError
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp, "data")
+            cfg.workdir = tmp
+            events = [ReleaseEvent(name=x, latest="0", observed=days_ago(200, now)) for x in ("dormant", "hot")]
+            events += [ReleaseEvent(name="hot", latest=str(i), previous="0", observed=days_ago(i, now)) for i in range(1, 20)]
+            append_history(data_dir, events)
+
+            check_index = CheckIndex(data_dir, Path(tmp, ".cache"))
+            check_index.mark_checked("dormant", days_ago(1, now))
+            check_index.mark_checked("hot", days_ago(1, now))
+            check_index.save()
+
+            env = {"VERSION_CHECKER_REPORT_DIR": str(Path(tmp, "reports")), "VERSION_CHECKER_CACHE_DIR": str(Path(tmp, ".cache"))}
+
+            with patch.dict(os.environ, env), patch("app.commands.inspect.load_parser_class", return_value=FakeParser):
+                result = asyncio.run(process(cfg, worker_num=1, budget=2))
+
+        self.assertEqual(["new", "hot"], calls)
+        self.assertEqual(["dormant"], [x.name for x in result.items if x.status == InspectStatus.SKIPPED])
+        self.assertIn("Skipped by request budget.", result.skipped[0].message)
+
+
+if __name__ == "__main__":
+    unittest.main()
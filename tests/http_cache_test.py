@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from multidict import CIMultiDict
+
+from app.core.http import AsyncHttpClient
+from app.core.http_cache import ValidatorCache, create_validator_cache
+
+
+class FakeResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.url = "https://example.com/index.json"
+        self._body = body
+
+    async def json(self):
+        import json
+
+        return json.loads(self._body)
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def request(self, **kwargs):
+        self.sent_headers.append(kwargs["headers"])
+        return self.responses.pop(0)
+
+
+class ValidatorCacheTestCase(unittest.TestCase):
+    def test_key_depends_on_params_and_auth_scope(self):
+        base = ValidatorCache.make_key("GET", "https://example.com", {"a": "1"})
+
+        self.assertEqual(base, ValidatorCache.make_key("get", "https://example.com", {"a": "1"}))
+        self.assertNotEqual(base, ValidatorCache.make_key("GET", "https://example.com", {"a": "2"}))
+        self.assertNotEqual(base, ValidatorCache.make_key("GET", "https://example.com", {"a": "1"}, {"Authorization": "Bearer x"}))
+
+    def test_client_returns_cached_body_on_not_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ValidatorCache(Path(tmp))
+            session = FakeSession(
+                [
+                    FakeResponse(200, {"ETag": '"v1"'}, '[{"version": "1.0.0"}]'),
+                    FakeResponse(304, {"ETag": '"v1"'}, ""),
+                ]
+            )
+            client = AsyncHttpClient(session=session, cache=cache)
+
+            _, _, _, first = asyncio.run(client.request("GET", "https://example.com/index.json", is_json=True))
+            _, status, _, second = asyncio.run(client.request("GET", "https://example.com/index.json", is_json=True))
+
+        self.assertNotIn("If-None-Match", session.sent_headers[0])
+        self.assertEqual('"v1"', session.sent_headers[1]["If-None-Match"])
+        self.assertEqual(200, status)
+        self.assertEqual(first, second)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_responses_without_validators_are_not_stored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ValidatorCache(Path(tmp))
+            client = AsyncHttpClient(session=FakeSession([FakeResponse(200, {}, "plain")]), cache=cache)
+
+            asyncio.run(client.request("GET", "https://example.com/page"))
+
+        self.assertEqual({}, cache.index.entries)
+
+    def test_save_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ValidatorCache(Path(tmp), max_bytes=10)
+            cache.store("old", {"ETag": "a"}, "123456", is_json=False)
+            cache.store("new", {"Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"}, "abcdef", is_json=False)
+            cache.index.entries["old"].accessed = 1
+
+            cache.save()
+            reloaded = ValidatorCache.load(Path(tmp), max_bytes=10)
+
+            self.assertEqual(["new"], list(reloaded.index.entries))
+            self.assertEqual({"If-Modified-Since": "Mon, 01 Jan 2026 00:00:00 GMT"}, reloaded.conditional_headers("new"))
+            self.assertFalse(Path(tmp).joinpath("old.body").exists())
+            self.assertEqual(1, cache.evictions)
+
+    def test_cache_can_be_disabled_by_env(self):
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {"VERSION_CHECKER_HTTP_CACHE": "false"}, clear=True):
+            self.assertIsNone(create_validator_cache(Path(tmp)))
@@ -1,18 +1,31 @@
 import asyncio
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
+import arrow
 import click
 from click.testing import CliRunner
 
 from app.commands.inspect import cli as inspect_cli
-from app.commands.inspect import process
-from app.core.config import AppSetting, AppSettingBase, Configuration, GithubSoftware
+from app.commands.inspect import has_due_items, process
+from app.core.config import AppSetting, AppSettingBase, Configuration, DockerHubSoftware, GithubSoftware
 from app.core.inspect_result import InspectItemResult, InspectResult
 from app.parser import Base as BaseParser
 
 
 class InspectProcessTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.report_dir = tmp.name
+
+        env = patch.dict(os.environ, {"VERSION_CHECKER_REPORT_DIR": tmp.name})
+        env.start()
+        self.addCleanup(env.stop)
+
     def test_process_keeps_running_after_item_failure(self):
         cfg = Configuration()
         cfg.settings = AppSetting(
@@ -81,8 +94,37 @@ class InspectProcessTestCase(unittest.TestCase):
         self.assertEqual("RuntimeError", result.failed[0].error_type)
         self.assertEqual("missing parser", result.failed[0].message)
 
+    def test_process_gives_each_parser_its_own_worker_slots(self):
+        cfg = Configuration()
+        cfg.settings = AppSetting(
+            softwares=[
+                GithubSoftware(name="a", repo="owner/a", pattern=r"^(?P<version>(?P<major>\d+))$"),
+                GithubSoftware(name="b", repo="owner/b", pattern=r"^(?P<version>(?P<major>\d+))$"),
+                DockerHubSoftware(parser="docker-hub", name="c", repo="library/c", pattern=r"^(?P<version>(?P<major>\d+))$"),
+            ]
+        )
+
+        sems = {}
+
+        class FakeParser(BaseParser):
+            def __init__(self, _cfg):
+                self.cfg = _cfg
+
+            async def wrap_handle(self, sem, soft):
+                sems[soft.name] = sem
+                return InspectItemResult.success(soft.name)
+
+            async def handle(self, _sem, _soft):
+                raise NotImplementedError
+
+        with patch("app.commands.inspect.load_parser_class", return_value=FakeParser):
+            asyncio.run(process(cfg, worker_num=1))
+
+        self.assertIs(sems["a"], sems["b"])
+        self.assertIsNot(sems["a"], sems["c"])
+
     def test_cli_default_mode_allows_partial_failure(self):
-        async def fake_process(_cfg, _worker_num, _filter_name=None):
+        async def fake_process(_cfg, _worker_num, _filter_name=None, _max_connections=None, **_kwargs):
             return InspectResult(items=[InspectItemResult.failed("bad", "RuntimeError", "boom")])
 
         @click.command("combine")
@@ -101,7 +143,7 @@ class InspectProcessTestCase(unittest.TestCase):
         self.assertEqual(0, result.exit_code)
 
     def test_cli_strict_mode_fails_on_partial_failure(self):
-        async def fake_process(_cfg, _worker_num, _filter_name=None):
+        async def fake_process(_cfg, _worker_num, _filter_name=None, _max_connections=None, **_kwargs):
             return InspectResult(items=[InspectItemResult.failed("bad", "RuntimeError", "boom")])
 
         @click.command("combine")
@@ -121,7 +163,7 @@ class InspectProcessTestCase(unittest.TestCase):
         self.assertIn("Inspect completed with failed item(s).", result.output)
 
     def test_cli_ignores_rate_limit_failure_when_not_debug(self):
-        async def fake_process(_cfg, _worker_num, _filter_name=None):
+        async def fake_process(_cfg, _worker_num, _filter_name=None, _max_connections=None, **_kwargs):
             return InspectResult(items=[InspectItemResult.success("ok")])
 
         async def fake_rate_limit():
@@ -143,8 +185,39 @@ class InspectProcessTestCase(unittest.TestCase):
 
         self.assertEqual(0, result.exit_code)
 
+    def test_cli_skips_rate_limit_query_when_nothing_is_due(self):
+        async def fake_process(_cfg, _worker_num, _filter_name=None, _max_connections=None, **_kwargs):
+            return InspectResult(items=[InspectItemResult.skipped("fresh", "Cache is still valid.")])
+
+        @click.command("combine")
+        def fake_combine(notify=False):
+            pass
+
+        soft = GithubSoftware(name="fresh", repo="owner/fresh", pattern=r"^(?P<version>(?P<major>\d+))$", cache_ttl=24)
+        runner = CliRunner()
+
+        with runner.isolated_filesystem() as tmp:
+            cfg = Configuration(workdir=tmp, debug=False, settings=AppSetting(app=AppSettingBase(title="test"), softwares=[soft]))
+            os.makedirs("data")
+
+            with open("data/fresh.json", "w", encoding="utf-8") as f:
+                f.write(json.dumps({"name": "fresh", "created_time": arrow.now().format("YYYY-MM-DD HH:mm:ss")}))
+
+            with (
+                patch.dict(os.environ, {"OUTPUT_DATA_DIR": "data", "VERSION_CHECKER_CACHE_DIR": ".cache"}),
+                patch("app.commands.inspect.process", side_effect=fake_process),
+                patch("app.commands.inspect.GithubHelper.show_rate_limit") as show_rate_limit,
+                patch("app.commands.inspect.cli_combine", fake_combine),
+            ):
+                fresh = runner.invoke(inspect_cli, [], obj=cfg)
+                due = has_due_items(cfg.model_copy(update={"settings": AppSetting(softwares=[soft.model_copy(update={"cache_ttl": 0})])}))
+
+        self.assertEqual(0, fresh.exit_code, fresh.output)
+        show_rate_limit.assert_not_called()
+        self.assertTrue(due)
+
     def test_cli_passes_notify_to_combine(self):
-        async def fake_process(_cfg, _worker_num, _filter_name=None):
+        async def fake_process(_cfg, _worker_num, _filter_name=None, _max_connections=None, **_kwargs):
             return InspectResult(items=[InspectItemResult.success("ok")])
 
         calls = []
@@ -173,3 +246,12 @@ class InspectProcessTestCase(unittest.TestCase):
 
         self.assertNotEqual(0, result.exit_code)
         self.assertIn("Invalid value for '--worker'", result.output)
+
+    def test_cli_rejects_zero_max_connections(self):
+        cfg = Configuration(debug=True, settings=AppSetting(app=AppSettingBase(title="test")))
+        runner = CliRunner()
+
+        result = runner.invoke(inspect_cli, ["--max-connections", "0"], obj=cfg)
+
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("Invalid value for '--max-connections'", result.output)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from multidict import CIMultiDict
+
+from app.core.http import AsyncHttpClient
+from app.core.http_cache import ValidatorCache
+from app.core.json_stream import JsonArrayDecoder
+from app.core.metrics import ItemMetrics, current_metrics
+
+
+def decode_in_chunks(payload: bytes, size: int, fields=None):
+    decoder = JsonArrayDecoder(fields)
+    items = []
+
+    for i in range(0, len(payload), size):
+        items.extend(decoder.feed(payload[i : i + size]))
+
+    items.extend(decoder.close())
+
+    return items
+
+
+class FakeContent:
+    def __init__(self, chunks, arrived):
+        self.chunks = chunks
+        self.arrived = arrived
+
+    async def iter_chunked(self, _size):
+        for chunk in self.chunks:
+            self.arrived.append(chunk)
+            yield chunk
+
+
+class FakeResponse:
+    def __init__(self, status, headers, chunks, arrived):
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.url = "https://example.com/index.json"
+        self.content = FakeContent(chunks, arrived)
+
+    async def text(self):
+        return b"".join(self.content.chunks).decode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def request(self, **kwargs):
+        self.sent_headers.append(kwargs["headers"])
+        return self.responses.pop(0)
+
+
+class JsonArrayDecoderTestCase(unittest.TestCase):
+    def test_any_chunking_gives_the_same_elements(self):
+        data = [{"version": "go1.24.4", "stable": True, "files": [{"name": '测试 "x" \\ ]}'}]}, -12.5e3, "a,b]", None, [1, [2]], 7]
+        payload = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+
+        for size in (1, 2, 3, 7, 64, len(payload)):
+            self.assertEqual(data, decode_in_chunks(payload, size), size)
+
+    def test_fields_keep_only_selected_keys(self):
+        payload = b'[{"version": "go1", "stable": true, "files": [1, 2]}, {"version": "go2"}]'
+
+        self.assertEqual([{"version": "go1", "stable": True}, {"version": "go2"}], decode_in_chunks(payload, 5, ("version", "stable")))
+
+    def test_elements_are_returned_as_soon_as_they_are_complete(self):
+        decoder = JsonArrayDecoder()
+
+        self.assertEqual([{"a": 1}], decoder.feed(b'[{"a": 1}, {"b"'))
+        self.assertEqual([], decoder.feed(b": "))
+        self.assertEqual([{"b": 2}], decoder.feed(b"2}, 1"))
+        self.assertEqual([12], decoder.feed(b"2]"))
+        self.assertEqual(3, decoder.count)
+
+    def test_rejects_invalid_or_truncated_payloads(self):
+        for payload in (b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1], 2", b"[1, }]"):
+            with self.assertRaises(ValueError, msg=payload):
+                decode_in_chunks(payload, 2)
+
+
+class StreamingClientTestCase(unittest.TestCase):
+    def test_client_yields_elements_before_the_body_is_complete(self):
+        arrived = []
+        chunks = [b'[{"version": "1", "files": []},', b' {"version": "2", "files": []}]']
+        client = AsyncHttpClient(session=FakeSession([FakeResponse(200, {}, chunks, arrived)]))
+        metrics = ItemMetrics()
+
+        async def run():
+            current_metrics.set(metrics)
+            items = []
+
+            async for item in client.iter_json_array("https://example.com/index.json", fields=["version"]):
+                items.append((item, len(arrived)))
+
+            return items
+
+        self.assertEqual([({"version": "1"}, 1), ({"version": "2"}, 2)], asyncio.run(run()))
+        self.assertEqual((1, sum(len(x) for x in chunks)), (metrics.requests, metrics.bytes_downloaded))
+
+    def test_not_modified_replays_the_cached_body(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ValidatorCache(Path(tmp))
+            session = FakeSession(
+                [
+                    FakeResponse(200, {"ETag": '"v1"'}, [b'[{"version": "1"}, ', b'{"version": "2"}]'], []),
+                    FakeResponse(304, {"ETag": '"v1"'}, [], []),
+                ]
+            )
+            client = AsyncHttpClient(session=session, cache=cache)
+
+            async def collect():
+                return [x async for x in client.iter_json_array("https://example.com/index.json")]
+
+            first = asyncio.run(collect())
+            second = asyncio.run(collect())
+            plain_key = cache.make_key("GET", "https://example.com/index.json", None, session.sent_headers[0])
+
+        self.assertEqual('"v1"', session.sent_headers[1]["If-None-Match"])
+        self.assertEqual([{"version": "1"}, {"version": "2"}], first)
+        self.assertEqual(first, second)
+        self.assertEqual(1, cache.hits)
+        self.assertNotIn(plain_key, cache.index.entries)
+
+    def test_http_errors_are_raised(self):
+        client = AsyncHttpClient(session=FakeSession([FakeResponse(500, {}, [b"oops"], [])]))
+
+        async def collect():
+            return [x async for x in client.iter_json_array("https://example.com/index.json")]
+
+        with self.assertRaisesRegex(ValueError, "HTTP request failed"):
+            asyncio.run(collect())
+
+
+if __name__ == "__main__":
+    unittest.main()
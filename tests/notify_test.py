@@ -50,7 +50,7 @@ class NotifyTestCase(unittest.TestCase):
         )
 
     def test_send_feishu_updates_returns_false_when_secret_missing(self):
-        with patch.dict(os.environ, {}, clear=True), patch("app.core.notify.requests.post") as post:
+        with patch.dict(os.environ, {}, clear=True), patch("requests.post") as post:
             self.assertFalse(send_feishu_updates([{"name": "demo", "previous": "0.9.0", "latest": "1.0.0"}]))
 
         post.assert_not_called()
@@ -67,7 +67,7 @@ class NotifyTestCase(unittest.TestCase):
         with (
             patch.dict(os.environ, env, clear=True),
             patch("app.core.notify.time.time", return_value=1599360473),
-            patch("app.core.notify.requests.post", return_value=FakeResponse()) as post,
+            patch("requests.post", return_value=FakeResponse()) as post,
         ):
             ok = send_feishu_updates([{"name": "demo", "previous": "0.9.0", "latest": "1.0.0"}])
 
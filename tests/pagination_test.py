@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from app.core.pagination import fetch_pages, link_last_page, parse_link_header
+
+PAGE_URL = "https://api.github.com/repos/o/r/tags?per_page=2&page={}"
+LINK = f'<{PAGE_URL}>; rel="next", <{PAGE_URL}>; rel="last"'
+FIRST_LINK = f'<{PAGE_URL.format(1)}>; rel="first"'
+
+
+class FakePages:
+    def __init__(self, pages, last=None, link=True):
+        self.pages = pages
+        self.last = last if last is not None else len(pages)
+        self.link = link
+        self.requested = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, page):
+        self.requested.append(page)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+
+        headers = {}
+        if self.link:
+            headers["Link"] = LINK.format(page + 1, self.last) if page < self.last else FIRST_LINK
+
+        return headers, self.pages[page - 1] if page <= len(self.pages) else []
+
+
+class PaginationTestCase(unittest.TestCase):
+    def test_parse_link_header_reads_last_page(self):
+        links = parse_link_header(LINK.format(2, 7))
+
+        self.assertEqual({"next", "last"}, set(links))
+        self.assertEqual(7, link_last_page(links))
+        self.assertIsNone(link_last_page(parse_link_header(None)))
+
+    def test_remaining_pages_are_fetched_concurrently_up_to_max_page(self):
+        fetch = FakePages([[1, 2], [3, 4], [5, 6], [7, 8], [9, 10]])
+
+        pages = asyncio.run(fetch_pages(fetch, max_page=4, page_size=2))
+
+        self.assertEqual([[1, 2], [3, 4], [5, 6], [7, 8]], pages)
+        self.assertEqual([1, 2, 3, 4], sorted(fetch.requested))
+        self.assertEqual(3, fetch.max_active)
+
+    def test_short_first_page_stops_without_more_requests(self):
+        fetch = FakePages([[1]])
+
+        pages = asyncio.run(fetch_pages(fetch, max_page=5, page_size=2))
+
+        self.assertEqual([[1]], pages)
+        self.assertEqual([1], fetch.requested)
+
+    def test_link_without_next_stops_pagination(self):
+        fetch = FakePages([[1, 2], [3, 4]], last=1)
+
+        self.assertEqual([[1, 2]], asyncio.run(fetch_pages(fetch, max_page=5, page_size=2)))
+        self.assertEqual([1], fetch.requested)
+
+    def test_missing_link_header_reads_sequentially_until_short_page(self):
+        fetch = FakePages([[1, 2], [3, 4], [5]], link=False)
+
+        pages = asyncio.run(fetch_pages(fetch, max_page=5, page_size=2))
+
+        self.assertEqual([[1, 2], [3, 4], [5]], pages)
+        self.assertEqual([1, 2, 3], fetch.requested)
+        self.assertEqual(1, fetch.max_active)
+
+    def test_known_item_stops_pagination(self):
+        fetch = FakePages([[9, 8], [7, 6], [5, 4], [3, 2]])
+
+        pages = asyncio.run(fetch_pages(fetch, max_page=4, page_size=2, is_known=lambda page: 6 in page))
+
+        self.assertEqual([[9, 8], [7, 6]], pages)
+        self.assertEqual([1, 2], fetch.requested)
@@ -1,11 +1,17 @@
 import asyncio
+import io
 import json
 import os
+import sys
 import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
-from app.core.config import Configuration, GithubSoftware
+from loguru import logger
+
+from app.core.check_index import CHECK_INDEX_FILE, CheckIndex
+from app.core.config import AppSetting, Configuration, DockerHubSoftware, GithubSoftware
 from app.core.version import VersionHelper
 from app.parser import Base, check_requirements
 from app.parser.gh import Parser
@@ -154,6 +160,128 @@ class ParserTestCase(unittest.TestCase):
         self.assertFalse(split_is_expired)
         self.assertEqual(created_time, split_last_update)
 
+    def test_base_write_skips_unchanged_payload_and_records_check_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            parser = self._fake_parser(workdir=tmp)
+            output_dir = os.path.join(tmp, "data")
+            parser.check_index = CheckIndex.load(Path(output_dir), Path(tmp, ".cache"))
+            soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))$")
+            helper = VersionHelper(pattern=soft.pattern)
+            helper.append("1.0")
+
+            with patch("app.parser.arrow.now") as now:
+                now.return_value.format.return_value = "2026-01-01 00:00:00"
+                asyncio.run(parser.write(soft, helper.summary))
+                now.return_value.format.return_value = "2026-01-02 00:00:00"
+                asyncio.run(parser.write(soft, helper.summary))
+
+            first = json.loads(open(os.path.join(output_dir, "demo.json"), encoding="utf-8").read())
+            checked = parser.check_index.get("demo.json").checked
+
+            helper.append("1.1")
+            with patch("app.parser.arrow.now") as now:
+                now.return_value.format.return_value = "2026-01-03 00:00:00"
+                asyncio.run(parser.write(soft, helper.summary))
+
+            second = json.loads(open(os.path.join(output_dir, "demo.json"), encoding="utf-8").read())
+            parser.check_index.save()
+            reloaded = CheckIndex.load(Path(output_dir), Path(tmp, ".cache"))
+            committed = sorted(os.listdir(output_dir))
+
+        self.assertEqual("2026-01-01 00:00:00", first["created_time"])
+        self.assertEqual("2026-01-02 00:00:00", checked)
+        self.assertEqual("2026-01-03 00:00:00", second["created_time"])
+        self.assertEqual("1.1", second["latest"])
+        self.assertEqual("2026-01-03 00:00:00", reloaded.get("demo.json").checked)
+        self.assertEqual(["demo.json"], committed)
+        self.assertEqual(2, parser.check_index.written)
+        self.assertEqual(1, parser.check_index.unchanged)
+
+    def test_base_write_rewrites_output_edited_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            parser = self._fake_parser(workdir=tmp)
+            parser.check_index = CheckIndex.load(Path(tmp, "data"), Path(tmp, ".cache"))
+            soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))$")
+            helper = VersionHelper(pattern=soft.pattern)
+            helper.append("1.0")
+            file = Path(tmp, "data", "demo.json")
+
+            asyncio.run(parser.write(soft, helper.summary))
+            file.write_text(file.read_text(encoding="utf-8").replace('"1.0"', '"0.9.1"'), encoding="utf-8")
+            asyncio.run(parser.write(soft, helper.summary))
+
+            latest = json.loads(file.read_text(encoding="utf-8"))["latest"]
+
+        self.assertEqual("1.0", latest)
+        self.assertEqual(2, parser.check_index.written)
+
+    def test_base_write_always_mode_rewrites_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            parser = self._fake_parser(workdir=tmp)
+            parser.check_index = CheckIndex.load(Path(tmp, "data"), Path(tmp, ".cache"), mode="always")
+            soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))$")
+            helper = VersionHelper(pattern=soft.pattern)
+            helper.append("1.0")
+
+            asyncio.run(parser.write(soft, helper.summary))
+            asyncio.run(parser.write(soft, helper.summary))
+
+        self.assertEqual(2, parser.check_index.written)
+
+    def test_base_is_expired_prefers_check_index_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "data")
+            os.makedirs(output_dir)
+            with open(os.path.join(output_dir, "demo.json"), "w", encoding="utf-8") as f:
+                json.dump({"created_time": "2000-01-01 00:00:00"}, f)
+            os.makedirs(os.path.join(tmp, ".cache"))
+            with open(os.path.join(tmp, ".cache", CHECK_INDEX_FILE), "w", encoding="utf-8") as f:
+                json.dump({"entries": {"demo.json": {"checked": "2999-01-01 00:00:00", "sha256": "x"}}}, f)
+
+            parser = self._fake_parser(workdir=tmp)
+            parser.check_index = CheckIndex.load(Path(output_dir), Path(tmp, ".cache"))
+            soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+))$")
+
+            is_expired, last_update = parser.is_expired(soft)
+
+        self.assertFalse(is_expired)
+        self.assertEqual("2999-01-01 00:00:00", last_update)
+
+    def test_cache_ttl_prefers_item_then_parser_setting(self):
+        parser = self._fake_parser()
+        parser.cfg.settings = AppSetting(cache_ttl={"gh": 6})
+        soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+))$")
+        item_soft = GithubSoftware(name="demo", repo="owner/demo", pattern=r"^(?P<version>(?P<major>\d+))$", cache_ttl=0)
+        other = DockerHubSoftware(parser="docker-hub", repo="library/demo", pattern=r"^(?P<version>(?P<major>\d+))$")
+
+        with patch.dict(os.environ, {"VERSION_CHECKER_CACHE_TTL_HOURS": "2"}, clear=True):
+            self.assertEqual(6, parser.cache_ttl_hours(soft))
+            self.assertEqual(0, parser.cache_ttl_hours(item_soft))
+            self.assertEqual(2, parser.cache_ttl_hours(other))
+
+    def test_base_wrap_handle_uses_check_index_for_every_parser(self):
+        calls = []
+
+        class FakeParser(Base):
+            async def handle(self, _sem, soft):
+                calls.append(soft.name)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            parser = FakeParser(Configuration(workdir=tmp))
+            parser.check_index = CheckIndex.load(Path(tmp, "data"), Path(tmp, ".cache"))
+            soft = DockerHubSoftware(parser="docker-hub", repo="library/demo", pattern=r"^(?P<version>(?P<major>\d+))$")
+            no_cache = DockerHubSoftware(parser="docker-hub", repo="library/other", pattern=r"^(?P<version>(?P<major>\d+))$", cache_ttl=0)
+
+            first = asyncio.run(parser.wrap_handle(asyncio.Semaphore(1), soft))
+            second = asyncio.run(parser.wrap_handle(asyncio.Semaphore(1), soft))
+            asyncio.run(parser.wrap_handle(asyncio.Semaphore(1), no_cache))
+            asyncio.run(parser.wrap_handle(asyncio.Semaphore(1), no_cache))
+
+        self.assertEqual("success", first.status)
+        self.assertEqual("skipped", second.status)
+        self.assertEqual([soft.name, no_cache.name, no_cache.name], calls)
+        self.assertIsNotNone(parser.check_index.last_checked(soft.name))
+
     def test_base_wrap_handle_converts_exceptions_to_failed_result(self):
         class FailingParser(Base):
             async def handle(self, _sem, _soft):
@@ -167,3 +295,37 @@ class ParserTestCase(unittest.TestCase):
         self.assertEqual("demo", result.name)
         self.assertEqual("RuntimeError", result.error_type)
         self.assertEqual("boom", result.message)
+
+    def _capture_logs(self, level: str) -> io.StringIO:
+        stream = io.StringIO()
+        logger.remove()
+        logger.add(stream, format="{message}", level=level)
+        self.addCleanup(logger.add, sys.stderr, level="DEBUG")
+        self.addCleanup(logger.remove)
+
+        return stream
+
+    def test_debug_versions_builds_nothing_when_debug_is_off(self):
+        parser = self._fake_parser()
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))$", split=1)
+        helper.append("1.0")
+        stream = self._capture_logs("INFO")
+
+        with patch.object(VersionHelper, "_build_summary", autospec=True, side_effect=VersionHelper._build_summary) as build:
+            parser.debug_versions("demo", helper)
+
+        self.assertEqual(0, build.call_count)
+        self.assertEqual("", stream.getvalue())
+
+    def test_debug_versions_renders_summary_when_debug_is_on(self):
+        parser = self._fake_parser()
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))$", split=1)
+        helper.append("1.0")
+        stream = self._capture_logs("DEBUG")
+
+        with patch.object(VersionHelper, "_build_summary", autospec=True, side_effect=VersionHelper._build_summary) as build:
+            parser.debug_versions("demo", helper)
+
+        self.assertEqual(1, build.call_count)
+        self.assertIn("Name: demo, Versions: [1.0], Summary: {'1': Latest:", stream.getvalue())
+        self.assertIn("Split Versions: {'1': [1.0]}", stream.getvalue())
@@ -0,0 +1,159 @@
+import asyncio
+import unittest
+
+from app.core.ratelimit import RateLimitBudgetExceeded, RateLimitGovernor
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def create_governor(clock, budget=60, max_sleep=30):
+    return RateLimitGovernor("Docker Hub", budget, max_sleep, clock=clock, sleep=clock.sleep)
+
+
+class RateLimitGovernorTestCase(unittest.TestCase):
+    def test_probes_until_limit_is_known_then_grants_remaining_tokens(self):
+        async def run():
+            governor = create_governor(FakeClock())
+            first = asyncio.create_task(governor.acquire())
+            others = [asyncio.create_task(governor.acquire()) for _ in range(4)]
+            await asyncio.sleep(0)
+
+            # 额度未知时只放行一个探测请求。
+            self.assertTrue(first.done())
+            self.assertFalse(any(task.done() for task in others))
+
+            governor.release("2", "100", "1060")
+            await asyncio.sleep(0)
+
+            self.assertEqual(2, sum(task.done() for task in others))
+            self.assertEqual(0, governor.available)
+
+            for task in others:
+                task.cancel()
+            await asyncio.gather(*others, return_exceptions=True)
+
+        asyncio.run(run())
+
+    def test_unknown_limit_grants_up_to_max_probes(self):
+        async def run():
+            clock = FakeClock()
+            governor = RateLimitGovernor("Docker Hub", 60, 30, clock=clock, sleep=clock.sleep, max_probes=3)
+            tasks = [asyncio.create_task(governor.acquire()) for _ in range(5)]
+            await asyncio.sleep(0)
+            granted = sum(task.done() for task in tasks)
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            return granted
+
+        self.assertEqual(3, asyncio.run(run()))
+
+    def test_admission_orders_slots_by_priority(self):
+        async def run():
+            governor = create_governor(FakeClock())
+            sem = asyncio.Semaphore(1)
+            order = []
+
+            async def worker(name, priority):
+                async with governor.admit(sem, priority):
+                    order.append(name)
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(*(worker(name, priority) for name, priority in (("new", 30.0), ("mid", 20.0), ("old", 10.0))))
+
+            return order, sem.locked()
+
+        self.assertEqual((["old", "mid", "new"], False), asyncio.run(run()))
+
+    def test_waiters_are_granted_by_priority(self):
+        async def run():
+            governor = create_governor(FakeClock())
+            order = []
+
+            async def worker(name, priority):
+                await governor.acquire(priority)
+                order.append(name)
+                governor.release("1", "100", "2000")
+
+            governor._update("0", "100", "1005")
+            tasks = [asyncio.create_task(worker(name, priority)) for name, priority in (("new", 30.0), ("old", 10.0), ("mid", 20.0))]
+            await asyncio.gather(*tasks)
+
+            return order
+
+        self.assertEqual(["old", "mid", "new"], asyncio.run(run()))
+
+    def test_exhausted_waits_once_for_all_waiters(self):
+        async def run():
+            clock = FakeClock()
+            governor = create_governor(clock)
+            await governor.acquire()
+
+            waiters = [asyncio.create_task(governor.acquire()) for _ in range(3)]
+            await asyncio.sleep(0)
+            governor.exhausted("5", "1005", "100")
+            await asyncio.sleep(0)
+            await waiters[0]
+
+            return clock.sleeps, governor.waited
+
+        self.assertEqual(([5], 5), asyncio.run(run()))
+
+    def test_exhausted_quota_waits_while_tokens_are_still_held(self):
+        async def run():
+            clock = FakeClock()
+            governor = create_governor(clock)
+            governor._update("2", "100", "1005")
+            await governor.acquire()
+            await governor.acquire()
+
+            waiter = asyncio.create_task(governor.acquire())
+            await asyncio.sleep(0)
+            # 第一个请求返回额度耗尽，第二个令牌仍未归还，统一等待也要开始。
+            governor.release("0", "100", "1005")
+            await asyncio.sleep(0)
+            sleeps = list(clock.sleeps)
+
+            governor.release("99", "100", "1060")
+            await waiter
+
+            return sleeps, governor.in_flight
+
+        self.assertEqual(([5], 1), asyncio.run(run()))
+
+    def test_budget_exceeded_fails_all_waiters(self):
+        async def run():
+            clock = FakeClock()
+            governor = create_governor(clock, budget=60)
+            await governor.acquire()
+
+            waiters = [asyncio.create_task(governor.acquire()) for _ in range(3)]
+            await asyncio.sleep(0)
+            governor.exhausted("1800", "2800", "100")
+
+            results = await asyncio.gather(*waiters, return_exceptions=True)
+            return clock.sleeps, results
+
+        sleeps, results = asyncio.run(run())
+
+        self.assertEqual([], sleeps)
+        self.assertTrue(all(isinstance(e, RateLimitBudgetExceeded) for e in results))
+        self.assertRegex(str(results[0]), "Docker Hub rate limit retry budget exceeded")
+
+
+if __name__ == "__main__":
+    unittest.main()
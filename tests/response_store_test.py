@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+from multidict import CIMultiDict
+
+from app.core.http import AsyncHttpClient
+from app.core.response_store import OBJECTS_DIR, ResponseStore, create_response_store
+
+
+class FakeResponse:
+    def __init__(self, status, headers, body, url="https://example.com/index.json"):
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.url = url
+        self._body = body
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def text(self):
+        return self._body
+
+    async def read(self):
+        return self._body.encode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def request(self, **kwargs):
+        self.urls.append(kwargs["url"])
+        return self.responses.pop(0)
+
+
+class ResponseStoreTestCase(unittest.TestCase):
+    def test_client_serves_fresh_responses_from_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResponseStore(Path(tmp))
+            session = FakeSession([FakeResponse(200, {"Link": '<https://example.com/2>; rel="next"'}, '[{"version": "1.0.0"}]')])
+            client = AsyncHttpClient(session=session, store=store)
+
+            first = asyncio.run(client.request("GET", "https://example.com/index.json", is_json=True))
+            store.save()
+
+            restored = ResponseStore.load(Path(tmp))
+            url, status, headers, data = asyncio.run(
+                AsyncHttpClient(session=session, store=restored).request("GET", "https://example.com/index.json", is_json=True)
+            )
+
+        self.assertEqual(1, len(session.urls))
+        self.assertEqual((str(first[0]), 200, first[3]), (str(url), status, data))
+        self.assertEqual('<https://example.com/2>; rel="next"', headers["link"])
+        self.assertEqual((1, 0), (restored.hits, restored.misses))
+
+    def test_stale_and_failed_responses_go_to_the_network(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResponseStore(Path(tmp), max_age=60)
+            session = FakeSession([FakeResponse(200, {}, "v1"), FakeResponse(200, {}, "v2"), FakeResponse(500, {}, "error")])
+            client = AsyncHttpClient(session=session, store=store)
+
+            asyncio.run(client.request("GET", "https://example.com/page"))
+            next(iter(store.index.entries.values())).stored -= 120
+            _, _, _, second = asyncio.run(client.request("GET", "https://example.com/page"))
+            asyncio.run(client.request("GET", "https://example.com/error", raise_for_status=False))
+
+            objects = list(Path(tmp, OBJECTS_DIR).glob("*/*.zst"))
+
+        self.assertEqual("v2", second)
+        self.assertEqual(1, len(store.index.entries))
+        self.assertEqual(1, len(objects))
+
+    def test_identical_bodies_are_stored_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResponseStore(Path(tmp))
+            store.put("a", "https://a.example.com", "https://a.example.com", 200, {}, {"v": 1}, True)
+            store.put("b", "https://b.example.com", "https://b.example.com", 200, {}, {"v": 1}, True)
+            store.drop("a")
+
+            self.assertEqual({"v": 1}, store.get("b", is_json=True)[3])
+            self.assertIsNone(store.get("b", is_json=False))
+            self.assertEqual(1, len(list(Path(tmp, OBJECTS_DIR).glob("*/*.zst"))))
+
+    def test_evicts_least_recently_used_entries_over_size_limit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResponseStore(Path(tmp))
+
+            for i, name in enumerate(("old", "used", "new")):
+                store.put(name, name, name, 200, {}, os.urandom(512).hex(), False)
+                store.index.entries[name].accessed = 100 + i
+
+            store.get("used", is_json=False)
+            store.max_bytes = store.total_bytes() - 1
+            store.save()
+
+            self.assertEqual(["used", "new"], sorted(ResponseStore.load(Path(tmp)).index.entries, reverse=True))
+            self.assertEqual(2, len(list(Path(tmp, OBJECTS_DIR).glob("*/*.zst"))))
+
+    def test_prune_removes_expired_entries_and_orphan_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResponseStore(Path(tmp))
+            store.put("old", "old", "old", 200, {}, "old", False)
+            store.put("new", "new", "new", 200, {}, "new", False)
+            store.index.entries["old"].stored = time.time() - 600
+            orphan = Path(tmp, OBJECTS_DIR, "00", "00.zst")
+            orphan.parent.mkdir(parents=True)
+            orphan.write_bytes(b"")
+
+            self.assertEqual((1, 1), store.prune(max_age=300))
+            self.assertEqual(["new"], list(ResponseStore.load(Path(tmp)).index.entries))
+
+    def test_store_is_disabled_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(os.environ, {"VERSION_CHECKER_RESPONSE_STORE": "false"}):
+                self.assertIsNone(create_response_store(Path(tmp)))
+
+            with patch.dict(os.environ, {"VERSION_CHECKER_RESPONSE_STORE": "true", "VERSION_CHECKER_RESPONSE_STORE_MAX_AGE_MINUTES": "5"}):
+                store = create_response_store(Path(tmp))
+
+        self.assertEqual(300, store.max_age)
+        self.assertEqual(Path(tmp, "responses"), store.store_dir)
+
+
+class CacheCommandTestCase(unittest.TestCase):
+    def test_inspect_and_prune(self):
+        from app.cli import cli
+
+        runner = CliRunner()
+
+        with runner.isolated_filesystem():
+            Path("version-checker.toml").write_text('[app]\ntitle = "test"\n', encoding="utf-8")
+            store = ResponseStore(Path(".cache", "responses"))
+            store.put("a", "https://example.com/a.json", "https://example.com/a.json", 200, {}, [1, 2, 3], True)
+            store.save()
+
+            with patch.dict(os.environ, {"VERSION_CHECKER_CACHE_DIR": ".cache"}):
+                inspected = runner.invoke(cli, ["cache", "inspect", "--json"])
+                pruned = runner.invoke(cli, ["cache", "prune", "--all"])
+
+            entries = ResponseStore.load(Path(".cache", "responses")).index.entries
+
+        self.assertEqual(0, inspected.exit_code, inspected.output)
+        self.assertIn('"url": "https://example.com/a.json"', inspected.output)
+        self.assertEqual(0, pruned.exit_code, pruned.output)
+        self.assertIn("Removed 1 entries", pruned.output)
+        self.assertEqual({}, entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
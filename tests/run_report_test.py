@@ -0,0 +1,131 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from asyncio import Semaphore
+from pathlib import Path
+
+from app.core.cassette import Cassette, CassetteData, CassetteEntry, make_cassette_key
+from app.core.coalesce import RequestCoalescer
+from app.core.config import Configuration, IndexSoftware
+from app.core.http import AsyncHttpClient
+from app.core.inspect_result import InspectItemResult, InspectResult, InspectStatus
+from app.core.metrics import ItemMetrics, current_metrics
+from app.core.run_report import build_run_report, format_prometheus, write_run_report
+from app.parser.index import Parser as IndexParser
+
+INDEX_URL = "https://downloads.example/demo/"
+INDEX_HTML = '<html><body><pre><a href="demo-1.0.0.tar.gz">demo-1.0.0.tar.gz</a></pre></body></html>'
+
+
+def make_item(name: str, parser: str, status: InspectStatus, elapsed: float, **kwargs) -> InspectItemResult:
+    return InspectItemResult(name=name, status=status, parser=parser, metrics=ItemMetrics(elapsed_seconds=elapsed, **kwargs))
+
+
+def make_cassette(latency: float = 0) -> Cassette:
+    cassette = Cassette(Path(tempfile.gettempdir(), "unused.json.zst"), "replay", latency=latency)
+    cassette.data = CassetteData(
+        entries={make_cassette_key("GET", INDEX_URL, None, None): CassetteEntry(method="GET", url=INDEX_URL, status=200, body=INDEX_HTML)}
+    )
+
+    return cassette
+
+
+class RunReportTestCase(unittest.TestCase):
+    def test_build_run_report_aggregates_by_parser_and_keeps_slowest(self):
+        result = InspectResult(
+            items=[
+                make_item("a", "index", InspectStatus.SUCCESS, 1.0, network_seconds=0.8, requests=2, bytes_downloaded=100),
+                make_item("b", "index", InspectStatus.FAILED, 3.0, network_seconds=2.5, requests=1),
+                make_item("c", "gh", InspectStatus.SUCCESS, 2.0, cache_hits=1),
+                InspectItemResult.skipped("d", "not due"),
+            ]
+        )
+
+        report = build_run_report(result, 3.5, top=2)
+
+        self.assertEqual({"success": 2, "failed": 1, "skipped": 1}, report.items)
+        self.assertEqual(["index", "gh"], list(report.parsers))
+        self.assertEqual(
+            (2, 1, 4.0, 3.3, 3, 100),
+            tuple(
+                getattr(report.parsers["index"], x)
+                for x in ("items", "failed", "elapsed_seconds", "network_seconds", "requests", "bytes_downloaded")
+            ),
+        )
+        self.assertEqual((3, 1), (report.totals.items, report.totals.cache_hits))
+        self.assertEqual(["b", "c"], [x.name for x in report.slowest])
+
+    def test_format_prometheus(self):
+        report = build_run_report(InspectResult(items=[make_item('say "hi"', "index", InspectStatus.SUCCESS, 1.5)]), 2.0)
+        text = format_prometheus(report)
+
+        self.assertIn("version_checker_inspect_duration_seconds 2.0\n", text)
+        self.assertIn('version_checker_inspect_items{status="success"} 1\n', text)
+        self.assertIn('version_checker_parser_elapsed_seconds{parser="index"} 1.5\n', text)
+        self.assertIn('version_checker_item_elapsed_seconds{name="say \\"hi\\"",parser="index"} 1.5\n', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_write_run_report_replaces_files(self):
+        report = build_run_report(InspectResult(items=[make_item("a", "index", InspectStatus.SUCCESS, 1.0)]), 1.0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            report_dir = Path(tmp, "reports")
+            write_run_report(report, report_dir)
+            write_run_report(report, report_dir)
+
+            self.assertEqual(["inspect-report.json", "inspect-report.prom"], sorted(x.name for x in report_dir.iterdir()))
+            self.assertEqual("a", json.loads(report_dir.joinpath("inspect-report.json").read_text())["slowest"][0]["name"])
+
+
+class ItemMetricsTestCase(unittest.TestCase):
+    def test_wrap_handle_records_item_metrics(self):
+        soft = IndexSoftware(
+            name="demo", parser="index", url=INDEX_URL, pattern=r"^demo-(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))"
+        )
+
+        async def run():
+            sem = Semaphore(1)
+            await sem.acquire()
+            asyncio.get_running_loop().call_later(0.05, sem.release)
+
+            parser = IndexParser.__new__(IndexParser)
+            parser.cfg = Configuration()
+            parser.httpc = AsyncHttpClient(cassette=make_cassette(latency=0.02))
+
+            async def no_write(*_args, **_kwargs):
+                return True
+
+            parser.write_output = no_write
+            return await parser.wrap_handle(sem, soft)
+
+        result = asyncio.run(run())
+        metrics = result.metrics
+
+        self.assertEqual((InspectStatus.SUCCESS, "index"), (result.status, result.parser))
+        self.assertEqual((1, len(INDEX_HTML), 0), (metrics.requests, metrics.bytes_downloaded, metrics.cache_hits))
+        self.assertGreaterEqual(metrics.queue_wait_seconds, 0.04)
+        self.assertGreaterEqual(metrics.network_seconds, 0.015)
+        self.assertGreater(metrics.parse_seconds, 0)
+        self.assertGreaterEqual(metrics.elapsed_seconds, metrics.queue_wait_seconds + metrics.network_seconds)
+
+    def test_coalesced_request_counts_as_cache_hit(self):
+        client = AsyncHttpClient(cassette=make_cassette(latency=0.02), coalescer=RequestCoalescer())
+
+        async def fetch(metrics: ItemMetrics):
+            current_metrics.set(metrics)
+            await client.request("GET", INDEX_URL)
+
+        async def run():
+            first, second = ItemMetrics(), ItemMetrics()
+            await asyncio.gather(fetch(first), fetch(second))
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual((1, 0), (first.requests, first.cache_hits))
+        self.assertEqual((0, 1), (second.requests, second.cache_hits))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+from app.core.scheduler import HostLimiter, RequestScheduler
+
+
+class HostLimiterTestCase(unittest.TestCase):
+    def test_limit_grows_after_fast_successes(self):
+        limiter = HostLimiter("example.com", initial=2, maximum=3)
+
+        async def run():
+            for _ in range(5):
+                epoch = await limiter.acquire()
+                limiter.release(epoch, 200, 0.1)
+
+        asyncio.run(run())
+
+        self.assertEqual(3, limiter.limit)
+        self.assertEqual(0, limiter.active)
+
+    def test_concurrent_failures_halve_limit_once_per_window(self):
+        limiter = HostLimiter("example.com", initial=8, maximum=8)
+
+        async def run():
+            epochs = [await limiter.acquire() for _ in range(4)]
+            for epoch in epochs:
+                limiter.release(epoch, 429, 0.1)
+
+            epoch = await limiter.acquire()
+            limiter.release(epoch, 503, 0.1)
+
+        asyncio.run(run())
+
+        self.assertEqual(2, limiter.limit)
+        self.assertEqual(2, limiter.decreases)
+
+    def test_slow_responses_do_not_raise_limit(self):
+        limiter = HostLimiter("example.com", initial=1, maximum=4)
+
+        async def run():
+            for _ in range(3):
+                epoch = await limiter.acquire()
+                limiter.release(epoch, 200, 30)
+
+        asyncio.run(run())
+
+        self.assertEqual(1, limiter.limit)
+
+
+class RequestSchedulerTestCase(unittest.TestCase):
+    def test_busy_host_does_not_block_other_hosts(self):
+        scheduler = RequestScheduler(max_connections=4, host_initial=1, host_max=1)
+        order = []
+
+        async def hold(url, gate):
+            async with scheduler.slot(url) as feedback:
+                order.append(url)
+                await gate.wait()
+                feedback.status = 200
+
+        async def run():
+            gate = asyncio.Event()
+            tasks = [
+                asyncio.create_task(hold("https://slow.example.com/a", gate)),
+                asyncio.create_task(hold("https://slow.example.com/b", gate)),
+                asyncio.create_task(hold("https://fast.example.com/c", gate)),
+            ]
+            await asyncio.sleep(0)
+            started = list(order)
+            gate.set()
+            await asyncio.gather(*tasks)
+            return started
+
+        started = asyncio.run(run())
+
+        self.assertEqual(["https://slow.example.com/a", "https://fast.example.com/c"], started)
+
+    def test_global_cap_limits_requests_across_hosts(self):
+        scheduler = RequestScheduler(max_connections=1, host_initial=2, host_max=2)
+        active = []
+
+        async def request(url):
+            async with scheduler.slot(url) as feedback:
+                active.append(url)
+                await asyncio.sleep(0)
+                self.assertEqual(1, len(active))
+                active.remove(url)
+                feedback.status = 200
+
+        async def run():
+            await asyncio.gather(*(request(f"https://h{i}.example.com/") for i in range(3)))
+
+        asyncio.run(run())
+
+    def test_connection_error_releases_slot_and_lowers_limit(self):
+        scheduler = RequestScheduler(max_connections=2, host_initial=2, host_max=2)
+
+        async def run():
+            with self.assertRaises(OSError):
+                async with scheduler.slot("https://example.com/"):
+                    raise OSError("connection reset")
+
+        asyncio.run(run())
+
+        limiter = scheduler.hosts["example.com"]
+        self.assertEqual(0, limiter.active)
+        self.assertEqual(1, limiter.limit)
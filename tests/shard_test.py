@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from app.commands.inspect import cli as inspect_cli
+from app.core.cassette import Cassette
+from app.core.check_index import CheckIndex
+from app.core.config import AppSetting, AppSettingBase, Configuration, IndexSoftware
+from app.core.http import AsyncHttpClient
+from app.core.inspect_result import InspectItemResult, InspectResult, InspectStatus
+from app.core.metrics import ItemMetrics
+from app.core.shard import ShardBundle, ShardCosts, merge_bundles, parse_shard, plan_shards
+
+PATTERN = r"^demo-(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))"
+SOFTWARES = {
+    "alpha": "https://downloads.example/alpha/",
+    "beta": "https://downloads.example/beta/",
+    "gamma": "https://downloads.example/gamma/",
+}
+
+
+class FakeResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.status = 200
+        self.headers = CIMultiDictProxy(CIMultiDict())
+        self.body = body
+
+    async def text(self, errors="strict"):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def request(self, **kwargs):
+        return self.responses[kwargs["url"]]
+
+
+def index_html(version: str) -> str:
+    return f'<html><body><pre><a href="demo-{version}.tar.gz">demo-{version}.tar.gz</a></pre></body></html>'
+
+
+def make_config(workdir: str) -> Configuration:
+    softwares = [IndexSoftware(name=name, parser="index", url=url, pattern=PATTERN) for name, url in SOFTWARES.items()]
+    return Configuration(workdir=workdir, debug=True, settings=AppSetting(app=AppSettingBase(title="test"), softwares=softwares))
+
+
+def record_cassette(path: Path):
+    responses = {url: FakeResponse(url, index_html(f"1.{i}.0")) for i, url in enumerate(SOFTWARES.values())}
+    cassette = Cassette.load(path, "record")
+    client = AsyncHttpClient(session=FakeSession(responses), cassette=cassette)
+
+    for url in SOFTWARES.values():
+        asyncio.run(client.request("GET", url))
+
+    cassette.save()
+
+
+class ShardPlanTestCase(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual((2, 4), parse_shard("2/4"))
+
+        for value in ("0/4", "5/4", "1", "a/b", "1/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_plan_balances_by_cost_and_covers_every_item_once(self):
+        plan = plan_shards(["a", "b", "c", "d", "e"], 2, {"a": 10, "b": 6, "c": 5, "d": 4, "e": 1})
+
+        self.assertEqual([["a", "d"], ["b", "c", "e"]], plan.shards)
+        self.assertEqual([14.0, 12.0], plan.loads)
+
+    def test_plan_is_stable_without_history(self):
+        names = [f"item-{i}" for i in range(10)]
+        plan = plan_shards(names, 3, {})
+
+        self.assertEqual(plan.shards, plan_shards(list(reversed(names)), 3, {}).shards)
+        self.assertEqual(sorted(names), sorted(x for shard in plan.shards for x in shard))
+        self.assertEqual([4, 3, 3], [len(x) for x in plan.shards])
+
+    def test_costs_are_smoothed_and_skip_unmeasured_items(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            costs = ShardCosts(Path(tmp))
+            costs.data.costs["a"] = 10.0
+
+            result = InspectResult(
+                items=[
+                    InspectItemResult(
+                        name="a", status=InspectStatus.SUCCESS, metrics=ItemMetrics(elapsed_seconds=3.0, queue_wait_seconds=1.0)
+                    ),
+                    InspectItemResult(name="b", status=InspectStatus.FAILED, metrics=ItemMetrics(elapsed_seconds=15.0)),
+                    InspectItemResult(name="c", status=InspectStatus.SKIPPED, metrics=ItemMetrics(elapsed_seconds=0.1)),
+                    InspectItemResult.success("d"),
+                ]
+            )
+
+            self.assertEqual(2, costs.update(result))
+            costs.save()
+
+            self.assertEqual({"a": 7.6, "b": 15.0}, ShardCosts.load(Path(tmp)).costs)
+
+    def test_merge_rejects_bundles_from_different_plans(self):
+        bundles = [
+            ShardBundle(index=1, count=2, plan_digest="x", result=InspectResult(items=[])),
+            ShardBundle(index=2, count=2, plan_digest="y", result=InspectResult(items=[])),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                merge_bundles(bundles, CheckIndex(Path(tmp, "data"), Path(tmp, ".cache")))
+
+
+class ShardCliTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+        env = patch.dict(os.environ, {"VERSION_CHECKER_PARSE_EXECUTOR": "inline", "VERSION_CHECKER_REPORT_DIR": str(self.tmp / "reports")})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.cassette = self.tmp / "run.json.zst"
+        record_cassette(self.cassette)
+
+    def run_shard(self, shard: str):
+        # 每个分片在独立的工作目录中运行，模拟 CI 中的多个 runner。
+        workdir = self.tmp / f"runner-{shard.replace('/', '-')}"
+        args = ["--shard", shard, "--bundle-dir", str(self.tmp / "bundles"), "--replay", str(self.cassette), "--latency", "0"]
+        result = CliRunner().invoke(inspect_cli, args, obj=make_config(str(workdir)))
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertFalse(workdir.joinpath("data", "all.json").exists())
+
+    def test_shards_merge_into_the_same_output_as_a_single_run(self):
+        self.run_shard("1/2")
+        self.run_shard("2/2")
+
+        main = self.tmp / "main"
+        result = CliRunner().invoke(inspect_cli, ["--merge", str(self.tmp / "bundles"), "--strict"], obj=make_config(str(main)))
+
+        self.assertEqual(0, result.exit_code, result.output)
+
+        with open(main / "data" / "all.json", encoding="utf-8") as f:
+            combined = json.load(f)
+
+        self.assertEqual([("alpha", "1.0.0"), ("beta", "1.1.0"), ("gamma", "1.2.0")], [(x["name"], x["latest"]) for x in combined])
+        self.assertEqual(set(SOFTWARES), set(CheckIndex.load(main / "data", main / ".cache").data.items))
+        self.assertEqual(set(SOFTWARES), set(ShardCosts.load(main / "data").costs))
+
+    def test_merge_with_missing_shard_fails_in_strict_mode(self):
+        self.run_shard("1/2")
+
+        main = self.tmp / "main"
+        result = CliRunner().invoke(inspect_cli, ["--merge", str(self.tmp / "bundles"), "--strict"], obj=make_config(str(main)))
+
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("Inspect completed with failed item(s).", result.output)
+        self.assertFalse(main.joinpath("data", "all.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
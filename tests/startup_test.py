@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+import app
+
+# 启动阶段不应加载的重量级依赖：网络客户端、模板、HTML/XML 解析库都只在具体子命令或解析器中按需导入。
+HEAVY_MODULES = ("aiohttp", "requests", "jinja2", "retrying", "xml.dom.minidom", "bs4", "html5lib", "feedparser", "lxml")
+
+
+def run_importtime(code: str, cwd: str) -> Tuple[Set[str], Dict[str, int]]:
+    """在子进程中用 `-X importtime` 执行代码，返回最终加载的模块集合和模块累计导入耗时（微秒）。
+
+    `importlib.import_module` 导入的模块不会出现在 importtime 输出中，因此加载情况以子进程的 `sys.modules` 为准。
+    """
+    env = dict(os.environ)
+    src_dir = str(Path(app.__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+
+    code = f"{code}\nimport json, sys\nprint('MODULES=' + json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+
+    loaded = set()
+    for line in proc.stdout.splitlines():
+        if line.startswith("MODULES="):
+            loaded = set(json.loads(line.removeprefix("MODULES=")))
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+
+    return loaded, timings
+
+
+def top_imports(modules: Dict[str, int], limit: int = 10) -> str:
+    return ", ".join(f"{k}: {v / 1000:.1f}ms" for k, v in sorted(modules.items(), key=lambda x: -x[1])[:limit])
+
+
+class StartupTestCase(unittest.TestCase):
+    def assert_not_imported(self, loaded: Set[str], timings: Dict[str, int]):
+        heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+        self.assertEqual([], heavy, f"Heavy modules imported at startup. ({top_imports(timings)})")
+
+    def test_cli_import_does_not_load_heavy_modules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded, timings = run_importtime("import app.cli", tmp)
+
+        self.assertIn("app.cli", loaded)
+        self.assert_not_imported(loaded, timings)
+        self.assertNotIn("app.commands.inspect", loaded)
+        self.assertNotIn("app.parser", loaded)
+
+    def test_version_command_does_not_load_subcommand_modules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp).joinpath("version-checker.toml").write_text('[app]\ntitle = "test"\n', encoding="utf-8")
+
+            loaded, timings = run_importtime("from app.cli import cli; cli(['version'], standalone_mode=False)", tmp)
+
+        self.assert_not_imported(loaded, timings)
+        self.assertFalse([name for name in loaded if name.startswith("app.commands.")])
+
+    def test_combine_command_loads_only_combine_dependencies(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp).joinpath("version-checker.toml").write_text('[app]\ntitle = "test"\n', encoding="utf-8")
+            Path(tmp).joinpath("data").mkdir()
+
+            loaded, timings = run_importtime("from app.cli import cli; cli(['combine'], standalone_mode=False)", tmp)
+
+        self.assertIn("app.commands.combine", loaded)
+        self.assertNotIn("app.commands.inspect", loaded)
+        self.assert_not_imported(loaded, timings)
@@ -1,6 +1,9 @@
 import unittest
+from unittest.mock import patch
 
-from app.core.version import VersionHelper
+from pydantic import ValidationError
+
+from app.core.version import Version, VersionHelper
 
 
 class VersionHelperTestCase(unittest.TestCase):
@@ -80,3 +83,71 @@ class VersionHelperTestCase(unittest.TestCase):
         helper.add_download_url("https://example.com/a.zip")
 
         self.assertEqual(["https://example.com/a.zip"], helper.download_urls)
+
+    def test_versions_materialize_models_once_and_keep_raw_data(self):
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+))(?P<other>-alpine)?$")
+
+        helper.append("1.2-alpine", raw_data={"id": 1})
+        helper.append("1.10", raw_data={"id": 2})
+
+        versions = helper.versions
+
+        self.assertIsInstance(versions[0], Version)
+        self.assertEqual(10, versions[0].minor)
+        self.assertEqual({"id": 1}, versions[1].raw_data)
+        self.assertEqual("-alpine", versions[1].other)
+        self.assertIs(versions[0], helper.versions[0])
+        self.assertIs(versions[0], helper.latest_version)
+        self.assertEqual(["1.2-alpine", "1.10"], [v.raw_str for v in helper.raw_versions])
+
+    def test_invalid_numeric_group_is_rejected_like_version_model(self):
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>[a-z]+))$")
+
+        with self.assertRaises(ValidationError):
+            helper.append("abc")
+
+    def test_latest_versions_follow_split_groups(self):
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+)(\.(?P<minor>\d+))?)(?P<other>-\w+)?$", split=2)
+
+        for tag in ["1", "1.1", "1.2-alpine", "1.2", "2.0-slim", "2.0"]:
+            helper.append(tag)
+
+        self.assertEqual(["2.0", "1.2", "1.1"], [v.version for v in helper.latest_versions()])
+        self.assertEqual(list(helper.summary), [f"{v.major}.{v.minor}" for v in helper.latest_versions()])
+        self.assertEqual(["-alpine", "-slim"], helper.raw_suffixes)
+
+    def test_sorted_views_sort_each_item_once_until_append(self):
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))$", split=2)
+        tags = [f"{major}.{minor}.{patch}" for major in range(4) for minor in range(5) for patch in range(10)]
+        calls = []
+        sort_key = VersionHelper._sort_key
+
+        for tag in tags:
+            helper.append(tag)
+
+        with patch.object(VersionHelper, "_sort_key", staticmethod(lambda v: calls.append(v) or sort_key(v))):
+            for _ in range(3):
+                _ = helper.versions
+                _ = helper.latest_version
+                _ = helper.split_versions
+                _ = helper.summary
+                _ = helper.latest_versions()
+
+            self.assertEqual(len(tags), len(calls))
+
+            helper.append("9.0.0")
+
+            self.assertEqual("9.0.0", helper.latest_version.version)
+            self.assertEqual("9.0.0", helper.summary["9.0"].latest.version)
+            self.assertEqual(2 * len(tags) + 1, len(calls))
+
+    def test_summary_cache_follows_download_urls(self):
+        helper = VersionHelper(pattern=r"^(?P<version>(?P<major>\d+))$", download_urls=[])
+        helper.append("1")
+
+        self.assertEqual([], helper.summary.downloads)
+        self.assertIs(helper.summary, helper.summary)
+
+        helper.add_download_url("https://example.com/{version}.zip")
+
+        self.assertEqual(["https://example.com/1.zip"], helper.summary.downloads)
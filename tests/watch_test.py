@@ -0,0 +1,137 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.commands.inspect import InspectRuntime
+from app.commands.watch import watch
+from app.core.config import AppSetting, AppSettingBase, Configuration, GithubSoftware
+from app.core.inspect_result import InspectItemResult
+from app.core.metrics import ItemMetrics
+from app.core.watch import WatchSchedule
+from app.parser import Base as BaseParser
+
+
+class WatchScheduleTestCase(unittest.TestCase):
+    def test_items_are_due_after_last_check_plus_interval(self):
+        schedule = WatchSchedule(min_interval=10, max_interval=1000)
+        schedule.add("new", 100, now=0)
+        schedule.add("recent", 100, last_checked=50, now=100)
+        schedule.add("later", 100, last_checked=80, now=100)
+
+        self.assertEqual(["new"], schedule.pop_due(100))
+        self.assertEqual(150, schedule.next_due())
+        self.assertEqual(["recent", "later"], schedule.pop_due(150, window=30))
+        self.assertIsNone(schedule.next_due())
+
+    def test_interval_adapts_to_changes_within_bounds(self):
+        schedule = WatchSchedule(min_interval=10, max_interval=100)
+        schedule.add("hot", 40, now=0)
+        schedule.add("cold", 40, now=0)
+        schedule.add("broken", 40, now=0)
+        schedule.pop_due(0)
+
+        for now in (10, 20, 30):
+            schedule.complete("hot", changed=True, now=now)
+            schedule.complete("cold", changed=False, now=now)
+            schedule.pop_due(now + 100)
+
+        schedule.complete("broken", changed=False, failed=True, now=0)
+
+        self.assertEqual((10, 3, 30), (schedule.items["hot"].interval, schedule.items["hot"].changes, schedule.items["hot"].last_changed))
+        self.assertEqual((100, 0), (schedule.items["cold"].interval, schedule.items["cold"].changes))
+        self.assertEqual(40, schedule.items["broken"].interval)
+
+    def test_requeued_items_are_not_returned_twice(self):
+        schedule = WatchSchedule(min_interval=10, max_interval=100)
+        schedule.add("a", 10, now=0)
+        schedule.pop_due(0)
+        schedule.complete("a", changed=True, now=5)
+
+        self.assertEqual([], schedule.pop_due(10))
+        self.assertEqual(["a"], schedule.pop_due(15))
+
+    def test_state_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "watch-state.json")
+            schedule = WatchSchedule(min_interval=10, max_interval=1000)
+            schedule.add("a", 100, now=0)
+            schedule.add("gone", 100, now=0)
+            schedule.pop_due(0)
+            schedule.complete("a", changed=False, now=0)
+            schedule.save(path)
+
+            restored = WatchSchedule.load(path, min_interval=10, max_interval=120)
+            restored.retain({"a"})
+            restored.add("a", 100, now=10)
+
+        self.assertEqual(["a"], list(restored.items))
+        self.assertEqual((120, 130), (restored.items["a"].interval, restored.next_due()))
+
+    def test_rejects_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            WatchSchedule(min_interval=100, max_interval=10)
+
+
+class WatchLoopTestCase(unittest.TestCase):
+    def test_hot_items_are_checked_more_often_and_combine_runs_only_on_change(self):
+        cfg = Configuration(
+            debug=True,
+            settings=AppSetting(
+                app=AppSettingBase(title="test"),
+                softwares=[
+                    GithubSoftware(name="hot", repo="owner/hot", pattern=r"^(?P<version>(?P<major>\d+))$", cache_ttl=0),
+                    GithubSoftware(name="cold", repo="owner/cold", pattern=r"^(?P<version>(?P<major>\d+))$", cache_ttl=1),
+                    GithubSoftware(name="off", repo="owner/off", pattern=r"^(?P<version>(?P<major>\d+))$", disabled=True),
+                ],
+            ),
+        )
+        checks = []
+        combines = []
+
+        async def run():
+            stop = asyncio.Event()
+
+            class FakeParser(BaseParser):
+                def __init__(self, _cfg):
+                    self.cfg = _cfg
+
+                async def wrap_handle(self, _sem, soft):
+                    checks.append(soft.name)
+                    if checks.count("hot") >= 5:
+                        stop.set()
+
+                    result = InspectItemResult.success(soft.name)
+                    result.metrics = ItemMetrics(files_written=int(soft.name == "hot"))
+                    return result
+
+                async def handle(self, _sem, _soft):
+                    raise NotImplementedError
+
+            schedule = WatchSchedule(min_interval=0.01, max_interval=10)
+
+            with (
+                patch("app.commands.inspect.load_parser_class", return_value=FakeParser),
+                patch("app.commands.watch.combine_and_notify", side_effect=lambda *_args: combines.append(1)),
+            ):
+                await asyncio.wait_for(watch(cfg, InspectRuntime(cfg, 1), schedule, stop), 5)
+
+            return schedule
+
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"OUTPUT_DATA_DIR": str(Path(tmp, "data")), "VERSION_CHECKER_CACHE_DIR": str(Path(tmp, ".cache"))}
+
+            with patch.dict(os.environ, env):
+                schedule = asyncio.run(run())
+
+        self.assertEqual(5, checks.count("hot"))
+        self.assertEqual(1, checks.count("cold"))
+        self.assertNotIn("off", checks)
+        self.assertEqual(5, len(combines))
+        self.assertEqual((0.01, 10), (schedule.items["hot"].interval, schedule.items["cold"].interval))
+
+
+if __name__ == "__main__":
+    unittest.main()
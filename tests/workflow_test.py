@@ -7,3 +7,10 @@ class GithubActionsWorkflowTestCase(unittest.TestCase):
         workflow = Path(".github/workflows/ci.yml").read_text(encoding="utf-8")
 
         self.assertIn("    timeout-minutes: 30", workflow)
+
+    def test_run_cache_is_restored_between_runs(self):
+        workflow = Path(".github/workflows/ci.yml").read_text(encoding="utf-8")
+
+        self.assertIn("uses: actions/cache@", workflow)
+        self.assertIn("path: .cache", workflow)
+        self.assertLess(workflow.index("Restore Run Cache"), workflow.index("Generate JSON Data Files"))